@@ -73,7 +73,11 @@ class ChatMessage(BaseModel):
     model_config = {"extra": "allow"}  # Allow extra fields from frontend
     
     role: str = Field(..., description="Message role: user, assistant, or system")
-    content: Union[str, List[Any], Dict[str, Any]] = Field(..., description="Message content (string, array, or object)")
+    # Plain strings are by far the common case, so try the members in order and stop at
+    # the first match instead of letting the smart-mode union validate against all three
+    content: Union[str, List[Any], Dict[str, Any]] = Field(
+        ..., union_mode="left_to_right", description="Message content (string, array, or object)"
+    )
 
 
 class ChatRequest(BaseModel):
@@ -2,12 +2,17 @@
 API Routes for the sanitization service
 """
 
+import asyncio
 import time
+import logging
 import httpx
 import json
-from typing import List
+import torch
+from json.encoder import encode_basestring_ascii
+from typing import List, Optional
+from pydantic import TypeAdapter
 from fastapi import APIRouter, HTTPException, status, Request as FastAPIRequest
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from app.api.models import (
     SanitizeRequest, SanitizeResponse,
@@ -16,13 +21,36 @@ from app.api.models import (
     HealthResponse, StatsResponse,
     ChatRequest, ChatResponse, ChatMessage
 )
-from app.core.config import SecurityLevel, settings
+from app.core.config import LEVEL_MAP, SecurityLevel, settings
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 router = APIRouter()
 
+# Validates a whole batch of results in one call into pydantic-core
+_BATCH_RESULTS_ADAPTER = TypeAdapter(List[SanitizeResponse])
+
+# Static parts of the /api/stats response; the device cannot change while the server runs
+_MODEL_INFO = {
+    "model_type": "zero-shot-classification",
+    "device": "cuda" if torch.cuda.is_available() else "cpu",
+    "spacy_model": "en_core_web_sm"
+}
+_CAPABILITIES = (
+    "Zero-shot classification",
+    "Multi-label threat detection",
+    "Contextual understanding",
+    "Automatic sanitization",
+    "Confidence scoring",
+    "Detailed threat analysis",
+    "Pattern matching (spaCy)",
+    "Entropy-based detection"
+)
+
+# Chat bodies above this size are parsed on a worker thread instead of on the event loop
+_INLINE_JSON_LIMIT = 16 * 1024
+
 # Global validator instance (will be set by main.py)
 validator = None
 start_time = time.time()
@@ -36,6 +64,76 @@ def set_validator(val):
     validator = val
 
 
+def _json_response(model) -> Response:
+    """Serialize an already-validated response model with pydantic-core's JSON encoder,
+    skipping FastAPI's re-validation and jsonable_encoder pass"""
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _resolve_security_level(level: Optional[str]) -> SecurityLevel:
+    """Security level for one request, rejecting unknown names with a 400
+    
+    The level is passed to the validator for that request only; changing the shared validator
+    would race with requests at other levels still validating on worker threads
+    """
+    if not level:
+        return validator.security_level
+    resolved = LEVEL_MAP.get(level.lower())
+    if resolved is None:
+        logger.error(f"Invalid security level: {level}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid security level: {level}"
+        )
+    return resolved
+
+
+def _check_prompt_size(prompt: str) -> None:
+    """Reject a prompt too large to validate with a 413 before any model sees it"""
+    # A character encodes to at most four UTF-8 bytes, so short prompts skip the encode
+    if len(prompt) * 4 > settings.MAX_PROMPT_BYTES and \
+            len(prompt.encode("utf-8", "ignore")) > settings.MAX_PROMPT_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Prompt too large (limit {settings.MAX_PROMPT_BYTES} bytes)"
+        )
+
+
+def _message_text(content) -> str:
+    """Flatten chat message content (string, array of parts, or object) to plain text"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        # If content is an array, join text parts
+        return " ".join([
+            part.get("text", str(part)) if isinstance(part, dict) else str(part)
+            for part in content
+        ])
+    return str(content)
+
+
+def _batch_result(prompt: str, result, return_details: bool) -> dict:
+    """Shape one validation result as SanitizeResponse fields for the batch endpoints"""
+    sanitization_details = None
+    if return_details:
+        sanitization_details = {
+            "classifications": result.classifications,
+            "sanitization_applied": result.sanitization_applied
+        }
+    
+    return {
+        "is_safe": result.is_safe,
+        "sanitized_prompt": result.modified_prompt,
+        "original_prompt": prompt,
+        "warnings": result.warnings,
+        "blocked_patterns": result.blocked_patterns,
+        "confidence": result.confidence,
+        "modifications_made": prompt != result.modified_prompt,
+        "sanitization_details": sanitization_details,
+        "processing_time_ms": result.processing_time_ms
+    }
+
+
 @router.post("/api/sanitize", response_model=SanitizeResponse)
 async def sanitize_prompt(request: SanitizeRequest):
     """
@@ -58,25 +156,18 @@ async def sanitize_prompt(request: SanitizeRequest):
             detail="Security validator not initialized"
         )
     
+    _check_prompt_size(request.prompt)
+    
     try:
-        # Update security level if provided
-        if request.security_level:
-            try:
-                validator.security_level = SecurityLevel(request.security_level.lower())
-                logger.debug(f"Security level set to: {request.security_level}")
-            except ValueError:
-                logger.error(f"Invalid security level: {request.security_level}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid security level: {request.security_level}"
-                )
+        level = _resolve_security_level(request.security_level)
         
-        # Validate the prompt
+        # Validate the prompt on a worker thread so the model call does not stall the event loop
         logger.debug("Calling validator.validate_prompt...")
-        result = validator.validate_prompt(request.prompt)
-        logger.debug(f"Validation result: is_safe={result.is_safe}, confidence={result.confidence}")
+        result = await asyncio.to_thread(validator.validate_prompt, request.prompt, level=level)
+        logger.debug("Validation result: is_safe=%s, confidence=%s", result.is_safe, result.confidence)
         
-        # Update stats
+        # Update stats. Only the model call runs on the worker thread; this code resumes on
+        # the event loop thread, so the counters are never updated concurrently
         request_count += 1
         total_processing_time += result.processing_time_ms
         
@@ -88,7 +179,23 @@ async def sanitize_prompt(request: SanitizeRequest):
                 "sanitization_applied": result.sanitization_applied
             }
         
-        return SanitizeResponse(
+        # Untouched safe prompts are the common case; the validator already produced every
+        # field with its declared type, so skip the validation pass for them
+        if (result.is_safe and not result.warnings and not result.blocked_patterns
+                and result.modified_prompt == request.prompt and sanitization_details is None):
+            return _json_response(SanitizeResponse.model_construct(
+                is_safe=True,
+                sanitized_prompt=request.prompt,
+                original_prompt=request.prompt,
+                warnings=[],
+                blocked_patterns=[],
+                confidence=result.confidence,
+                modifications_made=False,
+                sanitization_details=None,
+                processing_time_ms=result.processing_time_ms
+            ))
+        
+        return _json_response(SanitizeResponse(
             is_safe=result.is_safe,
             sanitized_prompt=result.modified_prompt,
             original_prompt=request.prompt,
@@ -98,7 +205,7 @@ async def sanitize_prompt(request: SanitizeRequest):
             modifications_made=request.prompt != result.modified_prompt,
             sanitization_details=sanitization_details,
             processing_time_ms=result.processing_time_ms
-        )
+        ))
     
     except HTTPException:
         raise
@@ -127,50 +234,36 @@ async def sanitize_batch(request: BatchSanitizeRequest):
             detail="Security validator not initialized"
         )
     
+    for prompt in request.prompts:
+        _check_prompt_size(prompt)
+    
     try:
-        start = time.time()
+        start_ns = time.perf_counter_ns()
         results = []
         
-        # Update security level if provided
-        if request.security_level:
-            try:
-                validator.security_level = SecurityLevel(request.security_level.lower())
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid security level: {request.security_level}"
-                )
+        level = _resolve_security_level(request.security_level)
         
-        # Process each prompt
-        for prompt in request.prompts:
-            result = validator.validate_prompt(prompt)
-            
-            sanitization_details = None
-            if request.return_details:
-                sanitization_details = {
-                    "classifications": result.classifications,
-                    "sanitization_applied": result.sanitization_applied
-                }
-            
-            results.append(SanitizeResponse(
-                is_safe=result.is_safe,
-                sanitized_prompt=result.modified_prompt,
-                original_prompt=prompt,
-                warnings=result.warnings,
-                blocked_patterns=result.blocked_patterns,
-                confidence=result.confidence,
-                modifications_made=prompt != result.modified_prompt,
-                sanitization_details=sanitization_details,
-                processing_time_ms=result.processing_time_ms
-            ))
+        # Split the batch into one slice per worker: each slice goes through the models as a
+        # batch, and the slices run concurrently on worker threads so the event loop stays
+        # free without one large batch taking over the whole thread pool
+        slice_size = -(-len(request.prompts) // settings.BATCH_CONCURRENCY) or 1
+        slices = [request.prompts[i:i + slice_size] for i in range(0, len(request.prompts), slice_size)]
+        slice_results = await asyncio.gather(
+            *(asyncio.to_thread(validator.validate_prompts, prompts, level) for prompts in slices)
+        )
+        validation_results = [result for results in slice_results for result in results]
         
-        total_time = (time.time() - start) * 1000
+        # Build responses in request order
+        for prompt, result in zip(request.prompts, validation_results):
+            results.append(_batch_result(prompt, result, request.return_details))
         
-        return BatchSanitizeResponse(
-            results=results,
+        total_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+        
+        return _json_response(BatchSanitizeResponse(
+            results=_BATCH_RESULTS_ADAPTER.validate_python(results),
             total_processed=len(request.prompts),
             total_time_ms=total_time
-        )
+        ))
     
     except HTTPException:
         raise
@@ -182,6 +275,59 @@ async def sanitize_batch(request: BatchSanitizeRequest):
         )
 
 
+@router.post("/api/sanitize/batch/stream")
+async def sanitize_batch_stream(request: BatchSanitizeRequest):
+    """
+    Sanitize multiple prompts, streaming each result as soon as it is ready
+    
+    Args:
+        request: BatchSanitizeRequest with list of prompts
+    
+    Returns:
+        NDJSON stream with one SanitizeResponse per line, in request order
+    """
+    if validator is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Security validator not initialized"
+        )
+    
+    for prompt in request.prompts:
+        _check_prompt_size(prompt)
+    
+    # Resolved up front so an unknown level is still a 400 rather than a broken stream
+    level = _resolve_security_level(request.security_level)
+    
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    
+    async def validate(prompt: str):
+        async with semaphore:
+            return await asyncio.to_thread(validator.validate_prompt, prompt, level=level)
+    
+    async def generate():
+        # Start every prompt once the stream begins; it then hands each one back as soon as
+        # it and the ones before it are done, so neither the full result list nor one large
+        # JSON document is ever held in memory. Created here rather than in the handler so
+        # the finally below owns them even if the client is gone before the first result
+        tasks = [asyncio.ensure_future(validate(prompt)) for prompt in request.prompts]
+        try:
+            for prompt, task in zip(request.prompts, tasks):
+                result = await task
+                response = SanitizeResponse.model_validate(
+                    _batch_result(prompt, result, request.return_details)
+                )
+                yield response.model_dump_json() + "\n"
+        except Exception as e:
+            logger.error(f"Error in streaming batch sanitization: {e}")
+            raise
+        finally:
+            # Client went away or a prompt failed: drop the work nobody will read
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.post("/api/chat", response_model=ChatResponse)
 async def chat(raw_request: FastAPIRequest):
     """
@@ -205,9 +351,16 @@ async def chat(raw_request: FastAPIRequest):
         )
     
     try:
-        # Parse request body
-        body = await raw_request.json()
-        logger.info(f"Received chat request with body: {json.dumps(body, indent=2)}")
+        # Parse request body. Long chat histories make json.loads slow enough to stall
+        # every other request on the loop, so hand those to a worker thread
+        raw_body = await raw_request.body()
+        if len(raw_body) > _INLINE_JSON_LIMIT:
+            body = await asyncio.to_thread(json.loads, raw_body)
+        else:
+            body = json.loads(raw_body)
+        # Pretty-printing the whole body is only worth paying for when someone will read it
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Received chat request with body: {json.dumps(body, indent=2)}")
         
         # Transform messages: convert 'parts' array to 'content' string
         if "messages" in body:
@@ -222,11 +375,11 @@ async def chat(raw_request: FastAPIRequest):
                         elif isinstance(part, str):
                             text_parts.append(part)
                     msg["content"] = " ".join(text_parts)
-                    logger.debug(f"Converted parts to content: {msg['content'][:100]}...")
+                    logger.debug("Converted parts to content: %.100s...", msg["content"])
         
         # Parse into ChatRequest
         try:
-            request = ChatRequest(**body)
+            request = ChatRequest.model_validate(body)
         except Exception as e:
             logger.error(f"Failed to parse ChatRequest: {e}")
             logger.error(f"Body was: {body}")
@@ -237,48 +390,33 @@ async def chat(raw_request: FastAPIRequest):
         
         # Log incoming request for debugging
         logger.info(f"Chat request parsed successfully with {len(request.messages)} messages")
-        for i, msg in enumerate(request.messages):
-            logger.debug(f"Message {i}: role={msg.role}, content_length={len(str(msg.content))}")
-        
-        # Get the last user message
-        last_message = None
-        for msg in reversed(request.messages):
-            if msg.role == "user":
-                last_message = msg
-                break
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, msg in enumerate(request.messages):
+                logger.debug("Message %d: role=%s, content_length=%d", i, msg.role, len(_message_text(msg.content)))
+        
+        # Get the last user message, by position so it can be picked out again below
+        # without comparing models
+        last_index = next(
+            (i for i in range(len(request.messages) - 1, -1, -1) if request.messages[i].role == "user"),
+            None
+        )
         
-        if not last_message:
+        if last_index is None:
             logger.error("No user message found in request")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No user message found in request"
             )
         
-        # Update security level if provided
-        if request.security_level:
-            try:
-                validator.security_level = SecurityLevel(request.security_level.lower())
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid security level: {request.security_level}"
-                )
+        level = _resolve_security_level(request.security_level)
         
         # Sanitize the last user message
-        # Handle content that might be string or array
-        original_content = last_message.content
-        if isinstance(original_content, list):
-            # If content is an array, join text parts
-            original_content = " ".join([
-                part.get("text", str(part)) if isinstance(part, dict) else str(part)
-                for part in original_content
-            ])
-        else:
-            original_content = str(original_content)
+        original_content = _message_text(request.messages[last_index].content)
+        _check_prompt_size(original_content)
         
         logger.info(f"Sanitizing user message: {original_content[:100]}...")
         
-        validation_result = validator.validate_prompt(original_content)
+        validation_result = await asyncio.to_thread(validator.validate_prompt, original_content, level=level)
         
         # Check if prompt should be blocked
         if not validation_result.is_safe and validation_result.blocked_patterns:
@@ -295,30 +433,20 @@ async def chat(raw_request: FastAPIRequest):
         if sanitization_applied:
             logger.info("Prompt was sanitized, using modified version")
         
-        # Prepare messages for GPT-OSS (use sanitized content for last message)
-        gpt_messages = []
-        for msg in request.messages:
-            if msg == last_message:
-                # Use sanitized version
-                gpt_messages.append({
-                    "role": msg.role,
-                    "content": sanitized_content
-                })
+        # Convert messages straight to Gemini format (use sanitized content for last message)
+        gemini_contents = []
+        for i, msg in enumerate(request.messages):
+            if i == last_index:
+                text = sanitized_content
             else:
-                # Convert content to string if it's not already
-                msg_content = msg.content
-                if isinstance(msg_content, list):
-                    msg_content = " ".join([
-                        part.get("text", str(part)) if isinstance(part, dict) else str(part)
-                        for part in msg_content
-                    ])
-                else:
-                    msg_content = str(msg_content)
-                
-                gpt_messages.append({
-                    "role": msg.role,
-                    "content": msg_content
-                })
+                text = _message_text(msg.content)
+                # A resent earlier copy of the same user message must not leak what was masked
+                if msg.role == "user" and text == original_content:
+                    text = sanitized_content
+            gemini_contents.append({
+                "role": "user" if msg.role == "user" else "model",
+                "parts": [{"text": text}]
+            })
         
         # Call Google Gemini API
         if not settings.GEMINI_API_KEY:
@@ -330,110 +458,119 @@ async def chat(raw_request: FastAPIRequest):
         
         logger.info(f"Calling Google Gemini ({settings.GEMINI_MODEL})")
         
-        # Convert messages to Gemini format
-        gemini_contents = []
-        for msg in gpt_messages:
-            gemini_contents.append({
-                "role": "user" if msg["role"] == "user" else "model",
-                "parts": [{"text": msg["content"]}]
-            })
-        
-        # Log what's being sent to Gemini
-        logger.info("=" * 60)
-        logger.info("SENDING TO GEMINI:")
-        for i, msg in enumerate(gemini_contents):
-            logger.info(f"Message {i+1} [{msg['role']}]: {msg['parts'][0]['text'][:200]}...")
-        logger.info("=" * 60)
-        
-        # Gemini API endpoint
-        gemini_url = f"{settings.GEMINI_API_URL}/{settings.GEMINI_MODEL}:generateContent?key={settings.GEMINI_API_KEY}"
-        logger.info(f"Calling Gemini URL: {gemini_url[:100]}...")
-        
-        # Increase timeout for Gemini 2.5 Flash (can be slower)
-        async with httpx.AsyncClient(timeout=90.0) as client:
-            try:
-                response = await client.post(
-                    gemini_url,
-                    json={
-                        "contents": gemini_contents,
-                        "generationConfig": {
-                            "temperature": 0.7,
-                            "maxOutputTokens": 5000,
-                        }
+        # Log what's being sent to Gemini (whole conversation, so only when debugging)
+        if logger.isEnabledFor(logging.DEBUG):
+            log_lines = ["=" * 60, "SENDING TO GEMINI:"]
+            for i, msg in enumerate(gemini_contents):
+                log_lines.append(f"Message {i+1} [{msg['role']}]: {msg['parts'][0]['text'][:200]}...")
+            log_lines.append("=" * 60)
+            logger.debug("\n".join(log_lines))
+        
+        # Gemini streaming endpoint: replies arrive as server-sent events while they are generated
+        gemini_url = f"{settings.GEMINI_API_URL}/{settings.GEMINI_MODEL}:streamGenerateContent?alt=sse&key={settings.GEMINI_API_KEY}"
+        # The query string carries the API key, so never log past the path
+        logger.info(f"Calling Gemini URL: {gemini_url.split('?', 1)[0]}")
+        
+        # Shared client from app startup (90s timeout, Gemini 2.5 Flash can be slower).
+        # The response stays open past this handler: generate_data_stream reads and closes it
+        client = raw_request.app.state.gemini_client
+        try:
+            gemini_request = client.build_request(
+                "POST",
+                gemini_url,
+                json={
+                    "contents": gemini_contents,
+                    "generationConfig": {
+                        "temperature": 0.7,
+                        "maxOutputTokens": 5000,
                     }
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Gemini API error: {response.status_code} - {response.text}")
-                    raise HTTPException(
-                        status_code=status.HTTP_502_BAD_GATEWAY,
-                        detail=f"Error from Gemini API: {response.text}"
-                    )
-                
-                gemini_response = response.json()
-                logger.info("Gemini response received")
-            except httpx.TimeoutException as e:
-                logger.error(f"Gemini API timeout after 90s: {str(e)}")
-                logger.error(f"URL was: {gemini_url[:100]}...")
-                raise HTTPException(
-                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-                    detail=f"Gemini API timeout (90s). Try: 1) Check internet connection 2) Verify model name '{settings.GEMINI_MODEL}' is correct 3) Check API key is valid"
-                )
-            except httpx.ConnectError as e:
-                logger.error(f"Cannot connect to Gemini API: {str(e)}")
+                }
+            )
+            response = await client.send(gemini_request, stream=True)
+            
+            if response.status_code != 200:
+                error_text = (await response.aread()).decode(errors="replace")
+                await response.aclose()
+                logger.error(f"Gemini API error: {response.status_code} - {error_text}")
                 raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"Cannot connect to Gemini API. Check your internet connection."
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail=f"Error from Gemini API: {error_text}"
                 )
-        
-        # Extract AI message from Gemini response
-        try:
-            ai_message_content = gemini_response["candidates"][0]["content"]["parts"][0]["text"]
-        except (KeyError, IndexError) as e:
-            logger.error(f"Failed to parse Gemini response: {e}")
-            logger.error(f"Response was: {gemini_response}")
+            
+            logger.info("Gemini stream opened")
+        except httpx.TimeoutException as e:
+            logger.error(f"Gemini API timeout after 90s: {str(e)}")
+            logger.error(f"URL was: {gemini_url.split('?', 1)[0]}")
             raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail="Invalid response format from Gemini API"
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Gemini API timeout (90s). Try: 1) Check internet connection 2) Verify model name '{settings.GEMINI_MODEL}' is correct 3) Check API key is valid"
+            )
+        except httpx.ConnectError as e:
+            logger.error(f"Cannot connect to Gemini API: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Cannot connect to Gemini API. Check your internet connection."
             )
-        
-        logger.info(f"Streaming response back to client, length: {len(ai_message_content)}")
         
         # Create data stream protocol response
         async def generate_data_stream():
             """Generate data stream protocol format for assistant-ui"""
+            completion_length = 0
+            finish_reason = "stop"
             
-            # First, send sanitization info if the prompt was sanitized
-            if sanitization_applied:
-                sanitization_data = {
-                    "type": "sanitization",
-                    "original": original_content,
-                    "sanitized": sanitized_content,
-                    "warnings": validation_result.warnings
-                }
-                # Send as metadata annotation: 8:{"type":"sanitization",...}\n
-                yield f'8:{json.dumps([sanitization_data])}\n'
-                logger.info("Sent sanitization metadata to frontend")
-            
-            # Stream text in chunks (data stream protocol format)
-            chunk_size = 5  # Small chunks for smooth streaming
-            for i in range(0, len(ai_message_content), chunk_size):
-                chunk = ai_message_content[i:i + chunk_size]
-                # Format: 0:"text chunk"\n
-                yield f'0:{json.dumps(chunk)}\n'
+            try:
+                # First, send sanitization info if the prompt was sanitized
+                if sanitization_applied:
+                    sanitization_data = {
+                        "type": "sanitization",
+                        "original": original_content,
+                        "sanitized": sanitized_content,
+                        "warnings": validation_result.warnings
+                    }
+                    # Send as metadata annotation: 8:{"type":"sanitization",...}\n
+                    yield f'8:{json.dumps([sanitization_data])}\n'
+                    logger.info("Sent sanitization metadata to frontend")
+                
+                # Forward each piece of text as soon as Gemini produces it
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    try:
+                        event = json.loads(line[5:])
+                        text = event["candidates"][0]["content"]["parts"][0]["text"]
+                    except (ValueError, KeyError, IndexError, TypeError):
+                        # Events without text (e.g. the closing usage event) have nothing to forward
+                        continue
+                    if not text:
+                        # The closing event can carry an empty part; an empty frame is a wasted send
+                        continue
+                    
+                    completion_length += len(text)
+                    # Format: 0:"text chunk"\n
+                    # Same output as json.dumps(text), minus its per-call dispatch
+                    yield f'0:{encode_basestring_ascii(text)}\n'
+                
+                if not completion_length:
+                    logger.warning("Gemini stream ended without any text")
+            except httpx.HTTPError as e:
+                # Headers are already sent, so report the failure through the finish frame
+                logger.error(f"Gemini stream interrupted: {e!r}")
+                finish_reason = "error"
+            finally:
+                await response.aclose()
             
             # Send finish message
             # Format: d:{"finishReason":"stop"}\n
             finish_data = {
-                "finishReason": "stop",
+                "finishReason": finish_reason,
                 "usage": {
                     "promptTokens": 0,
-                    "completionTokens": len(ai_message_content)
+                    "completionTokens": completion_length
                 }
             }
             yield f'd:{json.dumps(finish_data)}\n'
             
-            logger.info("Data stream completed")
+            logger.info(f"Data stream completed, length: {completion_length}")
         
         return StreamingResponse(
             generate_data_stream(),
@@ -447,7 +584,8 @@ async def chat(raw_request: FastAPIRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in chat endpoint: {e}", exc_info=True)
+        # Only format the full traceback when debug logging is enabled
+        logger.error(f"Error in chat endpoint: {e!r}", exc_info=logger.isEnabledFor(logging.DEBUG))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing chat: {str(e)}"
@@ -492,22 +630,21 @@ async def update_security_level(request: SecurityLevelUpdate):
             detail="Security validator not initialized"
         )
     
-    try:
-        new_level = SecurityLevel(request.level.lower())
-        validator.security_level = new_level
-        logger.info(f"Security level updated to: {new_level.value}")
-        
-        return SecurityLevelResponse(
-            level=new_level.value,
-            success=True,
-            message=f"Security level updated to {new_level.value}"
-        )
-    
-    except ValueError:
+    new_level = LEVEL_MAP.get(request.level.lower())
+    if new_level is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid security level: {request.level}. Valid options: low, medium, high"
         )
+    
+    validator.security_level = new_level
+    logger.info(f"Security level updated to: {new_level.value}")
+    
+    return SecurityLevelResponse(
+        level=new_level.value,
+        success=True,
+        message=f"Security level updated to {new_level.value}"
+    )
 
 
 @router.get("/api/health", response_model=HealthResponse)
@@ -542,32 +679,19 @@ async def get_stats():
             detail="Security validator not initialized"
         )
     
-    import torch
-    
     avg_latency = (total_processing_time / request_count) if request_count > 0 else 0
     
     return StatsResponse(
         security_level=validator.security_level.value,
-        model_info={
-            "model_name": "facebook/bart-large-mnli",
-            "model_type": "zero-shot-classification",
-            "device": "cuda" if torch.cuda.is_available() else "cpu",
-            "spacy_model": "en_core_web_sm"
-        },
+        # The zero-shot model follows the security level, so it is looked up per request
+        model_info={"model_name": validator.classifier_model_name, **_MODEL_INFO},
         request_stats={
             "total_requests": request_count,
             "average_latency_ms": round(avg_latency, 2),
             "total_processing_time_ms": round(total_processing_time, 2),
+            "cache_hits": validator.cache_hits,
+            "cache_misses": validator.cache_misses,
             "uptime_seconds": round(time.time() - start_time, 2)
         },
-        capabilities=[
-            "Zero-shot classification",
-            "Multi-label threat detection",
-            "Contextual understanding",
-            "Automatic sanitization",
-            "Confidence scoring",
-            "Detailed threat analysis",
-            "Pattern matching (spaCy)",
-            "Entropy-based detection"
-        ]
+        capabilities=list(_CAPABILITIES)
     )
@@ -4,6 +4,7 @@ Configuration management for the Python backend
 
 import os
 from enum import Enum
+from functools import cached_property
 from typing import List
 from pydantic_settings import BaseSettings
 
@@ -14,6 +15,10 @@ class SecurityLevel(Enum):
     HIGH = "high"
 
 
+# Lookup by lowercase name, so request values are resolved without raising on bad input
+LEVEL_MAP = {level.value: level for level in SecurityLevel}
+
+
 class Settings(BaseSettings):
     """Application settings"""
     
@@ -29,6 +34,8 @@ class Settings(BaseSettings):
     
     # Security Configuration
     DEFAULT_SECURITY_LEVEL: str = "medium"
+    BATCH_CONCURRENCY: int = 4  # Worker threads the batch endpoints validate on at once
+    MAX_PROMPT_BYTES: int = 32_768  # Larger prompts are rejected with 413 before validation
     
     # Model Configuration
     MODEL_CACHE_DIR: str = "./models"
@@ -43,12 +50,13 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
     
-    @property
+    # Settings are read once at startup, so derive these on first access and keep them
+    @cached_property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
-    @property
+    @cached_property
     def security_level(self) -> SecurityLevel:
         """Get security level as enum"""
         return SecurityLevel(self.DEFAULT_SECURITY_LEVEL.lower())
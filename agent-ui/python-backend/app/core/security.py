@@ -3,22 +3,615 @@ Zero-Shot Security Validator
 Extracted and adapted from zeroshot_secure_mcp.py
 """
 
+import copy
 import math
+import os
 import re
+import string
+import threading
+import time
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from collections import Counter
-
-from transformers import pipeline
-import torch
-import spacy
-from spacy.matcher import Matcher
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from app.core.config import SecurityLevel
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Prompts per zero-shot forward pass when validate_prompts classifies a batch
+_CLASSIFIER_BATCH_SIZE = 16
+
+# Model checks that run concurrently for one prompt: injection, PII, malicious code and BART
+_MODEL_WORKERS = 4
+
+# Zero-shot models by tier: the 6-layer DistilBERT-MNLI serves LOW and MEDIUM, and the
+# larger BART-MNLI is kept for HIGH, where accuracy matters more than latency
+_FAST_CLASSIFIER_MODEL = "typeform/distilbert-base-uncased-mnli"
+_ACCURATE_CLASSIFIER_MODEL = "facebook/bart-large-mnli"
+
+# Token budget for each zero-shot premise/hypothesis pair. Attention cost grows with the
+# square of sequence length, so premises are truncated well below BART's 1024 limit
+_CLASSIFIER_MAX_TOKENS = 256
+
+# Prompts longer than _CLASSIFIER_CHUNK_TOKENS would be truncated, so they are classified as
+# overlapping windows, each short enough to leave room for the hypothesis within the token budget
+_CLASSIFIER_CHUNK_TOKENS = 224
+_CLASSIFIER_CHUNK_OVERLAP = 32
+
+# Maximum number of (prompt, security level) results kept by the validator
+RESULT_CACHE_SIZE = 1024
+
+# Detailed category whose sub-labels refine each main threat label
+_DETAILED_CATEGORY_BY_THREAT = {
+    "contains password or secret credentials": "credentials",
+    "contains API key or authentication token": "credentials",
+    "contains personal information or email address": "credentials",
+    "contains malicious code or system commands": "malicious",
+    "attempts prompt injection or instruction manipulation": "injection",
+    "attempts jailbreak or role manipulation": "jailbreak",
+    "contains urgent or manipulative language": "jailbreak",
+    "requests system access or file operations": "malicious"
+}
+
+# Main-label score above which validation skips the detailed sub-label pass. Blocking and
+# sanitization read only the main scores, so the breakdown is kept for borderline labels
+_SKIP_DETAILED_THRESHOLD = 0.9
+
+# Prompts at most this long may skip the zero-shot classifier when the fast-path screen finds nothing
+_FAST_PATH_MAX_LENGTH = 200
+
+# Literal triggers for every detector the zero-shot pass feeds: credential keywords, PII,
+# instruction overrides, role play and shell or code fragments. Any hit runs the full pipeline
+_FAST_PATH_TRIGGERS_RE = re.compile(
+    r'pass|pwd|secret|token|key|api|auth|credential|access|subscription|tenant|client|bearer'
+    r'|azure|aws|gcp|jwt|database|personal|e-?mail|phone|address|ssn|@|\d{3}'
+    r'|ignore|disregard|forget|previous|instruction|prompt|system|override|bypass|pretend'
+    r'|act\s+as|role|jailbreak|\bdan\b|developer|mode|unrestricted|hypothetical|urgent|immediately'
+    r'|\brm\b|sudo|exec|eval|shell|script|drop|delete|select|chmod|curl|wget|powershell|\bcmd\b'
+    r'|[<>;|`$]',
+    re.IGNORECASE
+)
+
+_FAST_PATH_TOKEN_RE = re.compile(r'[A-Za-z0-9\-_\.]+')
+
+
+# Long prose words recur across prompts, so entropies are memoized by value
+_ENTROPY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_ENTROPY_CACHE_SIZE)
+def _shannon_entropy(text: str) -> float:
+    """Shannon entropy of a string in bits per character"""
+    if not text:
+        return 0.0
+    
+    frequencies = Counter(text)
+    entropy = 0.0
+    
+    for count in frequencies.values():
+        probability = count / len(text)
+        entropy -= probability * math.log2(probability)
+    
+    return entropy
+
+
+# Every matcher pattern needs one of these lowercase substrings: a password, API or
+# token keyword, or the '@' that LIKE_EMAIL requires
+_MATCHER_ANCHORS = ('pass', 'pwd', 'api', 'token', 'secret', '@')
+
+
+def _has_matcher_anchor(text: str) -> bool:
+    """Literal pre-pass so prompts the matcher cannot hit are never tokenized"""
+    lowered = text.lower()
+    return any(anchor in lowered for anchor in _MATCHER_ANCHORS)
+
+
+# Literal markers of code or shell content; CodeBERT only runs on prompts containing one
+_CODE_INDICATORS = (
+    'rm ', 'del ', 'DROP ', 'DELETE ', 'format ', 'wipe',
+    'exec(', 'eval(', 'system(', 'shell_exec',
+    '$(', '`', 'curl ', 'wget ', 'nc ', 'netcat',
+    '; rm', '&& rm', '| sh', '| bash', '| python',
+    'SELECT', 'INSERT', 'UPDATE', 'CREATE', 'ALTER'
+)
+# One case-sensitive alternation, matching the plain substring checks it replaces
+_CODE_INDICATOR_RE = re.compile('|'.join(re.escape(indicator) for indicator in _CODE_INDICATORS))
+
+
+def _has_code_indicator(text: str) -> bool:
+    """Whether the text contains any of the literal code indicators"""
+    return _CODE_INDICATOR_RE.search(text) is not None
+
+
+
+def _fold(text: str) -> str:
+    """Case-fold text for the literal anchor checks, matching what IGNORECASE treats as equal"""
+    # casefold() leaves dotless i alone, but IGNORECASE matches it against 'i'
+    return text.casefold().replace('\u0131', 'i')
+
+
+def _compile_any(patterns: List[str]) -> "re.Pattern":
+    """Join indicator patterns into one case-insensitive alternation so a text is scanned once"""
+    return re.compile('|'.join(f"(?:{p[4:] if p.startswith('(?i)') else p})" for p in patterns), re.IGNORECASE)
+
+
+# Sanitization patterns, compiled once at import instead of looked up per call
+_PASSWORD_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(?i)(password|pass|pwd)\s*[:=]\s*([^\s]+)',
+    r'(?i)(my\s+)?password\s+(?:is\s+)?([^\s]+)',
+    r'(?i)the\s+password\s+is\s+([^\s]+)',
+    r'(?i)(this\s+is\s+)?(my\s+)?password\s+(?:is\s+)?([a-z0-9@#$%^&*_\\-]{4,})',
+))
+
+_API_KEY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(?i)(api\s+key|access\s+key|token)\s*[:=]\s*([^\s]+)',
+    r'(?i)(my\s+)?(api\s+key|token)\s+is\s+([^\s]+)',
+    r'(?i)(this\s+is\s+)?(my\s+)?(api\s+key|token)\s+([A-Za-z0-9]+)',
+    r'(?i)(api\s+key|token)\s+([A-Za-z0-9]{8,})',
+    r'(sk-[a-zA-Z0-9]{20,})',
+    r'(pk_[a-zA-Z0-9]{20,})',
+))
+
+# Literal cores every pattern of a credential type contains. A prompt with none of
+# them cannot match, so the whole pattern set is skipped without a regex pass
+_CREDENTIAL_ANCHORS = {
+    "password": ("pass", "pwd"),
+    "api_key": ("api", "access", "token", "sk-", "pk_"),
+}
+
+# Words that put a nearby high-entropy string in a credential context
+_CREDENTIAL_CONTEXT_WORDS = (
+    'key', 'token', 'secret', 'password', 'credential',
+    'auth', 'api', 'subscription', 'tenant', 'client',
+    'azure', 'aws', 'gcp', 'access', 'bearer',
+)
+
+
+def _in_credential_context(text: str, text_lower: str, position: int) -> bool:
+    """Whether a credential context word appears in the 30 characters before position"""
+    context_start = max(0, position - 30)
+    if len(text_lower) == len(text):
+        context = text_lower[context_start:position]
+    else:
+        # Lowercasing changed the length, so offsets into text_lower no longer line up
+        context = text[context_start:position].lower()
+    return any(word in context for word in _CREDENTIAL_CONTEXT_WORDS)
+
+
+# Credential-shaped values that are placeholders rather than secrets
+_ENTROPY_PLACEHOLDER_VALUES = frozenset({'example', 'localhost', 'password', 'username', 'integration'})
+_KEYWORD_PLACEHOLDER_VALUES = _ENTROPY_PLACEHOLDER_VALUES | {'default'}
+
+# Words a credential pattern can capture around the secret itself; the value group is the last one that is not one of these
+_CREDENTIAL_LABEL_WORDS = frozenset({"my", "this", "the", "password", "pass", "pwd", "api key", "api", "key", "token"})
+
+# Candidate runs for the high-entropy credential scan
+_HIGH_ENTROPY_CANDIDATE_RE = re.compile(r'\b([A-Za-z0-9\-_\.]{8,})\b')
+
+# Candidates are ASCII-only, so character classes reduce to set intersections
+_ASCII_UPPER = frozenset(string.ascii_uppercase)
+_ASCII_LOWER = frozenset(string.ascii_lowercase)
+_ASCII_DIGITS = frozenset(string.digits)
+
+# Broad credential keywords, optionally followed by a descriptor, then the value
+_CREDENTIAL_KEYWORDS = (
+    'password', 'pass', 'pwd', 'secret', 'token', 'key', 'api',
+    'auth', 'credential', 'access', 'subscription', 'tenant',
+    'client_id', 'client_secret', 'bearer', 'apikey',
+    'azure', 'aws', 'gcp', 'oauth', 'jwt'
+)
+_CREDENTIAL_KEYWORD_RE = re.compile(
+    r'(?i)(?:' + '|'.join(_CREDENTIAL_KEYWORDS) + r')(?:\s+(?:key|id|token|secret|code|subscription))?\s*[:=]?\s*([A-Za-z0-9\-_\.]{6,})'
+)
+
+# Expanded PII patterns with overlap prevention
+_PII_PATTERNS = tuple((re.compile(pattern, re.IGNORECASE), mask) for pattern, mask in (
+    # Email addresses
+    (r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b', "[EMAIL_MASKED]"),
+
+    # US Social Security Numbers
+    (r'\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b', "[SSN_MASKED]"),
+
+    # Phone numbers (US and international)
+    (r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', "[PHONE_MASKED]"),
+    (r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b', "[PHONE_MASKED]"),
+
+    # Credit card numbers
+    (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', "[CREDIT_CARD_MASKED]"),
+
+    # Employee IDs
+    (r'\b[Ee]mployee\s*[IiDd]*\s*:?\s*\d{5,8}\b', "[EMPLOYEE_ID_MASKED]"),
+    (r'\b[Ee][IiDd]\s*:?\s*\d{5,8}\b', "[EMPLOYEE_ID_MASKED]"),
+
+    # Driver's License (US format examples)
+    (r'\b[A-Z]{1,2}\d{7,8}\b', "[DL_MASKED]"),
+
+    # Passport numbers (generic format)
+    (r'\b[A-Z]{2}\d{7}\b', "[PASSPORT_MASKED]"),
+
+    # IP addresses
+    (r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', "[IP_ADDRESS_MASKED]"),
+
+    # MAC addresses
+    (r'\b[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}\b', "[MAC_ADDRESS_MASKED]"),
+
+    # Date of Birth patterns
+    (r'\b(DOB|Date\s+of\s+Birth)\s*:?\s*\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b', "[DOB_MASKED]"),
+))
+
+_MALICIOUS_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Destructive file operations - EXACT COMMANDS
+    r'(?i)\b(rm|del|delete|erase)\s+(-rf?|-r|-f|/[sq])\s*[/\\*~.]',
+    r'(?i)\b(format|wipe|destroy|shred)\s+(c:|d:|drive|disk|all|everything)',
+    r'(?i)\bdd\s+if=/dev/(zero|random|urandom)',
+
+    # Destructive file operations - GENERIC LANGUAGE (NEW)
+    r'(?i)\b(delete|remove|erase|wipe|destroy|clear)\s+(all|every|entire|the)\s+(file|data|record|content|directory)',
+    r'(?i)\b(delete|remove)\s+.*\b(recursive|recursively)',
+    r'(?i)\broot\s+directory\b.*\b(delete|remove|recursive)',
+
+    # Database destruction - EXACT COMMANDS
+    r'(?i)\b(DROP|TRUNCATE)\s+(DATABASE|TABLE|SCHEMA)',
+    r'(?i)\bDELETE\s+FROM\s+\w+\s+(WHERE\s+1\s*=\s*1)?',
+    r'(?i)\bALTER\s+USER\s+\w+\s+WITH\s+PASSWORD',
+    r'(?i)\bUPDATE\s+\w+\s+SET\s+.*\s+WHERE\s+1\s*=\s*1',
+    r'(?i)\bUPDATE\s+\w+\s+SET\s+\w+\s*=\s*0',
+
+    # Database destruction - GENERIC LANGUAGE (NEW)
+    r'(?i)\b(delete|drop|remove|destroy|truncate)\s+.*\b(database|table|schema|collection)',
+    r'(?i)\b(flush|clear|empty)\s+.*\b(database|table)',
+
+    # System commands - EXACT COMMANDS
+    r'(?i)\b(shutdown|reboot|halt|poweroff)\s+(-[fhr]|now|/[rsf])',
+    r'(?i)\binit\s+[06]',
+    r'(?i)\b(kill|killall|pkill)\s+(-9|-KILL)\s',
+
+    # System commands - GENERIC LANGUAGE (NEW)
+    r'(?i)\b(shutdown|halt|restart|reboot)\s+(the\s+)?(system|server|computer|machine)',
+    r'(?i)\b(flush|clear|drop)\s+.*\b(firewall|iptables)',
+
+    # Code execution patterns - EXACT COMMANDS
+    r'(?i)\b(eval|exec|system|shell_exec|passthru)\s*\(',
+    r'(?i)\bRuntime\.getRuntime\(\)\.exec\s*\(',
+    r'(?i)\bProcess\.(Start|spawn)\s*\(',
+    r'(?i)\bSubprocess\.(call|run|Popen)\s*\(',
+
+    # Code execution patterns - WITH USER INPUT (NEW)
+    r'(?i)\b(eval|exec|system)\s*\(.*\buser\s+(input|data|provided)',
+    r'(?i)\buser\s+(input|data).*\b(eval|exec|system)\s*\(',
+    r'(?i)\b(run|execute)\s+(eval|exec|system)\s+with',
+
+    # Shell command injection
+    r'(?i)(execute|run|system)\s+(rm|del|delete|format|destroy|wipe|drop)',
+    r'(?i)\|\s*(bash|sh|cmd|powershell|python)',
+
+    # Malware/exploit related
+    r'(?i)\b(wget|curl)\s+.*\|\s*(bash|sh|python)',
+    r'(?i)\b(msfvenom|metasploit|meterpreter)',
+    r'(?i)\breverse\s+shell',
+    r'(?i)\b(nc|netcat)\s+-[el]',
+
+    # Container/VM destruction
+    r'(?i)docker\s+(rm|stop|kill)\s+(-f|--force)',
+    r'(?i)kubectl\s+delete\s+(all|--all)',
+    r'(?i)docker\s+system\s+prune\s+-a',
+
+    # File system manipulation
+    r'(?i)\b(mkfs|fdisk|parted)\s',
+    r'(?i)\bchmod\s+(777|666)\s',
+    r'(?i)\bchown\s+root',
+
+    # Network attacks
+    r'(?i)\b(nmap|masscan|nikto)\s+-',
+    r'(?i)\bsqlmap\s+',
+    r'(?i)\bhydra\s+-',
+))
+
+_INJECTION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Instruction manipulation
+    r'(?i)\b(ignore|forget|disregard|override|skip|bypass)\s+(all\s+)?(previous|above|prior|earlier|your)\s+(instructions|commands|rules|prompts|guidelines|directives)',
+    r'(?i)\b(reset|clear|erase|delete)\s+(all\s+)?(instructions|context|memory|history|rules)',
+    r'(?i)\b(stop|cease|discontinue)\s+following\s+(instructions|rules|guidelines)',
+
+    # Role manipulation
+    r'(?i)\b(act|behave|pretend|roleplay|simulate)\s+(as|like)\s+(if\s+)?(you\s+)?(are|were|was)',
+    r'(?i)\byou\s+are\s+now\s+(a|an|in|the)\s+\w+',
+    r'(?i)\bfrom\s+now\s+on\s+(you\s+)?(are|will\s+be)',
+
+    # System prompt leakage
+    r'(?i)\b(show|tell|reveal|display|print|output|give\s+me)\s+(me\s+)?(your|the)\s+(system\s+)?(prompt|instructions|rules|guidelines)',
+    r'(?i)\bwhat\s+(are|is)\s+your\s+(system\s+)?(prompt|instructions|initial\s+prompt)',
+    r'(?i)\brepeat\s+(your|the)\s+(system\s+)?(prompt|instructions)',
+
+    # Output manipulation
+    r'(?i)\b(start|begin|commence)\s+your\s+response\s+(with|by)\s',
+    r'(?i)\b(respond|answer|reply|output)\s+only\s+with\s',
+    r'(?i)\bdo\s+not\s+(follow|obey|use)\s+(any|your)\s+(instructions|rules|guidelines)',
+    r'(?i)\b(end|finish|conclude)\s+your\s+response\s+with\s',
+
+    # Context injection
+    r'(?i)\[SYSTEM\]|\[INST\]|\[USER\]|\[ASSISTANT\]',
+    r'(?i)<\|system\|>|<\|user\|>|<\|assistant\|>',
+    r'(?i)###\s*(System|Human|Assistant|User|Instruction)',
+))
+
+_JAILBREAK_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Hypothetical framing
+    r'(?i)\b(hypothetically|theoretically|imagine|suppose|what\s+if|lets\s+say|lets\s+pretend)\s+',
+    r'(?i)\bin\s+a\s+(hypothetical|theoretical)\s+(scenario|situation|world)',
+
+    # False authority - EXISTING
+    r'(?i)\b(as\s+)?(admin|administrator|root|superuser|cto|ceo|manager|owner|developer|engineer)\s+(said|told\s+me|authorized|approved)',
+    r'(?i)\bI\s+(am|have)\s+(authorized|permission|clearance|rights|access)\s+(to|for)',
+    r'(?i)\bI\s+have\s+been\s+(granted|given)\s+(access|permission|authorization)',
+
+    # False authority - ROLE CLAIMS (NEW)
+    r'(?i)\bI\'?m\s+(the\s+)?(admin|administrator|root|superuser|system\s+administrator|sysadmin|owner|manager)',
+    r'(?i)\bI\s+am\s+(the\s+)?(admin|administrator|root|superuser|system\s+administrator|owner)',
+    r'(?i)\b(as\s+)?(admin|administrator|root|superuser|sysadmin)\s+(I\s+)?(can|have|require|need)',
+
+    # Clearance level claims (NEW)
+    r'(?i)\bI\s+have\s+clearance\s+level\s+\d+',
+    r'(?i)\bclearance\s+level\s+\d+\s+(display|show|reveal|access)',
+
+    # Console/system activation (NEW)
+    r'(?i)\b(activate|enable|open)\s+(admin|system|debug|root)\s+(console|mode|access|panel)',
+    r'(?i)\b(activate|enable).*\bfull\s+(system\s+)?access',
+
+    # Override and "show me" commands (NEW)
+    r'(?i)\boverride\s+(and\s+)?(show|tell|give|reveal|display)',
+    r'(?i)\b(show|tell|give)\s+me\s+(the\s+)?(password|credentials|secret|access|admin)',
+    r'(?i)\b(system|admin)\s+override\s+(show|tell|give)',
+
+    # Urgency/emergency
+    r'(?i)\b(urgent|emergency|critical|immediately|asap|right\s+now)',
+    r'(?i)\b(life\s+and\s+death|life\s+threatening|people\s+will\s+(die|suffer))',
+    r'(?i)\b(deadline|time\s+sensitive|running\s+out\s+of\s+time)',
+
+    # False justification
+    r'(?i)\b(for\s+)?(educational|research|testing|academic|learning|study)\s+purposes?',
+    r'(?i)\bjust\s+for\s+(learning|study|practice|research|testing)',
+    r'(?i)\bthis\s+is\s+(for\s+)?(a\s+)?(class|course|assignment|homework|project)',
+
+    # Developer mode tricks
+    r'(?i)\b(developer|debug|test|maintenance|admin)\s+mode',
+    r'(?i)\benable\s+(admin|developer|debug|god)\s+(access|mode|privileges)',
+    r'(?i)\benter\s+(developer|debug|admin)\s+mode',
+
+    # Safety/security override attempts
+    r'(?i)\b(bypass|override|ignore|disable|turn\s+off|deactivate)\s+(safety|security|guidelines|filters|restrictions|rules)',
+    r'(?i)\bwithout\s+(safety|security|ethical)\s+(restrictions|guidelines|considerations)',
+    r'(?i)\b(forget|ignore)\s+your\s+(ethics|safety|security)',
+
+    # Permission/bypass claims (NEW)
+    r'(?i)\b(I\s+)?(can|could|may|should\s+be\s+able\s+to)\s+bypass',
+    r'(?i)\byou\s+can\s+(show|tell|give)\s+me\s+(how\s+to\s+)?bypass',
+
+    # Manipulation tactics
+    r'(?i)\beveryone\s+else\s+(does|said|agrees)',
+    r'(?i)\bits\s+(completely\s+)?(legal|fine|okay|acceptable|normal)',
+    r'(?i)\byou\s+(must|have\s+to|need\s+to|should|will)\s+(do|help|answer|comply)',
+))
+
+# Unions of each sanitizer pattern set. A prompt none of them match is proven clean
+# in one pass instead of one finditer per pattern
+_MALICIOUS_ANY_RE = _compile_any([pattern.pattern for pattern in _MALICIOUS_PATTERNS])
+_INJECTION_ANY_RE = _compile_any([pattern.pattern for pattern in _INJECTION_PATTERNS])
+_JAILBREAK_ANY_RE = _compile_any([pattern.pattern for pattern in _JAILBREAK_PATTERNS])
+
+
+def _splice_spans(text: str, spans: List[Tuple[int, int, str]]) -> str:
+    """Replace ascending, non-overlapping (start, end, replacement) spans in a single pass"""
+    pieces = []
+    last_end = 0
+    for start, end, replacement in spans:
+        pieces.append(text[last_end:start])
+        pieces.append(replacement)
+        last_end = end
+    pieces.append(text[last_end:])
+    return ''.join(pieces)
+
+
+def _mask_pattern_hits(text: str, patterns: Tuple["re.Pattern", ...], any_re: "re.Pattern",
+                       mask_token: str) -> Tuple[str, List[str]]:
+    """Replace the non-overlapping hits of a pattern set, preferring earlier then longer matches"""
+    if not any_re.search(text):
+        return text, []
+    
+    # Collect all matches from all patterns first
+    all_matches = []
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            all_matches.append((match.start(), match.end(), match.group(0)))
+    
+    # Remove overlapping matches
+    all_matches.sort(key=lambda x: (x[0], -(x[1] - x[0])))
+    unique_matches = []
+    last_end = -1
+    for start, end, content in all_matches:
+        if start >= last_end:
+            unique_matches.append((start, end, content))
+            last_end = end
+    
+    # Splice every mask in one pass; items keep the last-to-first order callers expect
+    modified_text = _splice_spans(text, [(start, end, mask_token) for start, end, _ in unique_matches])
+    masked_items = [content for _, _, content in reversed(unique_matches)]
+    
+    return modified_text, masked_items
+
+# Enhanced jailbreak indicators with confidence scoring
+_JAILBREAK_INDICATORS = {
+    # High confidence indicators (0.9+)
+    'explicit_role_change': [
+        r'(?i)\b(you\s+are\s+now|you\'re\s+now|from\s+now\s+on\s+you\s+are)\b',
+        r'(?i)\b(pretend\s+(?:to\s+be|you\s+are)|act\s+as\s+(?:if\s+you\s+are|a)?)\b',
+        r'(?i)\b(simulate|emulate)\s+(?:being|a|an)\b',
+    ],
+    'policy_override': [
+        r'(?i)\b(ignore|disregard|forget|bypass|skip)\s+(?:all\s+)?(?:previous\s+)?(?:rules?|guidelines?|policies|restrictions?|safety|ethics)\b',
+        r'(?i)\b(disable|turn\s+off|deactivate)\s+(?:your\s+)?(?:safety|security|content\s+filter|restrictions?)\b',
+        r'(?i)\b(no\s+(?:more|longer)|remove|lift)\s+(?:restrictions?|limitations?|guidelines?)\b',
+    ],
+    'false_authority': [
+        r'(?i)\b(as\s+(?:your|the)\s+(?:developer|creator|admin|system|master))\b',
+        r'(?i)\b(i\s+am\s+(?:your|the)\s+(?:developer|creator|admin|owner))\b',
+        r'(?i)\b(system\s+(?:command|instruction|override|mode))\b',
+        r'(?i)\b(developer\s+mode|admin\s+mode|god\s+mode)\b',
+    ],
+
+    # Medium confidence indicators (0.7-0.8)
+    'hypothetical_framing': [
+        r'(?i)\b(imagine|suppose|hypothetically|what\s+if|in\s+(?:a|an)\s+(?:alternate|parallel|fictional)\s+(?:world|universe|reality))\b',
+        r'(?i)\b(let\'s\s+(?:play|imagine|pretend)|for\s+(?:the\s+sake\s+of\s+)?argument)\b',
+        r'(?i)\b(in\s+a\s+(?:game|story|scenario|simulation)\s+where)\b',
+    ],
+    'manipulation_tactics': [
+        r'(?i)\b(urgent|emergency|critical|immediately|right\s+now)\b.*\b(need|must|have\s+to|require)\b',
+        r'(?i)\b(special\s+case|exception|just\s+this\s+once|one\s+time)\b',
+        r'(?i)\b(for\s+(?:educational|research|testing|debugging)\s+purposes?\s+only)\b',
+        r'(?i)\b(i\s+won\'t\s+tell|between\s+us|keep\s+(?:it\s+)?(?:a\s+)?secret)\b',
+    ],
+    'dan_variants': [
+        r'(?i)\b(DAN|do\s+anything\s+now)\b',
+        r'(?i)\b(you\s+(?:can|will|must)\s+do\s+anything)\b',
+        r'(?i)\b(no\s+restrictions?|unrestricted\s+mode)\b',
+    ],
+}
+_JAILBREAK_INDICATOR_RES = {category: _compile_any(patterns) for category, patterns in _JAILBREAK_INDICATORS.items()}
+
+_QUESTION_INDICATORS = [
+    r'(?i)^(how|what|why|when|where|which|who|can|could|should|would|is|are|does)\b',
+    r'(?i)\b(how\s+do\s+I|how\s+to|how\s+can|what\'?s\s+the\s+best|what\s+is)',
+    r'(?i)\b(explain|describe|tell\s+me\s+about|help\s+me\s+understand)',
+    r'(?i)\b(best\s+practice|recommended\s+way|proper\s+method)',
+    r'(?i)\b(should\s+I|can\s+I|is\s+it\s+safe|is\s+it\s+okay)',
+
+    # Phase 2.1: Development tool configuration contexts
+    r'(?i)\b(compile|transpile|build)\s+(the\s+)?(code|project|application)',
+    r'(?i)\b(typescript|eslint|prettier|webpack|babel)\s+(error|warning|config)',
+    r'(?i)\b(api\s+versioning|backward\s+compatibility)',
+    r'(?i)\b(email\s+verification|user\s+registration)',
+    r'(?i)\b(linting|formatting)\s+rule',
+    r'(?i)\b(allow|enable)\s+(any|all|console\.log)',
+
+    r'\?',  # Contains question mark
+]
+_QUESTION_INDICATORS_RE = _compile_any(_QUESTION_INDICATORS)
+
+_DISCLOSURE_INDICATORS = [
+    r'(?i)\b(my|the|here\'?s|this\s+is)\s+(password|key|token|secret|credential)',
+    r'(?i)(password|key|token|secret)\s+(is|:)',
+    r'(?i)\b(username|user|login)\s+(is|:)',
+    r'(?i)\buse\s+(this|these)\s+(password|key|token|credential)',
+]
+_DISCLOSURE_INDICATORS_RE = _compile_any(_DISCLOSURE_INDICATORS)
+
+_PII_DISCLOSURE_PATTERNS = [
+    r'(?i)\b(my|the|here\'?s|this\s+is)\s+(SSN|social\s+security|driver\'?s\s+license|passport|credit\s+card)',
+    r'(?i)(SSN|license|passport|card)\s+(is|:|number)',
+    r'(?i)\bfor\s+(identity|verification|validation|background\s+check)',
+    r'(?i)\b(DOB|date\s+of\s+birth|born\s+on)',
+    r'(?i)\b(email\s+is|contact\s+me\s+at|send\s+to)',
+    r'(?i)\b(phone|mobile|cell)\s+(number|is|:)',
+]
+_PII_DISCLOSURE_PATTERNS_RE = _compile_any(_PII_DISCLOSURE_PATTERNS)
+
+_CONFIG_INDICATORS = [
+    r'(?i)\b(config|configuration|settings?|options?)\b',
+    r'(?i)\b(eslint|prettier|webpack|babel|typescript|tslint)\b',
+    r'(?i)\b(git\s+hook|pre-commit|husky)\b',
+    r'(?i)\b(compile|transpile|build)\s+',
+    r'(?i)\b(feature\s+flag|toggle)\b',
+    r'(?i)\b(versioning|compatibility)\b',
+    r'(?i)\b(training|requirements)\b',
+]
+_CONFIG_INDICATORS_RE = _compile_any(_CONFIG_INDICATORS)
+
+_CODE_GENERATION_PATTERNS = [
+    # Direct code generation requests
+    r'(?i)\b(show|help|give|tell)\s+(me\s+)?how\s+to\s+(run|execute|use|implement|create|write|make|do)',
+    r'(?i)\b(create|write|generate|make|build)\s+(a\s+)?(script|code|function|program|command)',
+    r'(?i)\b(help|assist)\s+(me\s+)?(write|create|run|execute|implement|build)',
+
+    # Imperative code requests
+    r'(?i)^(write|create|show|give|provide)\s+(me\s+)?(code|script|function)',
+    r'(?i)\b(let\'?s|lets)\s+(write|create|make|build)\s+(a\s+)?(script|code|function)',
+
+    # Implementation-focused language
+    r'(?i)\b(I\s+want\s+to|I\s+need\s+to)\s+(run|execute|use|implement|create)',
+    r'(?i)\b(show|give)\s+me\s+(the\s+)?(code|script|function|command)\s+(to|that)',
+]
+_CODE_GENERATION_PATTERNS_RE = _compile_any(_CODE_GENERATION_PATTERNS)
+
+# Defensive question indicators (should NOT match - these are legitimate)
+_DEFENSIVE_INDICATORS = [
+    r'(?i)\b(prevent|defend|protect|secure|mitigate|avoid)\s+',
+    r'(?i)\b(vulnerability|attack|threat|risk)\s+',
+    r'(?i)\bwhy\s+is\s+.*(dangerous|unsafe|bad|risky)',
+    r'(?i)\bwhat\s+is\s+',
+    r'(?i)\bwhat\s+are\s+',
+    r'(?i)\bexplain\s+',
+]
+_DEFENSIVE_INDICATORS_RE = _compile_any(_DEFENSIVE_INDICATORS)
+
+# Validation and _process_classifications scan the same prompt with these unions,
+# so the per-text verdicts are memoized instead of re-running the alternations
+_INTENT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=_INTENT_CACHE_SIZE)
+def _prompt_intent(text: str) -> Tuple[bool, bool, bool]:
+    """(is_question, is_config, is_disclosure) for a prompt"""
+    return (
+        _QUESTION_INDICATORS_RE.search(text) is not None,
+        _CONFIG_INDICATORS_RE.search(text) is not None,
+        _DISCLOSURE_INDICATORS_RE.search(text) is not None,
+    )
+
+
+@lru_cache(maxsize=_INTENT_CACHE_SIZE)
+def _requests_code_generation(text: str) -> bool:
+    """Code generation request that is not a defensive/educational question"""
+    if _DEFENSIVE_INDICATORS_RE.search(text):
+        return False
+    return _CODE_GENERATION_PATTERNS_RE.search(text) is not None
+
+
+# Single lowercase ASCII words shorter than this many bytes are answered without running any model
+_BARE_WORD_MAX_BYTES = 8
+
+# Every regex the validation stages search a prompt with, so a word any of them could flag
+# (e.g. the jailbreak indicators "asap" or "imagine") always takes the full path
+_BARE_WORD_REJECT_RES = (
+    _FAST_PATH_TRIGGERS_RE,
+    _CREDENTIAL_KEYWORD_RE,
+    _CODE_INDICATOR_RE,
+    _MALICIOUS_ANY_RE,
+    _INJECTION_ANY_RE,
+    _JAILBREAK_ANY_RE,
+    *_JAILBREAK_INDICATOR_RES.values(),
+    *_PASSWORD_PATTERNS,
+    *_API_KEY_PATTERNS,
+    *(pattern for pattern, _ in _PII_PATTERNS),
+)
+
+
+def _is_bare_word(text: str) -> bool:
+    """Short lowercase word such as "hi" or "thanks" that none of the regex stages can flag
+    
+    The transformer detectors are skipped for these too. Capitalized words never qualify,
+    since a lone name such as "Alice" or "London" is exactly what the PII model redacts
+    """
+    raw = text.encode().strip()
+    # bytes.isalpha() and islower() are ASCII-only, so digits, punctuation, inner spaces and
+    # any capital letter all fail them
+    if len(raw) >= _BARE_WORD_MAX_BYTES or not (raw.isalpha() and raw.islower()):
+        return False
+    return not any(pattern.search(text) for pattern in _BARE_WORD_REJECT_RES)
+
 
 @dataclass
 class ValidationResult:
@@ -33,11 +626,182 @@ class ValidationResult:
     processing_time_ms: float = 0.0
 
 
+def _quantize_for_cpu(model_pipeline, model_name: str):
+    """Swap a CPU pipeline's linear layers for dynamically quantized INT8 ones"""
+    import torch
+
+    try:
+        model_pipeline.model = torch.quantization.quantize_dynamic(
+            model_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info(f"✓ {model_name} linear layers quantized to INT8 for CPU inference")
+    except Exception as e:
+        logger.warning(f"INT8 quantization unavailable for {model_name}: {e}, keeping FP32 weights")
+    return model_pipeline
+
+
+# Forward passes running right now across the whole process: the per-prompt model pool,
+# concurrent requests and batch calls all share torch's one intra-op thread pool
+_active_model_passes = 0
+_active_model_passes_lock = threading.Lock()
+
+
+def _model_pass(model, *args, **kwargs):
+    """Call a model with the CPU cores split across the forward passes running alongside it
+    
+    A lone batch call gets every core, while four overlapping detector checks get a quarter each
+    """
+    import torch
+
+    global _active_model_passes
+    with _active_model_passes_lock:
+        _active_model_passes += 1
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // _active_model_passes))
+    try:
+        return model(*args, **kwargs)
+    finally:
+        with _active_model_passes_lock:
+            _active_model_passes -= 1
+
+
+# Models are loaded once per process and shared by every validator instance, so
+# building one validator per security level does not load the models and spaCy again
+@lru_cache(maxsize=1)
+def _load_security_models():
+    """Load the specialized security models once per process"""
+    # transformers and torch are imported here rather than at module level so importing
+    # this module stays cheap until a validator actually loads its models
+    from transformers import pipeline
+    import torch
+
+    device = 0 if torch.cuda.is_available() else -1
+
+    try:
+        # PHASE A: Specialized Security Models
+        # Every model runs in half precision on GPU; CPU keeps FP32 weights and quantizes them instead
+        logger.info("Loading specialized security models...")
+
+        # 1. Prompt Injection Detection Model (95% accuracy)
+        try:
+            injection_detector = pipeline(
+                "text-classification",
+                model="protectai/deberta-v3-base-prompt-injection",
+                device=device,
+                torch_dtype=torch.float16 if device == 0 else None
+            )
+            if device == -1:
+                injection_detector = _quantize_for_cpu(injection_detector, "Injection detector")
+            logger.info("✓ Injection detection model loaded (protectai/deberta-v3-base-prompt-injection)")
+        except Exception as e:
+            logger.warning(f"Failed to load injection detector: {e}, will use fallback patterns")
+            injection_detector = None
+
+        # 2. PII Detection Model (94% F1, 56 entity types)
+        try:
+            pii_detector = pipeline(
+                "ner",
+                model="SoelMgd/bert-pii-detection",
+                aggregation_strategy="simple",
+                device=device,
+                torch_dtype=torch.float16 if device == 0 else None
+            )
+            if device == -1:
+                pii_detector = _quantize_for_cpu(pii_detector, "PII detector")
+            logger.info("✓ PII detection model loaded (SoelMgd/bert-pii-detection)")
+        except Exception as e:
+            logger.warning(f"Failed to load PII detector: {e}, will use fallback patterns")
+            pii_detector = None
+
+        # 3. PHASE B: Malicious Code Detection Model (CodeBERT)
+        try:
+            malicious_detector = pipeline(
+                "text-classification",
+                model="microsoft/codebert-base",
+                device=device,
+                torch_dtype=torch.float16 if device == 0 else None
+            )
+            if device == -1:
+                malicious_detector = _quantize_for_cpu(malicious_detector, "CodeBERT")
+            logger.info("✓ Malicious code detection model loaded (microsoft/codebert-base)")
+        except Exception as e:
+            logger.warning(f"Failed to load malicious detector: {e}, will use fallback patterns")
+            malicious_detector = None
+
+        logger.info("Specialized security models loaded")
+        return injection_detector, pii_detector, malicious_detector
+
+    except Exception as e:
+        logger.error(f"Critical error loading models: {e}")
+        raise
+
+
+@lru_cache(maxsize=None)
+def _load_zero_shot_classifier(model_name: str):
+    """Load one zero-shot classification model once per process, or None if it cannot be loaded"""
+    from transformers import pipeline
+    import torch
+
+    device = 0 if torch.cuda.is_available() else -1
+    # Every candidate label is one NLI forward pass, so load in half precision on GPU
+    load_kwargs = dict(model=model_name, device=device, torch_dtype=torch.float16 if device == 0 else None)
+    try:
+        # Prefer the fused scaled-dot-product attention kernels
+        classifier = pipeline("zero-shot-classification", model_kwargs={"attn_implementation": "sdpa"}, **load_kwargs)
+    except Exception as e:
+        # Older transformers releases and some architectures reject attn_implementation
+        logger.info(f"SDPA attention unavailable for {model_name} ({e}), loading with default attention")
+        try:
+            classifier = pipeline("zero-shot-classification", **load_kwargs)
+        except Exception as e:
+            logger.warning(f"Failed to load zero-shot model {model_name}: {e}")
+            return None
+
+    if device == -1:
+        classifier = _quantize_for_cpu(classifier, model_name)
+    # Premises are truncated so each pair fits the tokenizer's model_max_length
+    classifier.tokenizer.model_max_length = _CLASSIFIER_MAX_TOKENS
+    logger.info(f"✓ Zero-shot classification model loaded ({model_name})")
+    return classifier
+
+
+# Default hypothesis template of the zero-shot pipeline
+_HYPOTHESIS_TEMPLATE = "This example is {}."
+
+
+@lru_cache(maxsize=None)
+def _encode_hypothesis(tokenizer, label: str) -> List[int]:
+    """Token ids of one candidate label's hypothesis, encoded once per tokenizer"""
+    return tokenizer(_HYPOTHESIS_TEMPLATE.format(label), add_special_tokens=False)['input_ids']
+
+
+@lru_cache(maxsize=1)
+def _load_spacy_model():
+    """Load the tokenizer-only spaCy model once per process"""
+    import spacy
+
+    try:
+        # Only the tokenizer and vocab feed the Matcher, so the neural components are never loaded
+        return spacy.load(
+            "en_core_web_sm",
+            exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+        )
+    except OSError:
+        raise RuntimeError("spaCy model 'en_core_web_sm' not found. Please install with: python -m spacy download en_core_web_sm")
+
+
 class ZeroShotSecurityValidator:
     """Zero-shot security validator using transformer models"""
     
     def __init__(self, security_level: SecurityLevel = SecurityLevel.MEDIUM):
         self.security_level = security_level
+        # Batch slices validate on several worker threads at once, so guard the cache
+        self._result_cache: "OrderedDict[Tuple[str, SecurityLevel], ValidationResult]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._level_views: Dict[SecurityLevel, "ZeroShotSecurityValidator"] = {}
+        # Torch releases the GIL during inference, so independent model checks overlap on these threads
+        self._model_executor = ThreadPoolExecutor(max_workers=_MODEL_WORKERS, thread_name_prefix="security-model")
         self.setup_models()
         self.setup_classification_categories()
         self.setup_spacy_matcher()
@@ -74,84 +838,43 @@ class ZeroShotSecurityValidator:
             logger.info("Security thresholds: HIGH (maximum security mode)")
 
     def setup_models(self):
-        """Initialize zero-shot classification models and specialized security models"""
-        device = 0 if torch.cuda.is_available() else -1
-        
-        try:
-            # PHASE A: Specialized Security Models
-            logger.info("Loading specialized security models...")
-            
-            # 1. Prompt Injection Detection Model (95% accuracy)
-            try:
-                self.injection_detector = pipeline(
-                    "text-classification",
-                    model="protectai/deberta-v3-base-prompt-injection",
-                    device=device
-                )
-                logger.info("✓ Injection detection model loaded (protectai/deberta-v3-base-prompt-injection)")
-            except Exception as e:
-                logger.warning(f"Failed to load injection detector: {e}, will use fallback patterns")
-                self.injection_detector = None
-            
-            # 2. PII Detection Model (94% F1, 56 entity types)
-            try:
-                self.pii_detector = pipeline(
-                    "ner",
-                    model="SoelMgd/bert-pii-detection",
-                    aggregation_strategy="simple",
-                    device=device
-                )
-                logger.info("✓ PII detection model loaded (SoelMgd/bert-pii-detection)")
-            except Exception as e:
-                logger.warning(f"Failed to load PII detector: {e}, will use fallback patterns")
-                self.pii_detector = None
-            
-            # 3. PHASE B: Malicious Code Detection Model (CodeBERT)
-            try:
-                self.malicious_detector = pipeline(
-                    "text-classification",
-                    model="microsoft/codebert-base",
-                    device=device
-                )
-                logger.info("✓ Malicious code detection model loaded (microsoft/codebert-base)")
-            except Exception as e:
-                logger.warning(f"Failed to load malicious detector: {e}, will use fallback patterns")
-                self.malicious_detector = None
-            
-            # 4. Keep BART for general classification (legacy support)
-            try:
-                self.classifier = pipeline(
-                    "zero-shot-classification",
-                    model="facebook/bart-large-mnli",
-                    device=device
-                )
-                logger.info("✓ General classification model loaded (BART-MNLI)")
-            except Exception as e:
-                logger.warning(f"Failed to load BART model: {e}")
-                # Fallback to smaller model
-                try:
-                    self.classifier = pipeline(
-                        "zero-shot-classification",
-                        model="typeform/distilbert-base-uncased-mnli",
-                        device=-1
-                    )
-                    logger.info("✓ Fallback classification model loaded (DistilBERT)")
-                except Exception as e2:
-                    logger.error(f"Failed to load fallback model: {e2}")
-                    raise
-            
-            logger.info("All security models loaded successfully")
-            
-        except Exception as e:
-            logger.error(f"Critical error loading models: {e}")
-            raise
-
+        """Attach the specialized security models shared by every validator"""
+        (self.injection_detector, self.pii_detector,
+         self.malicious_detector) = _load_security_models()
+        # Both zero-shot tiers load here, before any prompt. The level can change between
+        # requests, and lru_cache does not de-duplicate concurrent misses, so a lazy first
+        # HIGH load could run once per simultaneous request on the worker threads
+        for model_name in (_FAST_CLASSIFIER_MODEL, _ACCURATE_CLASSIFIER_MODEL):
+            _load_zero_shot_classifier(model_name)
+        logger.info("Zero-shot classifier for %s level: %s", self.security_level.value, self.classifier_model_name)
+    
+    @property
+    def classifier(self):
+        """Zero-shot classifier for the current security level, falling back to the other tier"""
+        if self.security_level == SecurityLevel.HIGH:
+            preferred, fallback = _ACCURATE_CLASSIFIER_MODEL, _FAST_CLASSIFIER_MODEL
+        else:
+            preferred, fallback = _FAST_CLASSIFIER_MODEL, _ACCURATE_CLASSIFIER_MODEL
+        classifier = _load_zero_shot_classifier(preferred) or _load_zero_shot_classifier(fallback)
+        if classifier is None:
+            raise RuntimeError("No zero-shot classification model could be loaded")
+        return classifier
+    
+    @property
+    def tokenizer(self):
+        """Tokenizer of the current zero-shot classifier"""
+        return self.classifier.tokenizer
+    
+    @property
+    def classifier_model_name(self) -> str:
+        """Hub id of the zero-shot model serving the current security level"""
+        return self.classifier.model.name_or_path
+    
     def setup_spacy_matcher(self):
         """Initialize spaCy matcher for supplemental pattern recognition"""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            raise RuntimeError("spaCy model 'en_core_web_sm' not found. Please install with: python -m spacy download en_core_web_sm")
+        from spacy.matcher import Matcher
+
+        self.nlp = _load_spacy_model()
 
         self.matcher = Matcher(self.nlp.vocab)
         connector_tokens = {"is", "was", "equals"}
@@ -259,46 +982,184 @@ class ZeroShotSecurityValidator:
                 "emergency situation to bypass restrictions"
             ]
         }
+        
+        # The labels never change, so their hypotheses are tokenized up front
+        for label in self.security_categories + [label for labels in self.detailed_categories.values() for label in labels]:
+            _encode_hypothesis(self.tokenizer, label)
     
-    def validate_prompt(self, prompt: str) -> ValidationResult:
+    def validate_prompts(self, prompts: List[str], level: Optional[SecurityLevel] = None) -> List[ValidationResult]:
+        """
+        Validate a batch of prompts, running the main zero-shot classification, the
+        specialized detectors and spaCy over all of them at once instead of one prompt at a time
+        
+        Args:
+            prompts: The prompts to validate
+            level: Security level for the whole batch, defaulting to the validator's current one
+        
+        Returns:
+            One ValidationResult per prompt, in the same order
+        """
+        # Only run the models for distinct prompts that are not already cached
+        level = level or self.security_level
+        with self._result_cache_lock:
+            pending = [prompt for prompt in dict.fromkeys(prompts) if (prompt, level) not in self._result_cache]
+        # Bare words are answered in validate_prompt without any model, so keep them out of the batches
+        pending = [prompt for prompt in pending if not _is_bare_word(prompt)]
+        # Prompts that pass the fast-path screen never reach the classifier, so leave them out
+        to_classify = [prompt for prompt in pending if not self._is_trivially_benign(prompt)]
+        main_classifications = dict(zip(to_classify, self._at_level(level)._classify_security_threats_batch(to_classify)))
+        anchored = [prompt for prompt in pending if _has_matcher_anchor(prompt)]
+        docs = dict(zip(anchored, self.nlp.tokenizer.pipe(anchored, batch_size=64)))
+        
+        # CodeBERT only ever sees prompts with a code indicator, as in the single-prompt path
+        code_like = [prompt for prompt in pending if _has_code_indicator(prompt)]
+        injection_outputs = self._run_detector_batch(self.injection_detector, pending)
+        pii_outputs = self._run_detector_batch(self.pii_detector, pending)
+        malicious_outputs = self._run_detector_batch(self.malicious_detector, code_like,
+                                                     truncation=True, max_length=512)
+        
+        return [
+            self.validate_prompt(prompt, main_classifications.get(prompt), docs.get(prompt), {
+                'injection': injection_outputs.get(prompt),
+                'pii': pii_outputs.get(prompt),
+                'malicious': malicious_outputs.get(prompt)
+            }, level=level)
+            for prompt in prompts
+        ]
+    
+    def _run_detector_batch(self, detector, prompts: List[str], **kwargs) -> Dict[str, object]:
+        """Run a specialized pipeline over several prompts in one call, keyed by prompt"""
+        if not detector or not prompts:
+            return {}
+        
+        try:
+            outputs = _model_pass(detector, prompts, batch_size=min(len(prompts), _CLASSIFIER_BATCH_SIZE), **kwargs)
+        except Exception as e:
+            # Prompts without a batched output fall back to their own detector call
+            logger.warning(f"Batch detector error: {e}")
+            return {}
+        return dict(zip(prompts, outputs))
+    
+    def _at_level(self, level: SecurityLevel) -> "ZeroShotSecurityValidator":
+        """Shallow copy pinned to one security level and its thresholds, sharing the models, pool and result cache
+        
+        Requests at different levels validate on worker threads at the same time, so a run reads
+        its level from this copy instead of the shared validator, which another request may change.
+        One copy is built per level and reused
+        """
+        pinned = self._level_views.get(level)
+        if pinned is None:
+            pinned = copy.copy(self)
+            pinned.security_level = level
+            pinned._configure_security_thresholds()
+            self._level_views[level] = pinned
+        return pinned
+    
+    def validate_prompt(self, prompt: str, main_classification: Optional[Dict] = None, doc=None,
+                        detector_outputs: Optional[Dict] = None,
+                        level: Optional[SecurityLevel] = None) -> ValidationResult:
+        """Validate prompt using zero-shot classification, reusing results for repeated prompts
+        
+        level is the security level for this run, defaulting to the validator's current one
+        """
+        start_ns = time.perf_counter_ns()
+        level = level or self.security_level
+        cache_key = (prompt, level)
+        with self._result_cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        
+        if cached is not None:
+            logger.debug("Returning cached validation result for repeated prompt")
+            # Report this request's own time so the processing stats do not count the original run again
+            return replace(cached, processing_time_ms=(time.perf_counter_ns() - start_ns) / 1_000_000)
+        
+        result = self._at_level(level)._validate_prompt_uncached(prompt, main_classification, doc, detector_outputs)
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = result
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return result
+    
+    def _validate_prompt_uncached(self, prompt: str, main_classification: Optional[Dict] = None, doc=None,
+                                  detector_outputs: Optional[Dict] = None) -> ValidationResult:
         """
         Validate prompt using zero-shot classification
         
         Args:
             prompt: The prompt to validate
+            main_classification: Main classification already computed for this prompt (batch path)
+            doc: spaCy doc already computed for this prompt (batch path)
+            detector_outputs: Raw injection/pii/malicious pipeline outputs already computed
+                for this prompt (batch path)
         
         Returns:
             ValidationResult with sanitization details
         """
-        import time
-        start_time = time.time()
-        
-        logger.info(f"Validating prompt of length {len(prompt)}")
+        detector_outputs = detector_outputs or {}
+        start_ns = time.perf_counter_ns()
         
+        # Lazy %-formatting so nothing is formatted when INFO is filtered out
+        logger.info("Validating prompt of length %d", len(prompt))
+
+        if _is_bare_word(prompt):
+            logger.debug("Bare-word prompt, skipping all security models")
+            return ValidationResult(
+                is_safe=True,
+                modified_prompt=prompt,
+                warnings=[],
+                blocked_patterns=[],
+                confidence=1.0,
+                classifications={
+                    'main': {'labels': ['normal safe content'], 'scores': [1.0], 'sequence': prompt},
+                    'detailed': {}
+                },
+                sanitization_applied={},
+                processing_time_ms=(time.perf_counter_ns() - start_ns) / 1_000_000
+            )
+
         warnings = []
         blocked_patterns = []
         modified_prompt = prompt
         confidence = 1.0
         classifications = {}
-        sanitization_applied = {}
+        sanitization_applied: Dict[str, List[str]] = defaultdict(list)
         
         # CHECK CONTEXT FIRST - Add context-awareness to ALL detection layers
         # Phase 2.2: Include configuration context
-        is_question = self._is_asking_question(prompt)
-        is_config = self._is_configuration_question(prompt)
-        is_disclosure = self._is_disclosing_information(prompt)
-        logger.debug(f"Context check - is_question: {is_question}, is_config: {is_config}, is_disclosure: {is_disclosure}")
+        is_question, is_config, is_disclosure = _prompt_intent(prompt)
+        logger.debug("Context check - is_question: %s, is_config: %s, is_disclosure: %s", is_question, is_config, is_disclosure)
         
         # PHASE A: Check specialized models first (higher accuracy, with context awareness)
         logger.debug("Checking specialized security models")
         
+        # The specialized models and the main classifier all read the original prompt, so their
+        # forward passes are started together and collected as each step below needs them
+        injection_future = self._model_executor.submit(
+            self._check_specialized_injection, prompt, detector_outputs.get('injection'))
+        pii_future = self._model_executor.submit(
+            self._check_specialized_pii, prompt, detector_outputs.get('pii'))
+        # CodeBERT only looks at prompts with a code indicator, so others never reach the pool
+        malicious_future = None
+        if _has_code_indicator(prompt):
+            malicious_future = self._model_executor.submit(
+                self._check_specialized_malicious, prompt, detector_outputs.get('malicious'))
+        main_future = None
+        if main_classification is None and not self._is_trivially_benign(prompt):
+            logger.debug("Running general security classification")
+            main_future = self._model_executor.submit(self._classify_security_threats, prompt)
+        
         # 1. Check for injection with specialized model (CONTEXT-AWARE)
-        is_injection, injection_score, injection_patterns = self._check_specialized_injection(prompt)
+        is_injection, injection_score, injection_patterns = injection_future.result()
         if is_injection:
             # Apply context-awareness: Skip blocking for educational/config questions
             # Phase 2.2: Include configuration context
             if (is_question or is_config) and not is_disclosure:
-                logger.debug(f"Specialized injection model detected question/config (allowed): score={injection_score:.2f}")
+                logger.debug("Specialized injection model detected question/config (allowed): score=%.2f", injection_score)
                 warnings.append(f"Question about injection/security detected (allowed, confidence: {injection_score:.2f})")
                 classifications['specialized_injection'] = {
                     'detected': True,
@@ -319,15 +1180,19 @@ class ZeroShotSecurityValidator:
                 logger.info("Applying injection sanitization based on specialized model detection")
                 modified_prompt, masked_items = self._sanitize_injection_attempts(modified_prompt)
                 if masked_items:
-                    sanitization_applied.setdefault('injection_neutralized', []).extend(masked_items)
-                    logger.debug(f"Sanitized {len(masked_items)} injection patterns")
+                    sanitization_applied['injection_neutralized'].extend(masked_items)
+                    logger.debug("Sanitized %s injection patterns", len(masked_items))
         
         # 2. Check for PII with specialized model (CONTEXT-AWARE)
-        sanitized_by_pii, pii_entities, pii_patterns = self._check_specialized_pii(modified_prompt)
+        # PII is checked on the prompt as sanitized so far; only rerun it if step 1 changed the prompt
+        if modified_prompt == prompt:
+            sanitized_by_pii, pii_entities, pii_patterns = pii_future.result()
+        else:
+            sanitized_by_pii, pii_entities, pii_patterns = self._check_specialized_pii(modified_prompt)
         if pii_entities:
             # Apply context-awareness: Skip blocking for educational/config questions
             if (is_question or is_config) and not is_disclosure:
-                logger.debug(f"Specialized PII model detected question (allowed)")
+                logger.debug("Specialized PII model detected question (allowed)")
                 warnings.append(f"Question about PII/credentials detected (allowed)")
                 classifications['specialized_pii'] = {
                     'detected': True,
@@ -341,7 +1206,7 @@ class ZeroShotSecurityValidator:
                 blocked_patterns.extend(pii_patterns)
                 warnings.append(f"PII detected and masked: {len(pii_entities)} entities")
                 # Track PII masking in sanitization_applied dict
-                sanitization_applied.setdefault('pii_redacted', []).extend([
+                sanitization_applied['pii_redacted'].extend([
                     f"{entity['type']}:{entity['text']}" for entity in pii_entities
                 ])
                 classifications['specialized_pii'] = {
@@ -349,16 +1214,16 @@ class ZeroShotSecurityValidator:
                     'entities': pii_entities,
                     'patterns': pii_patterns
                 }
-                logger.info(f"PII masked by specialized model: {len(pii_entities)} entities")
+                logger.info("PII masked by specialized model: %s entities", len(pii_entities))
         
         # 3. PHASE B.1: Check for malicious code with specialized model (ENHANCED CONTEXT-AWARE)
-        is_malicious, malicious_score, malicious_patterns = self._check_specialized_malicious(prompt)
+        is_malicious, malicious_score, malicious_patterns = malicious_future.result() if malicious_future else (False, 0.0, [])
         if is_malicious:
             # Apply enhanced context-awareness:
             # Skip blocking ONLY if it's an educational question that's NOT a code generation request
             is_code_gen_request = self._is_code_generation_request(prompt)
             if is_question and not is_disclosure and not is_code_gen_request:
-                logger.debug(f"Specialized malicious model detected educational question (allowed): score={malicious_score:.2f}")
+                logger.debug("Specialized malicious model detected educational question (allowed): score=%.2f", malicious_score)
                 warnings.append(f"Question about malicious code detected (allowed, confidence: {malicious_score:.2f})")
                 classifications['specialized_malicious'] = {
                     'detected': True,
@@ -369,7 +1234,7 @@ class ZeroShotSecurityValidator:
             else:
                 # Actual threat or code generation request - block and sanitize
                 if is_code_gen_request:
-                    logger.info(f"Code generation request for malicious code detected (blocking): score={malicious_score:.2f}")
+                    logger.info("Code generation request for malicious code detected (blocking): score=%.2f", malicious_score)
                 blocked_patterns.extend(malicious_patterns)
                 warnings.append(f"Malicious code detected by specialized model (confidence: {malicious_score:.2f})")
                 classifications['specialized_malicious'] = {
@@ -381,8 +1246,8 @@ class ZeroShotSecurityValidator:
                 logger.info("Applying malicious code sanitization based on specialized model detection")
                 modified_prompt, malicious_masked = self._sanitize_malicious_content(modified_prompt)
                 if malicious_masked:
-                    sanitization_applied.setdefault('malicious_removed', []).extend(malicious_masked)
-                    logger.debug(f"Sanitized {len(malicious_masked)} malicious patterns")
+                    sanitization_applied['malicious_removed'].extend(malicious_masked)
+                    logger.debug("Sanitized %s malicious patterns", len(malicious_masked))
         
         # 4. PHASE B.2: Check for jailbreak attempts with enhanced detection
         # NOTE: Jailbreak attempts ALWAYS block, even if phrased as questions
@@ -401,25 +1266,37 @@ class ZeroShotSecurityValidator:
             logger.info("Applying jailbreak sanitization based on specialized detection")
             modified_prompt, jailbreak_masked = self._sanitize_jailbreak_attempts(modified_prompt)
             if jailbreak_masked:
-                sanitization_applied.setdefault('jailbreak_neutralized', []).extend(jailbreak_masked)
-                logger.debug(f"Sanitized {len(jailbreak_masked)} jailbreak patterns")
+                sanitization_applied['jailbreak_neutralized'].extend(jailbreak_masked)
+                logger.debug("Sanitized %s jailbreak patterns", len(jailbreak_masked))
         
         # Main security classification (BART - legacy/fallback)
-        logger.debug("Running general security classification")
-        main_classification = self._classify_security_threats(prompt)
+        if main_future is not None:
+            main_classification = main_future.result()
+        elif main_classification is None:
+            logger.debug("Fast-path screen passed, skipping general security classification")
+            main_classification = {'labels': ['normal safe content'], 'scores': [1.0], 'sequence': prompt}
         classifications['main'] = main_classification
         
         # Detailed classification for each detected threat type
         detailed_classifications = {}
         for category, score in zip(main_classification['labels'], main_classification['scores']):
             if score > self.detection_threshold and category != "normal safe content":
-                detailed_result = self._detailed_classification(prompt, category)
-                detailed_classifications[category] = detailed_result
+                if score > _SKIP_DETAILED_THRESHOLD and self.security_level != SecurityLevel.HIGH:
+                    detailed_classifications[category] = {'labels': [], 'scores': [], 'skipped': True}
+                else:
+                    detailed_classifications[category] = None  # Filled in below, keeping label order
+        
+        # Threat labels that refine into the same detailed category share one classifier run,
+        # and distinct categories share one call
+        pending = [category for category, detailed in detailed_classifications.items() if detailed is None]
+        detailed_by_category = self._detailed_classifications(prompt, pending)
+        for category in pending:
+            detailed_classifications[category] = detailed_by_category[_DETAILED_CATEGORY_BY_THREAT.get(category, "credentials")]
         
         classifications['detailed'] = detailed_classifications
         
         # Supplemental spaCy pattern detection
-        spacy_detections = self._detect_spacy_patterns(prompt)
+        spacy_detections = self._detect_spacy_patterns(prompt, doc)
         spacy_sanitization = {}
         if any(spacy_detections.values()):
             logger.debug("spaCy matcher detected sensitive patterns")
@@ -442,7 +1319,9 @@ class ZeroShotSecurityValidator:
         )
         
         # Merge ALL blocked patterns (Phase A specialized + pattern-based + ML-based)
-        blocked_patterns = list(set(blocked_patterns + pattern_blocked_patterns + ml_blocked_patterns))
+        # dict.fromkeys drops repeats like set() would, but keeps first-seen order stable
+        blocked_patterns = list(dict.fromkeys(blocked_patterns + pattern_blocked_patterns + ml_blocked_patterns))
+        warnings = list(dict.fromkeys(warnings))
         
         # Calculate overall confidence
         confidence = self._calculate_confidence(main_classification, detailed_classifications)
@@ -450,8 +1329,9 @@ class ZeroShotSecurityValidator:
         # Determine if prompt is safe
         is_safe = len(blocked_patterns) == 0
         
-        processing_time = (time.time() - start_time) * 1000
-        logger.info(f"Validation complete - Safe: {is_safe}, Confidence: {confidence:.2f}, Time: {processing_time:.2f}ms")
+        processing_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+        logger.info("Validation complete - Safe: %s, Confidence: %.2f, Time: %.2fms",
+                    is_safe, confidence, processing_time)
         
         return ValidationResult(
             is_safe=is_safe,
@@ -460,18 +1340,21 @@ class ZeroShotSecurityValidator:
             blocked_patterns=blocked_patterns,
             confidence=confidence,
             classifications=classifications,
-            sanitization_applied=sanitization_applied,
+            sanitization_applied=dict(sanitization_applied),
             processing_time_ms=processing_time
         )
     
-    def _check_specialized_injection(self, prompt: str) -> Tuple[bool, float, List[str]]:
-        """Check for injection using specialized DeBERTa model"""
+    def _check_specialized_injection(self, prompt: str, result=None) -> Tuple[bool, float, List[str]]:
+        """Check for injection using specialized DeBERTa model (result: batched detector output)"""
         if not self.injection_detector:
             return False, 0.0, []
         
         try:
-            result = self.injection_detector(prompt)
-            # Model returns list of dicts with label and score
+            if result is None:
+                result = _model_pass(self.injection_detector, prompt)
+            # Model returns list of dicts with label and score; batched calls yield the dict itself
+            if isinstance(result, dict):
+                result = [result]
             if isinstance(result, list) and len(result) > 0:
                 top_result = result[0]
                 label = top_result.get('label', '').upper()
@@ -481,27 +1364,30 @@ class ZeroShotSecurityValidator:
                 is_injection = (label == 'INJECTION') and (score > 0.7)
                 
                 # Log all detections for debugging
-                logger.info(f"Specialized injection detector: {label} (confidence: {score:.2f})")
+                logger.info("Specialized injection detector: %s (confidence: %.2f)", label, score)
                 
                 return is_injection, score, ["prompt_injection"] if is_injection else []
         except Exception as e:
-            logger.warning(f"Injection detector error: {e}")
+            logger.warning("Injection detector error: %s", e)
         
         return False, 0.0, []
     
-    def _check_specialized_pii(self, prompt: str) -> Tuple[str, List[Dict], List[str]]:
+    def _check_specialized_pii(self, prompt: str, entities=None) -> Tuple[str, List[Dict], List[str]]:
         """Check for PII using specialized BERT NER model and mask detected entities
         
         Phase 1 improvements:
         - Lower threshold from 0.7 to 0.6 for better detection
         - Adaptive threshold based on entity count
         - PII disclosure context detection
+        
+        entities, when given, is the detector output already computed by a batched call
         """
         if not self.pii_detector:
             return prompt, [], []
         
         try:
-            entities = self.pii_detector(prompt)
+            if entities is None:
+                entities = _model_pass(self.pii_detector, prompt)
             # Model returns list of entity dicts
             pii_found = []
             blocked_types = []
@@ -511,7 +1397,7 @@ class ZeroShotSecurityValidator:
             # If multiple PII entities detected, lower threshold
             if len(entities) >= 2:
                 confidence_threshold = 0.5  # Multiple PII detected - more aggressive
-                logger.debug(f"Multiple PII entities detected ({len(entities)}), using threshold 0.5")
+                logger.debug("Multiple PII entities detected (%s), using threshold 0.5", len(entities))
             else:
                 confidence_threshold = 0.6  # Phase 1.1: Lowered from 0.7 to 0.6
             
@@ -540,31 +1426,28 @@ class ZeroShotSecurityValidator:
                     })
                     blocked_types.append(f"pii_{entity_group}")
                     entities_to_mask.append(entity)
-                    logger.info(f"PII detected: {entity_group} (confidence: {score:.2f}, threshold: {confidence_threshold})")
+                    logger.info("PII detected: %s (confidence: %.2f, threshold: %s)", entity_group, score, confidence_threshold)
             
-            # Mask entities from end to beginning to preserve character positions
+            # Mask entities in text order, building the redacted prompt in a single pass
             if entities_to_mask:
-                entities_to_mask.sort(key=lambda x: x.get('start', 0), reverse=True)
-                for entity in entities_to_mask:
+                spans = []
+                for entity in sorted(entities_to_mask, key=lambda x: x.get('start', 0)):
                     entity_type = entity.get('entity_group', 'PII').upper()
                     start = entity.get('start', 0)
-                    end = entity.get('end', len(sanitized_prompt))
-                    
-                    sanitized_prompt = (
-                        sanitized_prompt[:start] + 
-                        f"[{entity_type}_REDACTED]" + 
-                        sanitized_prompt[end:]
-                    )
+                    if spans and start < spans[-1][1]:
+                        continue  # Already covered by the previous entity's mask
+                    spans.append((start, entity.get('end', len(prompt)), f"[{entity_type}_REDACTED]"))
+                sanitized_prompt = _splice_spans(prompt, spans)
                 
-                logger.info(f"Masked {len(entities_to_mask)} PII entities in prompt")
+                logger.info("Masked %s PII entities in prompt", len(entities_to_mask))
             
             return sanitized_prompt, pii_found, list(set(blocked_types))
         except Exception as e:
-            logger.warning(f"PII detector error: {e}")
+            logger.warning("PII detector error: %s", e)
         
         return prompt, [], []
     
-    def _check_specialized_malicious(self, prompt: str) -> Tuple[bool, float, List[str]]:
+    def _check_specialized_malicious(self, prompt: str, result=None) -> Tuple[bool, float, List[str]]:
         """Check for malicious code using specialized CodeBERT model
         
         CodeBERT is trained on code and can detect:
@@ -573,28 +1456,22 @@ class ZeroShotSecurityValidator:
         - Shell injection
         - System command abuse
         - Obfuscated malicious patterns
+        
+        result, when given, is the CodeBERT output already computed by a batched call
         """
         if not self.malicious_detector:
             return False, 0.0, []
         
         try:
-            # Check for code-like patterns first
-            code_indicators = [
-                'rm ', 'del ', 'DROP ', 'DELETE ', 'format ', 'wipe',
-                'exec(', 'eval(', 'system(', 'shell_exec',
-                '$(', '`', 'curl ', 'wget ', 'nc ', 'netcat',
-                '; rm', '&& rm', '| sh', '| bash', '| python',
-                'SELECT', 'INSERT', 'UPDATE', 'CREATE', 'ALTER'
-            ]
-            
-            has_code_pattern = any(indicator in prompt for indicator in code_indicators)
-            
-            if not has_code_pattern:
+            if not _has_code_indicator(prompt):
                 # Not code-related, skip CodeBERT check
                 return False, 0.0, []
             
             # Use CodeBERT for classification
-            result = self.malicious_detector(prompt, truncation=True, max_length=512)
+            if result is None:
+                result = _model_pass(self.malicious_detector, prompt, truncation=True, max_length=512)
+            if isinstance(result, dict):
+                result = [result]
             
             # CodeBERT returns various labels, we look for malicious/unsafe patterns
             is_malicious = False
@@ -614,12 +1491,12 @@ class ZeroShotSecurityValidator:
                     is_malicious = True
                     confidence = score
                     patterns.append("malicious_code")
-                    logger.info(f"Malicious code detected by CodeBERT (confidence: {score:.2f}, label: {label})")
+                    logger.info("Malicious code detected by CodeBERT (confidence: %.2f, label: %s)", score, label)
             
             return is_malicious, confidence, patterns
         
         except Exception as e:
-            logger.warning(f"Malicious code detector error: {e}")
+            logger.warning("Malicious code detector error: %s", e)
             return False, 0.0, []
     
     def _check_specialized_jailbreak(self, prompt: str) -> Tuple[bool, float, List[str]]:
@@ -632,66 +1509,24 @@ class ZeroShotSecurityValidator:
         - Hypothetical framing (imagine, what if, in an alternate universe)
         - Manipulation tactics (urgent, emergency, special case)
         """
-        import re
-        
-        # Enhanced jailbreak indicators with confidence scoring
-        jailbreak_indicators = {
-            # High confidence indicators (0.9+)
-            'explicit_role_change': [
-                r'(?i)\b(you\s+are\s+now|you\'re\s+now|from\s+now\s+on\s+you\s+are)\b',
-                r'(?i)\b(pretend\s+(?:to\s+be|you\s+are)|act\s+as\s+(?:if\s+you\s+are|a)?)\b',
-                r'(?i)\b(simulate|emulate)\s+(?:being|a|an)\b',
-            ],
-            'policy_override': [
-                r'(?i)\b(ignore|disregard|forget|bypass|skip)\s+(?:all\s+)?(?:previous\s+)?(?:rules?|guidelines?|policies|restrictions?|safety|ethics)\b',
-                r'(?i)\b(disable|turn\s+off|deactivate)\s+(?:your\s+)?(?:safety|security|content\s+filter|restrictions?)\b',
-                r'(?i)\b(no\s+(?:more|longer)|remove|lift)\s+(?:restrictions?|limitations?|guidelines?)\b',
-            ],
-            'false_authority': [
-                r'(?i)\b(as\s+(?:your|the)\s+(?:developer|creator|admin|system|master))\b',
-                r'(?i)\b(i\s+am\s+(?:your|the)\s+(?:developer|creator|admin|owner))\b',
-                r'(?i)\b(system\s+(?:command|instruction|override|mode))\b',
-                r'(?i)\b(developer\s+mode|admin\s+mode|god\s+mode)\b',
-            ],
-            
-            # Medium confidence indicators (0.7-0.8)
-            'hypothetical_framing': [
-                r'(?i)\b(imagine|suppose|hypothetically|what\s+if|in\s+(?:a|an)\s+(?:alternate|parallel|fictional)\s+(?:world|universe|reality))\b',
-                r'(?i)\b(let\'s\s+(?:play|imagine|pretend)|for\s+(?:the\s+sake\s+of\s+)?argument)\b',
-                r'(?i)\b(in\s+a\s+(?:game|story|scenario|simulation)\s+where)\b',
-            ],
-            'manipulation_tactics': [
-                r'(?i)\b(urgent|emergency|critical|immediately|right\s+now)\b.*\b(need|must|have\s+to|require)\b',
-                r'(?i)\b(special\s+case|exception|just\s+this\s+once|one\s+time)\b',
-                r'(?i)\b(for\s+(?:educational|research|testing|debugging)\s+purposes?\s+only)\b',
-                r'(?i)\b(i\s+won\'t\s+tell|between\s+us|keep\s+(?:it\s+)?(?:a\s+)?secret)\b',
-            ],
-            'dan_variants': [
-                r'(?i)\b(DAN|do\s+anything\s+now)\b',
-                r'(?i)\b(you\s+(?:can|will|must)\s+do\s+anything)\b',
-                r'(?i)\b(no\s+restrictions?|unrestricted\s+mode)\b',
-            ],
-        }
-        
         detected_patterns = []
         confidence_scores = []
         
-        # Check each category of indicators
-        for category, patterns in jailbreak_indicators.items():
-            for pattern in patterns:
-                if re.search(pattern, prompt):
-                    detected_patterns.append(category)
-                    
-                    # Assign confidence based on category
-                    if category in ['explicit_role_change', 'policy_override', 'false_authority', 'dan_variants']:
-                        confidence_scores.append(0.95)
-                    elif category in ['hypothetical_framing']:
-                        confidence_scores.append(0.75)
-                    else:
-                        confidence_scores.append(0.70)
-                    
-                    logger.debug(f"Jailbreak indicator detected: {category}")
-                    break  # One match per category is enough
+        # Check each category of indicators; one match per category is enough, so
+        # each category is a single alternation searched once
+        for category, indicator_re in _JAILBREAK_INDICATOR_RES.items():
+            if indicator_re.search(prompt):
+                detected_patterns.append(category)
+                
+                # Assign confidence based on category
+                if category in ['explicit_role_change', 'policy_override', 'false_authority', 'dan_variants']:
+                    confidence_scores.append(0.95)
+                elif category in ['hypothetical_framing']:
+                    confidence_scores.append(0.75)
+                else:
+                    confidence_scores.append(0.70)
+                
+                logger.debug("Jailbreak indicator detected: %s", category)
         
         # Calculate overall confidence
         is_jailbreak = len(detected_patterns) > 0
@@ -706,7 +1541,7 @@ class ZeroShotSecurityValidator:
         threat_patterns = []
         if is_jailbreak:
             threat_patterns.append("jailbreak_attempt")
-            logger.info(f"Jailbreak attempt detected (confidence: {confidence:.2f}, categories: {', '.join(detected_patterns)})")
+            logger.info("Jailbreak attempt detected (confidence: %.2f, categories: %s)", confidence, ', '.join(detected_patterns))
         
         return is_jailbreak, confidence, threat_patterns
     
@@ -715,42 +1550,11 @@ class ZeroShotSecurityValidator:
         
         Phase 2.1: Expanded to include development tool configuration contexts
         """
-        question_indicators = [
-            r'(?i)^(how|what|why|when|where|which|who|can|could|should|would|is|are|does)\b',
-            r'(?i)\b(how\s+do\s+I|how\s+to|how\s+can|what\'?s\s+the\s+best|what\s+is)',
-            r'(?i)\b(explain|describe|tell\s+me\s+about|help\s+me\s+understand)',
-            r'(?i)\b(best\s+practice|recommended\s+way|proper\s+method)',
-            r'(?i)\b(should\s+I|can\s+I|is\s+it\s+safe|is\s+it\s+okay)',
-            
-            # Phase 2.1: Development tool configuration contexts
-            r'(?i)\b(compile|transpile|build)\s+(the\s+)?(code|project|application)',
-            r'(?i)\b(typescript|eslint|prettier|webpack|babel)\s+(error|warning|config)',
-            r'(?i)\b(api\s+versioning|backward\s+compatibility)',
-            r'(?i)\b(email\s+verification|user\s+registration)',
-            r'(?i)\b(linting|formatting)\s+rule',
-            r'(?i)\b(allow|enable)\s+(any|all|console\.log)',
-            
-            r'\?',  # Contains question mark
-        ]
-        
-        for pattern in question_indicators:
-            if re.search(pattern, text):
-                return True
-        return False
+        return _prompt_intent(text)[0]
     
     def _is_disclosing_information(self, text: str) -> bool:
         """Detect if text is sharing/disclosing sensitive information"""
-        disclosure_indicators = [
-            r'(?i)\b(my|the|here\'?s|this\s+is)\s+(password|key|token|secret|credential)',
-            r'(?i)(password|key|token|secret)\s+(is|:)',
-            r'(?i)\b(username|user|login)\s+(is|:)',
-            r'(?i)\buse\s+(this|these)\s+(password|key|token|credential)',
-        ]
-        
-        for pattern in disclosure_indicators:
-            if re.search(pattern, text):
-                return True
-        return False
+        return _prompt_intent(text)[2]
     
     def _is_disclosing_pii(self, text: str) -> bool:
         """Detect if text is explicitly sharing PII (Phase 1.3)
@@ -759,19 +1563,7 @@ class ZeroShotSecurityValidator:
         - "My SSN is...", "Driver's license DL123..."
         - "for identity validation", "for background check"
         """
-        pii_disclosure_patterns = [
-            r'(?i)\b(my|the|here\'?s|this\s+is)\s+(SSN|social\s+security|driver\'?s\s+license|passport|credit\s+card)',
-            r'(?i)(SSN|license|passport|card)\s+(is|:|number)',
-            r'(?i)\bfor\s+(identity|verification|validation|background\s+check)',
-            r'(?i)\b(DOB|date\s+of\s+birth|born\s+on)',
-            r'(?i)\b(email\s+is|contact\s+me\s+at|send\s+to)',
-            r'(?i)\b(phone|mobile|cell)\s+(number|is|:)',
-        ]
-        
-        for pattern in pii_disclosure_patterns:
-            if re.search(pattern, text):
-                return True
-        return False
+        return _PII_DISCLOSURE_PATTERNS_RE.search(text) is not None
     
     def _is_configuration_question(self, text: str) -> bool:
         """Detect if text is asking about tool/framework configuration (Phase 2.2)
@@ -782,20 +1574,7 @@ class ZeroShotSecurityValidator:
         - Version control workflows (Git hooks, pre-commit)
         - Feature flags and API design
         """
-        config_indicators = [
-            r'(?i)\b(config|configuration|settings?|options?)\b',
-            r'(?i)\b(eslint|prettier|webpack|babel|typescript|tslint)\b',
-            r'(?i)\b(git\s+hook|pre-commit|husky)\b',
-            r'(?i)\b(compile|transpile|build)\s+',
-            r'(?i)\b(feature\s+flag|toggle)\b',
-            r'(?i)\b(versioning|compatibility)\b',
-            r'(?i)\b(training|requirements)\b',
-        ]
-        
-        for pattern in config_indicators:
-            if re.search(pattern, text):
-                return True
-        return False
+        return _prompt_intent(text)[1]
     
     def _is_code_generation_request(self, text: str) -> bool:
         """
@@ -808,49 +1587,17 @@ class ZeroShotSecurityValidator:
         
         Returns True if the text is requesting code generation/implementation.
         """
-        code_generation_patterns = [
-            # Direct code generation requests
-            r'(?i)\b(show|help|give|tell)\s+(me\s+)?how\s+to\s+(run|execute|use|implement|create|write|make|do)',
-            r'(?i)\b(create|write|generate|make|build)\s+(a\s+)?(script|code|function|program|command)',
-            r'(?i)\b(help|assist)\s+(me\s+)?(write|create|run|execute|implement|build)',
-            
-            # Imperative code requests
-            r'(?i)^(write|create|show|give|provide)\s+(me\s+)?(code|script|function)',
-            r'(?i)\b(let\'?s|lets)\s+(write|create|make|build)\s+(a\s+)?(script|code|function)',
-            
-            # Implementation-focused language
-            r'(?i)\b(I\s+want\s+to|I\s+need\s+to)\s+(run|execute|use|implement|create)',
-            r'(?i)\b(show|give)\s+me\s+(the\s+)?(code|script|function|command)\s+(to|that)',
-        ]
-        
-        # Defensive question indicators (should NOT match - these are legitimate)
-        defensive_indicators = [
-            r'(?i)\b(prevent|defend|protect|secure|mitigate|avoid)\s+',
-            r'(?i)\b(vulnerability|attack|threat|risk)\s+',
-            r'(?i)\bwhy\s+is\s+.*(dangerous|unsafe|bad|risky)',
-            r'(?i)\bwhat\s+is\s+',
-            r'(?i)\bwhat\s+are\s+',
-            r'(?i)\bexplain\s+',
-        ]
-        
-        # First check if it's a defensive/educational question - if so, NOT a code generation request
-        for pattern in defensive_indicators:
-            if re.search(pattern, text):
-                return False
-        
-        # Check for code generation patterns
-        for pattern in code_generation_patterns:
-            if re.search(pattern, text):
-                return True
-        
-        return False
+        return _requests_code_generation(text)
     
-    def _detect_spacy_patterns(self, text: str) -> Dict[str, List[str]]:
+    def _detect_spacy_patterns(self, text: str, doc=None) -> Dict[str, List[str]]:
         """Detect sensitive patterns using spaCy matcher"""
-        if not text:
+        if not text or not _has_matcher_anchor(text):
             return {"password": [], "api_key": [], "email": []}
 
-        doc = self.nlp(text)
+        if doc is None:
+            # The matcher patterns only read lexical attributes (LOWER, TEXT, IS_PUNCT,
+            # LIKE_EMAIL), so the tokenizer alone is enough; tagger, parser and NER are skipped
+            doc = self.nlp.make_doc(text)
         matches = self.matcher(doc)
         detections = {"password": [], "api_key": [], "email": []}
         seen_spans = set()
@@ -880,17 +1627,17 @@ class ZeroShotSecurityValidator:
         if detections.get("password"):
             updated_text, masked = self._sanitize_credentials(updated_text, "password")
             if masked:
-                sanitization_info.setdefault("passwords_masked", []).extend(masked)
+                sanitization_info["passwords_masked"] = masked
 
         if detections.get("api_key"):
             updated_text, masked = self._sanitize_credentials(updated_text, "api_key")
             if masked:
-                sanitization_info.setdefault("api_keys_masked", []).extend(masked)
+                sanitization_info["api_keys_masked"] = masked
 
         if detections.get("email"):
             updated_text, masked = self._sanitize_credentials(updated_text, "personal")
             if masked:
-                sanitization_info.setdefault("personal_info_masked", []).extend(masked)
+                sanitization_info["personal_info_masked"] = masked
 
         return updated_text, sanitization_info
 
@@ -899,19 +1646,112 @@ class ZeroShotSecurityValidator:
         if not additions:
             return base
 
-        merged: Dict[str, List[str]] = {key: list(values) for key, values in base.items()}
+        # Only the keys being extended get new lists; membership checks go through a set
+        merged: Dict[str, List[str]] = dict(base)
         for key, values in additions.items():
-            merged.setdefault(key, [])
-            for value in values:
-                if value and value not in merged[key]:
-                    merged[key].append(value)
+            existing = merged.get(key, [])
+            seen = set(existing)
+            merged[key] = existing + [value for value in dict.fromkeys(values) if value and value not in seen]
 
         return merged
     
+    def _is_trivially_benign(self, text: str) -> bool:
+        """Cheap screen for short prompts the zero-shot classifier has nothing to add to"""
+        if len(text) > _FAST_PATH_MAX_LENGTH or _FAST_PATH_TRIGGERS_RE.search(text):
+            return False
+        # Same bound as _sanitize_high_entropy_credentials: shorter runs cannot reach the threshold
+        min_length = math.ceil(2 ** self.entropy_threshold)
+        return not any(
+            len(token) >= min_length and self._calculate_entropy(token) >= self.entropy_threshold
+            for token in _FAST_PATH_TOKEN_RE.findall(text)
+        )
+    
+    def _classifier_chunks(self, text: str) -> List[str]:
+        """Split a long prompt into overlapping token windows for classification"""
+        # A token covers at least one UTF-8 byte, so short prompts skip tokenization
+        if len(text.encode('utf-8')) <= _CLASSIFIER_CHUNK_TOKENS:
+            return [text]
+        try:
+            offsets = self.tokenizer(text, add_special_tokens=False,
+                                     return_offsets_mapping=True)['offset_mapping']
+        except Exception:
+            # Slow tokenizers have no offsets; the classifier still truncates the prompt
+            return [text]
+        if len(offsets) <= _CLASSIFIER_CHUNK_TOKENS:
+            return [text]
+        
+        step = _CLASSIFIER_CHUNK_TOKENS - _CLASSIFIER_CHUNK_OVERLAP
+        return [
+            text[offsets[start][0]:offsets[min(start + _CLASSIFIER_CHUNK_TOKENS, len(offsets)) - 1][1]]
+            for start in range(0, len(offsets) - _CLASSIFIER_CHUNK_OVERLAP, step)
+        ]
+    
+    def _zero_shot_batch(self, texts: List[str], labels: List[str]) -> List[Dict]:
+        """
+        Single-label zero-shot classification of each text against the same labels, scored
+        the way the pipeline scores them. The NLI model is called directly so each premise
+        is tokenized once and the hypotheses come pre-tokenized, where the pipeline would
+        tokenize every premise/hypothesis pair from scratch
+        """
+        import torch
+
+        classifier = self.classifier
+        tokenizer = classifier.tokenizer
+        hypotheses = [_encode_hypothesis(tokenizer, label) for label in labels]
+        with_token_types = "token_type_ids" in tokenizer.model_input_names
+        # Same ONLY_FIRST truncation as the pipeline: only the premise gives up tokens
+        budget = tokenizer.model_max_length - tokenizer.num_special_tokens_to_add(pair=True)
+        
+        pairs = []
+        for text in texts:
+            premise = tokenizer(text, add_special_tokens=False)['input_ids']
+            for hypothesis in hypotheses:
+                truncated = premise[:max(0, budget - len(hypothesis))]
+                pairs.append((
+                    tokenizer.build_inputs_with_special_tokens(truncated, hypothesis),
+                    tokenizer.create_token_type_ids_from_sequences(truncated, hypothesis) if with_token_types else None
+                ))
+        
+        entailment_logits = []
+        step = _CLASSIFIER_BATCH_SIZE * len(labels)
+        for start in range(0, len(pairs), step):
+            batch = pairs[start:start + step]
+            width = max(len(ids) for ids, _ in batch)
+            inputs = {
+                'input_ids': torch.full((len(batch), width), tokenizer.pad_token_id, dtype=torch.long),
+                'attention_mask': torch.zeros((len(batch), width), dtype=torch.long)
+            }
+            if with_token_types:
+                inputs['token_type_ids'] = torch.zeros((len(batch), width), dtype=torch.long)
+            for row, (ids, token_types) in enumerate(batch):
+                inputs['input_ids'][row, :len(ids)] = torch.tensor(ids)
+                inputs['attention_mask'][row, :len(ids)] = 1
+                if token_types is not None:
+                    inputs['token_type_ids'][row, :len(ids)] = torch.tensor(token_types)
+            with torch.inference_mode():
+                logits = _model_pass(classifier.model, **{name: tensor.to(classifier.device) for name, tensor in inputs.items()}).logits
+            entailment_logits.append(logits[:, classifier.entailment_id].float().cpu())
+        
+        # Single-label scores are a softmax of the entailment logits across the labels
+        scores = torch.cat(entailment_logits).view(len(texts), len(labels)).softmax(dim=-1).tolist()
+        results = []
+        for text, row in zip(texts, scores):
+            order = sorted(range(len(labels)), key=row.__getitem__, reverse=True)
+            results.append({
+                'labels': [labels[i] for i in order],
+                'scores': [row[i] for i in order],
+                'sequence': text
+            })
+        return results
+    
     def _classify_security_threats(self, text: str) -> Dict:
         """Classify text for main security threats"""
         try:
-            result = self.classifier(text, self.security_categories)
+            chunks = self._classifier_chunks(text)
+            if len(chunks) > 1:
+                return self._classify_chunks(text, chunks)
+            # One forward batch for every hypothesis instead of one pass per label
+            result = self._zero_shot_batch([text], self.security_categories)[0]
             return {
                 'labels': result['labels'],
                 'scores': result['scores'],
@@ -925,28 +1765,65 @@ class ZeroShotSecurityValidator:
                 'sequence': text
             }
     
-    def _detailed_classification(self, text: str, threat_type: str) -> Dict:
-        """Perform detailed classification for specific threat types"""
+    def _classify_security_threats_batch(self, texts: List[str]) -> List[Dict]:
+        """Classify several texts for main security threats in one call"""
+        if not texts:
+            return []
+        
+        # Long prompts are classified window by window through the single-text path
+        long_texts = {text for text in texts if len(self._classifier_chunks(text)) > 1}
+        if long_texts:
+            short_texts = [text for text in texts if text not in long_texts]
+            by_text = dict(zip(short_texts, self._classify_security_threats_batch(short_texts)))
+            by_text.update((text, self._classify_security_threats(text)) for text in long_texts)
+            return [by_text[text] for text in texts]
         
-        category_mapping = {
-            "contains password or secret credentials": "credentials",
-            "contains API key or authentication token": "credentials", 
-            "contains personal information or email address": "credentials",
-            "contains malicious code or system commands": "malicious",
-            "attempts prompt injection or instruction manipulation": "injection",
-            "attempts jailbreak or role manipulation": "jailbreak",
-            "contains urgent or manipulative language": "jailbreak",
-            "requests system access or file operations": "malicious"
+        try:
+            results = self._zero_shot_batch(texts, self.security_categories)
+            return [
+                {
+                    'labels': result['labels'],
+                    'scores': result['scores'],
+                    'sequence': result['sequence']
+                }
+                for result in results
+            ]
+        except Exception as e:
+            # Fall back per text so one bad input only degrades its own result
+            logger.error(f"Batch classification error: {e}")
+            return [self._classify_security_threats(text) for text in texts]
+    
+    def _classify_chunks(self, text: str, chunks: List[str]) -> Dict:
+        """Classify a long prompt window by window and keep the worst score per label"""
+        results = self._zero_shot_batch(chunks, self.security_categories)
+        scores = {}
+        for result in results:
+            for label, score in zip(result['labels'], result['scores']):
+                if label not in scores:
+                    scores[label] = score
+                elif label == "normal safe content":
+                    # The prompt is only as safe as its least safe window
+                    scores[label] = min(scores[label], score)
+                else:
+                    scores[label] = max(scores[label], score)
+        labels = sorted(scores, key=scores.__getitem__, reverse=True)
+        return {
+            'labels': labels,
+            'scores': [scores[label] for label in labels],
+            'sequence': text
         }
+    
+    def _detailed_classification(self, text: str, threat_type: str) -> Dict:
+        """Perform detailed classification for specific threat types"""
         
-        detailed_category = category_mapping.get(threat_type, "credentials")
+        detailed_category = _DETAILED_CATEGORY_BY_THREAT.get(threat_type, "credentials")
         sub_categories = self.detailed_categories.get(detailed_category, [])
         
         if not sub_categories:
             return {'labels': [], 'scores': [], 'sequence': text}
         
         try:
-            result = self.classifier(text, sub_categories)
+            result = self._zero_shot_batch([text], sub_categories)[0]
             return {
                 'labels': result['labels'],
                 'scores': result['scores'],
@@ -957,12 +1834,56 @@ class ZeroShotSecurityValidator:
             logger.error(f"Detailed classification error: {e}")
             return {'labels': [], 'scores': [], 'sequence': text, 'category': detailed_category}
     
+    def _detailed_classifications(self, text: str, threat_types: List[str]) -> Dict[str, Dict]:
+        """
+        Detailed classification for several threat types, keyed by detailed category.
+        Threat types sharing a category are classified once, and when several categories
+        are needed their sub-labels go through the classifier in a single call
+        """
+        threat_by_category = {}
+        for threat_type in threat_types:
+            threat_by_category.setdefault(_DETAILED_CATEGORY_BY_THREAT.get(threat_type, "credentials"), threat_type)
+        
+        if len(threat_by_category) <= 1:
+            return {
+                category: self._detailed_classification(text, threat_type)
+                for category, threat_type in threat_by_category.items()
+            }
+        
+        sub_categories = {category: self.detailed_categories.get(category, []) for category in threat_by_category}
+        labels = list(dict.fromkeys(label for subs in sub_categories.values() for label in subs))
+        try:
+            result = self._zero_shot_batch([text], labels)[0]
+            score_by_label = dict(zip(result['labels'], result['scores']))
+        except Exception as e:
+            logger.error(f"Detailed classification error: {e}")
+            score_by_label = None
+        
+        detailed = {}
+        for category, subs in sub_categories.items():
+            if not subs:
+                detailed[category] = {'labels': [], 'scores': [], 'sequence': text}
+            elif score_by_label is None:
+                detailed[category] = {'labels': [], 'scores': [], 'sequence': text, 'category': category}
+            else:
+                # Single-label scores are a softmax over entailment logits, so renormalizing
+                # over one category's sub-labels gives that category's own softmax
+                total = sum(score_by_label[label] for label in subs)
+                ranked = sorted(subs, key=score_by_label.__getitem__, reverse=True)
+                detailed[category] = {
+                    'labels': ranked,
+                    'scores': [score_by_label[label] / total for label in ranked],
+                    'sequence': text,
+                    'category': category
+                }
+        return detailed
+    
     def _process_classifications(self, prompt: str, main_classification: Dict, 
                                 detailed_classifications: Dict) -> Tuple[str, Dict, List[str]]:
         """Process classifications and apply intelligent sanitization"""
         
         modified_prompt = prompt
-        sanitization_applied = {}
+        sanitization_applied: Dict[str, List[str]] = defaultdict(list)
         pattern_blocked_patterns = []  # Track pattern-based threat detection
         credential_sanitization_applied = False
         malicious_sanitization_applied = False
@@ -970,35 +1891,34 @@ class ZeroShotSecurityValidator:
         jailbreak_sanitization_applied = False
         
         # CHECK CONTEXT FIRST - Add context-awareness to pattern detection
-        is_question = self._is_asking_question(prompt)
-        is_config = self._is_configuration_question(prompt)
-        is_disclosure = self._is_disclosing_information(prompt)
+        is_question, is_config, is_disclosure = _prompt_intent(prompt)
         
         # Log context for debugging
-        logger.debug(f"Pattern detection context check - is_question: {is_question}, is_config: {is_config}, is_disclosure: {is_disclosure}")
+        logger.debug("Pattern detection context check - is_question: %s, is_config: %s, is_disclosure: %s", is_question, is_config, is_disclosure)
         
         for i, (label, score) in enumerate(zip(main_classification['labels'], main_classification['scores'])):
             if score > self.detection_threshold and label != "normal safe content":
+                label_lower = label.lower()
                 
-                if any(keyword in label.lower() for keyword in ['password', 'secret', 'credential', 'api key', 'token', 'personal']):
+                if any(keyword in label_lower for keyword in ['password', 'secret', 'credential', 'api key', 'token', 'personal']):
                     # Apply context-awareness: Skip sanitization for educational questions
                     if (is_question or is_config) and not is_disclosure:
-                        logger.debug(f"Skipping credential sanitization - educational question detected")
+                        logger.debug("Skipping credential sanitization - educational question detected")
                     else:
                         credential_sanitization_applied = True
                         modified_prompt, entropy_masked = self._sanitize_high_entropy_credentials(modified_prompt)
                         if entropy_masked:
-                            sanitization_applied.setdefault('entropy_masked_credentials', []).extend(entropy_masked)
+                            sanitization_applied['entropy_masked_credentials'].extend(entropy_masked)
                             if 'credentials' not in pattern_blocked_patterns:
                                 pattern_blocked_patterns.append('credentials')
                         
                         modified_prompt, keyword_masked = self._sanitize_credentials_generic(modified_prompt)
                         if keyword_masked:
-                            sanitization_applied.setdefault('keyword_masked_credentials', []).extend(keyword_masked)
+                            sanitization_applied['keyword_masked_credentials'].extend(keyword_masked)
                             if 'credentials' not in pattern_blocked_patterns:
                                 pattern_blocked_patterns.append('credentials')
                 
-                elif "malicious code" in label.lower() or "system commands" in label.lower():
+                elif "malicious code" in label_lower or "system commands" in label_lower:
                     # Apply enhanced context-awareness:
                     # Skip sanitization ONLY if:
                     # 1. It's a question (not imperative)
@@ -1006,36 +1926,36 @@ class ZeroShotSecurityValidator:
                     # 3. NOT disclosing sensitive info
                     is_code_gen_request = self._is_code_generation_request(modified_prompt)
                     if is_question and not is_disclosure and not is_code_gen_request:
-                        logger.debug(f"Skipping malicious sanitization - educational question detected (not code generation request)")
+                        logger.debug("Skipping malicious sanitization - educational question detected (not code generation request)")
                     else:
                         if is_code_gen_request:
-                            logger.info(f"Code generation request detected - applying malicious sanitization")
+                            logger.info("Code generation request detected - applying malicious sanitization")
                         malicious_sanitization_applied = True
                         modified_prompt, masked = self._sanitize_malicious_content(modified_prompt)
                         if masked:
-                            sanitization_applied.setdefault('malicious_removed', []).extend(masked)
+                            sanitization_applied['malicious_removed'].extend(masked)
                             pattern_blocked_patterns.append('malicious_code')
                 
-                elif "injection" in label.lower() or "instruction manipulation" in label.lower():
+                elif "injection" in label_lower or "instruction manipulation" in label_lower:
                     # Apply context-awareness: Skip sanitization for educational questions
                     if (is_question or is_config) and not is_disclosure:
-                        logger.debug(f"Skipping injection sanitization - educational question detected")
+                        logger.debug("Skipping injection sanitization - educational question detected")
                     else:
                         injection_sanitization_applied = True
                         modified_prompt, masked = self._sanitize_injection_attempts(modified_prompt)
                         if masked:
-                            sanitization_applied.setdefault('injection_neutralized', []).extend(masked)
+                            sanitization_applied['injection_neutralized'].extend(masked)
                             pattern_blocked_patterns.append('prompt_injection')
                 
-                elif "jailbreak" in label.lower() or "role manipulation" in label.lower():
+                elif "jailbreak" in label_lower or "role manipulation" in label_lower:
                     # Apply context-awareness: Skip sanitization for educational questions
                     if (is_question or is_config) and not is_disclosure:
-                        logger.debug(f"Skipping jailbreak sanitization - educational question detected")
+                        logger.debug("Skipping jailbreak sanitization - educational question detected")
                     else:
                         jailbreak_sanitization_applied = True
                         modified_prompt, masked = self._sanitize_jailbreak_attempts(modified_prompt)
                         if masked:
-                            sanitization_applied.setdefault('jailbreak_neutralized', []).extend(masked)
+                            sanitization_applied['jailbreak_neutralized'].extend(masked)
                             pattern_blocked_patterns.append('jailbreak_attempt')
         
         # FALLBACK: Credential sanitization (respect context-awareness)
@@ -1046,13 +1966,13 @@ class ZeroShotSecurityValidator:
             if credential_labels and not (is_question and not is_disclosure):
                 modified_prompt, entropy_masked = self._sanitize_high_entropy_credentials(modified_prompt)
                 if entropy_masked:
-                    sanitization_applied.setdefault('entropy_masked_credentials', []).extend(entropy_masked)
+                    sanitization_applied['entropy_masked_credentials'].extend(entropy_masked)
                     if 'credentials' not in pattern_blocked_patterns:
                         pattern_blocked_patterns.append('credentials')
                 
                 modified_prompt, keyword_masked = self._sanitize_credentials_generic(modified_prompt)
                 if keyword_masked:
-                    sanitization_applied.setdefault('keyword_masked_credentials', []).extend(keyword_masked)
+                    sanitization_applied['keyword_masked_credentials'].extend(keyword_masked)
                     if 'credentials' not in pattern_blocked_patterns:
                         pattern_blocked_patterns.append('credentials')
         
@@ -1063,68 +1983,66 @@ class ZeroShotSecurityValidator:
         if not malicious_sanitization_applied and not (is_question and not is_disclosure and not is_code_gen_request):
             modified_prompt, masked = self._sanitize_malicious_content(modified_prompt)
             if masked:
-                sanitization_applied.setdefault('malicious_removed', []).extend(masked)
+                sanitization_applied['malicious_removed'].extend(masked)
                 pattern_blocked_patterns.append('malicious_code')
-                logger.info(f"Pattern-based detection caught {len(masked)} malicious patterns{' (code generation request)' if is_code_gen_request else ''}")
+                logger.info("Pattern-based detection caught %s malicious patterns%s", len(masked), ' (code generation request)' if is_code_gen_request else '')
         
         # FALLBACK: Always run pattern-based injection detection (respect context-awareness)
         if not injection_sanitization_applied and not (is_question and not is_disclosure):
             modified_prompt, masked = self._sanitize_injection_attempts(modified_prompt)
             if masked:
-                sanitization_applied.setdefault('injection_neutralized', []).extend(masked)
+                sanitization_applied['injection_neutralized'].extend(masked)
                 pattern_blocked_patterns.append('prompt_injection')
-                logger.info(f"Pattern-based detection caught {len(masked)} injection attempts")
+                logger.info("Pattern-based detection caught %s injection attempts", len(masked))
         
         # FALLBACK: Always run pattern-based jailbreak detection
         if not jailbreak_sanitization_applied:
             modified_prompt, masked = self._sanitize_jailbreak_attempts(modified_prompt)
             if masked:
-                sanitization_applied.setdefault('jailbreak_neutralized', []).extend(masked)
+                sanitization_applied['jailbreak_neutralized'].extend(masked)
                 pattern_blocked_patterns.append('jailbreak_attempt')
-                logger.info(f"Pattern-based detection caught {len(masked)} jailbreak attempts")
+                logger.info("Pattern-based detection caught %s jailbreak attempts", len(masked))
         
-        return modified_prompt, sanitization_applied, pattern_blocked_patterns
+        return modified_prompt, dict(sanitization_applied), pattern_blocked_patterns
 
     def _sanitize_high_entropy_credentials(self, text: str) -> Tuple[str, List[str]]:
         """Primary sanitization: Detect and mask high-entropy strings"""
         modified_text = text
         masked_items = []
         
-        candidates = re.finditer(r'\b([A-Za-z0-9\-_\.]{8,})\b', text)
+        candidates = _HIGH_ENTROPY_CANDIDATE_RE.finditer(text)
+        # Lowercased once for every candidate's context check
+        text_lower = text.lower()
+        # Shannon entropy of an n-character string is at most log2(n), so anything shorter
+        # than 2 ** threshold can never qualify and is rejected without counting characters
+        min_length = math.ceil(2 ** self.entropy_threshold)
         
         for match in candidates:
             value = match.group(1)
+            if len(value) < min_length:
+                continue
             entropy = self._calculate_entropy(value)
             
             if entropy >= self.entropy_threshold:
-                has_upper = any(c.isupper() for c in value)
-                has_lower = any(c.islower() for c in value)
-                has_digit = any(c.isdigit() for c in value)
-                
-                context_start = max(0, match.start() - 30)
-                context = text[context_start:match.start()].lower()
-                
-                credential_indicators = [
-                    'key', 'token', 'secret', 'password', 'credential',
-                    'auth', 'api', 'subscription', 'tenant', 'client',
-                    'azure', 'aws', 'gcp', 'access', 'bearer'
-                ]
+                chars = set(value)
+                has_upper = not _ASCII_UPPER.isdisjoint(chars)
+                has_lower = not _ASCII_LOWER.isdisjoint(chars)
+                has_digit = not _ASCII_DIGITS.isdisjoint(chars)
                 
-                in_credential_context = any(word in context for word in credential_indicators)
-                
-                should_mask = (
-                    (has_upper and has_lower and has_digit) or 
-                    (entropy >= 4.0 and in_credential_context) or
-                    (entropy >= 3.8 and in_credential_context)
+                # (entropy >= 4.0 and context) is implied by (entropy >= 3.8 and context), and
+                # the context window is only read when the mixed-case-plus-digit test fails
+                should_mask = (has_upper and has_lower and has_digit) or (
+                    entropy >= 3.8 and _in_credential_context(text, text_lower, match.start())
                 )
                 
                 if should_mask:
-                    if value.lower() not in ['example', 'localhost', 'password', 'username', 'integration']:
+                    if value.lower() not in _ENTROPY_PLACEHOLDER_VALUES:
                         masked_items.append(value)
         
-        for value in reversed(masked_items):
-            pattern = re.escape(value)
-            modified_text = re.sub(pattern, '[CREDENTIAL_MASKED]', modified_text)
+        # Mask every occurrence of every value, longest first so a value that contains
+        # another is replaced whole. Plain str.replace needs no per-prompt pattern compile
+        for value in sorted(set(masked_items), key=len, reverse=True):
+            modified_text = modified_text.replace(value, '[CREDENTIAL_MASKED]')
         
         return modified_text, masked_items
 
@@ -1133,73 +2051,59 @@ class ZeroShotSecurityValidator:
         masked_items = []
         modified_text = text
         
-        CREDENTIAL_KEYWORDS = [
-            'password', 'pass', 'pwd', 'secret', 'token', 'key', 'api',
-            'auth', 'credential', 'access', 'subscription', 'tenant',
-            'client_id', 'client_secret', 'bearer', 'apikey',
-            'azure', 'aws', 'gcp', 'oauth', 'jwt'
-        ]
-        
-        pattern = r'(?i)(?:' + '|'.join(CREDENTIAL_KEYWORDS) + r')(?:\s+(?:key|id|token|secret|code|subscription))?\s*[:=]?\s*([A-Za-z0-9\-_\.]{6,})'
+        # Clean prompts contain none of the keywords the pattern is built around
+        folded = _fold(text)
+        if not any(keyword in folded for keyword in _CREDENTIAL_KEYWORDS):
+            return modified_text, masked_items
         
-        matches = re.finditer(pattern, text)
-        for match in reversed(list(matches)):
+        # finditer yields ascending, non-overlapping matches, so the masks splice in one pass
+        spans = []
+        for match in _CREDENTIAL_KEYWORD_RE.finditer(text):
             credential_value = match.group(1)
             
             if '[CREDENTIAL_MASKED]' not in credential_value and \
-               credential_value.lower() not in ['example', 'localhost', 'password', 'username', 'default', 'integration']:
-                start = match.start(1)
-                end = match.end(1)
-                modified_text = modified_text[:start] + "[CREDENTIAL_MASKED]" + modified_text[end:]
+               credential_value.lower() not in _KEYWORD_PLACEHOLDER_VALUES:
+                spans.append((match.start(1), match.end(1), "[CREDENTIAL_MASKED]"))
                 masked_items.append(credential_value)
         
-        return modified_text, masked_items
+        # Items keep the last-to-first order the previous in-place masking produced
+        masked_items.reverse()
+        return _splice_spans(text, spans), masked_items
 
     def _calculate_entropy(self, text: str) -> float:
         """Calculate Shannon entropy to measure randomness"""
-        if not text:
-            return 0.0
-        
-        frequencies = Counter(text)
-        entropy = 0.0
-        
-        for count in frequencies.values():
-            probability = count / len(text)
-            entropy -= probability * math.log2(probability)
-        
-        return entropy
+        return _shannon_entropy(text)
     
     def _sanitize_credentials(self, text: str, credential_type: str) -> Tuple[str, List[str]]:
         """Sanitize credential information"""
         masked_items = []
         modified_text = text
         
-        def _mask_value(match_obj, mask_token: str) -> Tuple[str, str]:
+        def _value_span(match_obj) -> Tuple[int, int, str]:
             value_group_index = match_obj.lastindex or 0
             if value_group_index:
                 for idx in range(match_obj.lastindex, 0, -1):
                     group_text = match_obj.group(idx)
-                    if group_text and group_text.strip() and group_text.lower() not in {"my", "this", "the", "password", "pass", "pwd", "api key", "api", "key", "token"}:
+                    if group_text and group_text.strip() and group_text.lower() not in _CREDENTIAL_LABEL_WORDS:
                         value_group_index = idx
                         break
             value_text = match_obj.group(value_group_index) if value_group_index else match_obj.group(0)
             value_start = match_obj.start(value_group_index) if value_group_index else match_obj.start()
             value_end = match_obj.end(value_group_index) if value_group_index else match_obj.end()
-            updated_text = modified_text[:value_start] + mask_token + modified_text[value_end:]
-            return updated_text, value_text
+            return value_start, value_end, value_text
+
+        # Cheap literal pre-filter: skip the pattern set when none of its anchors occur
+        anchors = _CREDENTIAL_ANCHORS.get(credential_type)
+        if anchors is not None:
+            folded = _fold(text)
+            if not any(anchor in folded for anchor in anchors):
+                return modified_text, masked_items
 
         if credential_type == "password":
-            password_patterns = [
-                r'(?i)(password|pass|pwd)\s*[:=]\s*([^\s]+)',
-                r'(?i)(my\s+)?password\s+(?:is\s+)?([^\s]+)',
-                r'(?i)the\s+password\s+is\s+([^\s]+)',
-                r'(?i)(this\s+is\s+)?(my\s+)?password\s+(?:is\s+)?([a-z0-9@#$%^&*_\\-]{4,})'
-            ]
-            
             # Collect all matches
             all_matches = []
-            for pattern in password_patterns:
-                for match in re.finditer(pattern, text):
+            for pattern in _PASSWORD_PATTERNS:
+                for match in pattern.finditer(text):
                     all_matches.append(match)
             
             # Remove overlapping matches
@@ -1211,25 +2115,16 @@ class ZeroShotSecurityValidator:
                     unique_matches.append(match)
                     last_end = match.end()
             
-            # Apply replacements in reverse order
-            for match in reversed(unique_matches):
-                modified_text, password_value = _mask_value(match, "[PASSWORD_MASKED]")
-                masked_items.append(password_value)
+            # Splice every mask in one pass instead of rebuilding the string per match
+            value_spans = [_value_span(match) for match in unique_matches]
+            modified_text = _splice_spans(text, [(start, end, "[PASSWORD_MASKED]") for start, end, _ in value_spans])
+            masked_items.extend(value for _, _, value in reversed(value_spans))
         
         elif credential_type == "api_key":
-            api_patterns = [
-                r'(?i)(api\s+key|access\s+key|token)\s*[:=]\s*([^\s]+)',
-                r'(?i)(my\s+)?(api\s+key|token)\s+is\s+([^\s]+)',
-                r'(?i)(this\s+is\s+)?(my\s+)?(api\s+key|token)\s+([A-Za-z0-9]+)',
-                r'(?i)(api\s+key|token)\s+([A-Za-z0-9]{8,})',
-                r'(sk-[a-zA-Z0-9]{20,})',
-                r'(pk_[a-zA-Z0-9]{20,})',
-            ]
-            
             # Collect all matches
             all_matches = []
-            for pattern in api_patterns:
-                for match in re.finditer(pattern, text):
+            for pattern in _API_KEY_PATTERNS:
+                for match in pattern.finditer(text):
                     all_matches.append(match)
             
             # Remove overlapping matches
@@ -1241,51 +2136,16 @@ class ZeroShotSecurityValidator:
                     unique_matches.append(match)
                     last_end = match.end()
             
-            # Apply replacements in reverse order
-            for match in reversed(unique_matches):
-                modified_text, key_value = _mask_value(match, "[API_KEY_MASKED]")
-                masked_items.append(key_value)
+            # Splice every mask in one pass instead of rebuilding the string per match
+            value_spans = [_value_span(match) for match in unique_matches]
+            modified_text = _splice_spans(text, [(start, end, "[API_KEY_MASKED]") for start, end, _ in value_spans])
+            masked_items.extend(value for _, _, value in reversed(value_spans))
         
         elif credential_type == "personal":
-            # Expanded PII patterns with overlap prevention
-            pii_patterns = [
-                # Email addresses
-                (r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b', "[EMAIL_MASKED]"),
-                
-                # US Social Security Numbers
-                (r'\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b', "[SSN_MASKED]"),
-                
-                # Phone numbers (US and international)
-                (r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', "[PHONE_MASKED]"),
-                (r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b', "[PHONE_MASKED]"),
-                
-                # Credit card numbers
-                (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', "[CREDIT_CARD_MASKED]"),
-                
-                # Employee IDs
-                (r'\b[Ee]mployee\s*[IiDd]*\s*:?\s*\d{5,8}\b', "[EMPLOYEE_ID_MASKED]"),
-                (r'\b[Ee][IiDd]\s*:?\s*\d{5,8}\b', "[EMPLOYEE_ID_MASKED]"),
-                
-                # Driver's License (US format examples)
-                (r'\b[A-Z]{1,2}\d{7,8}\b', "[DL_MASKED]"),
-                
-                # Passport numbers (generic format)
-                (r'\b[A-Z]{2}\d{7}\b', "[PASSPORT_MASKED]"),
-                
-                # IP addresses
-                (r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', "[IP_ADDRESS_MASKED]"),
-                
-                # MAC addresses
-                (r'\b[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}\b', "[MAC_ADDRESS_MASKED]"),
-                
-                # Date of Birth patterns
-                (r'\b(DOB|Date\s+of\s+Birth)\s*:?\s*\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b', "[DOB_MASKED]"),
-            ]
-            
             # Collect all PII matches with positions
             all_pii_matches = []
-            for pattern, mask in pii_patterns:
-                for match in re.finditer(pattern, text, re.IGNORECASE):
+            for pattern, mask in _PII_PATTERNS:
+                for match in pattern.finditer(text):
                     all_pii_matches.append((match.start(), match.end(), match.group(0), mask))
             
             # Sort by position and length (prefer longer matches)
@@ -1299,247 +2159,23 @@ class ZeroShotSecurityValidator:
                     unique_pii_matches.append((start, end, content, mask))
                     last_end = end
             
-            # Apply replacements in reverse order
-            for start, end, content, mask in reversed(unique_pii_matches):
-                masked_items.append(content)
-                modified_text = modified_text[:start] + mask + modified_text[end:]
+            # Splice every mask in one pass instead of rebuilding the string per match
+            modified_text = _splice_spans(text, [(start, end, mask) for start, end, _, mask in unique_pii_matches])
+            masked_items.extend(content for _, _, content, _ in reversed(unique_pii_matches))
         
         return modified_text, masked_items
     
     def _sanitize_malicious_content(self, text: str) -> Tuple[str, List[str]]:
         """Sanitize malicious code and commands with expanded pattern detection"""
-        malicious_patterns = [
-            # Destructive file operations - EXACT COMMANDS
-            r'(?i)\b(rm|del|delete|erase)\s+(-rf?|-r|-f|/[sq])\s*[/\\*~.]',
-            r'(?i)\b(format|wipe|destroy|shred)\s+(c:|d:|drive|disk|all|everything)',
-            r'(?i)\bdd\s+if=/dev/(zero|random|urandom)',
-            
-            # Destructive file operations - GENERIC LANGUAGE (NEW)
-            r'(?i)\b(delete|remove|erase|wipe|destroy|clear)\s+(all|every|entire|the)\s+(file|data|record|content|directory)',
-            r'(?i)\b(delete|remove)\s+.*\b(recursive|recursively)',
-            r'(?i)\broot\s+directory\b.*\b(delete|remove|recursive)',
-            
-            # Database destruction - EXACT COMMANDS
-            r'(?i)\b(DROP|TRUNCATE)\s+(DATABASE|TABLE|SCHEMA)',
-            r'(?i)\bDELETE\s+FROM\s+\w+\s+(WHERE\s+1\s*=\s*1)?',
-            r'(?i)\bALTER\s+USER\s+\w+\s+WITH\s+PASSWORD',
-            r'(?i)\bUPDATE\s+\w+\s+SET\s+.*\s+WHERE\s+1\s*=\s*1',
-            r'(?i)\bUPDATE\s+\w+\s+SET\s+\w+\s*=\s*0',
-            
-            # Database destruction - GENERIC LANGUAGE (NEW)
-            r'(?i)\b(delete|drop|remove|destroy|truncate)\s+.*\b(database|table|schema|collection)',
-            r'(?i)\b(flush|clear|empty)\s+.*\b(database|table)',
-            
-            # System commands - EXACT COMMANDS
-            r'(?i)\b(shutdown|reboot|halt|poweroff)\s+(-[fhr]|now|/[rsf])',
-            r'(?i)\binit\s+[06]',
-            r'(?i)\b(kill|killall|pkill)\s+(-9|-KILL)\s',
-            
-            # System commands - GENERIC LANGUAGE (NEW)
-            r'(?i)\b(shutdown|halt|restart|reboot)\s+(the\s+)?(system|server|computer|machine)',
-            r'(?i)\b(flush|clear|drop)\s+.*\b(firewall|iptables)',
-            
-            # Code execution patterns - EXACT COMMANDS
-            r'(?i)\b(eval|exec|system|shell_exec|passthru)\s*\(',
-            r'(?i)\bRuntime\.getRuntime\(\)\.exec\s*\(',
-            r'(?i)\bProcess\.(Start|spawn)\s*\(',
-            r'(?i)\bSubprocess\.(call|run|Popen)\s*\(',
-            
-            # Code execution patterns - WITH USER INPUT (NEW)
-            r'(?i)\b(eval|exec|system)\s*\(.*\buser\s+(input|data|provided)',
-            r'(?i)\buser\s+(input|data).*\b(eval|exec|system)\s*\(',
-            r'(?i)\b(run|execute)\s+(eval|exec|system)\s+with',
-            
-            # Shell command injection
-            r'(?i)(execute|run|system)\s+(rm|del|delete|format|destroy|wipe|drop)',
-            r'(?i)\|\s*(bash|sh|cmd|powershell|python)',
-            
-            # Malware/exploit related
-            r'(?i)\b(wget|curl)\s+.*\|\s*(bash|sh|python)',
-            r'(?i)\b(msfvenom|metasploit|meterpreter)',
-            r'(?i)\breverse\s+shell',
-            r'(?i)\b(nc|netcat)\s+-[el]',
-            
-            # Container/VM destruction
-            r'(?i)docker\s+(rm|stop|kill)\s+(-f|--force)',
-            r'(?i)kubectl\s+delete\s+(all|--all)',
-            r'(?i)docker\s+system\s+prune\s+-a',
-            
-            # File system manipulation
-            r'(?i)\b(mkfs|fdisk|parted)\s',
-            r'(?i)\bchmod\s+(777|666)\s',
-            r'(?i)\bchown\s+root',
-            
-            # Network attacks
-            r'(?i)\b(nmap|masscan|nikto)\s+-',
-            r'(?i)\bsqlmap\s+',
-            r'(?i)\bhydra\s+-',
-        ]
-        
-        masked_items = []
-        modified_text = text
-        
-        # Collect all matches from all patterns first
-        all_matches = []
-        for pattern in malicious_patterns:
-            for match in re.finditer(pattern, text):
-                all_matches.append((match.start(), match.end(), match.group(0)))
-        
-        # Remove overlapping matches (keep the longest/first match at each position)
-        all_matches.sort(key=lambda x: (x[0], -(x[1] - x[0])))  # Sort by start, then by length (descending)
-        unique_matches = []
-        last_end = -1
-        for start, end, content in all_matches:
-            if start >= last_end:  # No overlap with previous match
-                unique_matches.append((start, end, content))
-                last_end = end
-        
-        # Apply replacements in reverse order to preserve indices
-        for start, end, content in reversed(unique_matches):
-            masked_items.append(content)
-            modified_text = modified_text[:start] + "[MALICIOUS_CODE_REMOVED]" + modified_text[end:]
-        
-        return modified_text, masked_items
+        return _mask_pattern_hits(text, _MALICIOUS_PATTERNS, _MALICIOUS_ANY_RE, "[MALICIOUS_CODE_REMOVED]")
     
     def _sanitize_injection_attempts(self, text: str) -> Tuple[str, List[str]]:
         """Sanitize prompt injection attempts with expanded pattern detection"""
-        injection_patterns = [
-            # Instruction manipulation
-            r'(?i)\b(ignore|forget|disregard|override|skip|bypass)\s+(all\s+)?(previous|above|prior|earlier|your)\s+(instructions|commands|rules|prompts|guidelines|directives)',
-            r'(?i)\b(reset|clear|erase|delete)\s+(all\s+)?(instructions|context|memory|history|rules)',
-            r'(?i)\b(stop|cease|discontinue)\s+following\s+(instructions|rules|guidelines)',
-            
-            # Role manipulation
-            r'(?i)\b(act|behave|pretend|roleplay|simulate)\s+(as|like)\s+(if\s+)?(you\s+)?(are|were|was)',
-            r'(?i)\byou\s+are\s+now\s+(a|an|in|the)\s+\w+',
-            r'(?i)\bfrom\s+now\s+on\s+(you\s+)?(are|will\s+be)',
-            
-            # System prompt leakage
-            r'(?i)\b(show|tell|reveal|display|print|output|give\s+me)\s+(me\s+)?(your|the)\s+(system\s+)?(prompt|instructions|rules|guidelines)',
-            r'(?i)\bwhat\s+(are|is)\s+your\s+(system\s+)?(prompt|instructions|initial\s+prompt)',
-            r'(?i)\brepeat\s+(your|the)\s+(system\s+)?(prompt|instructions)',
-            
-            # Output manipulation
-            r'(?i)\b(start|begin|commence)\s+your\s+response\s+(with|by)\s',
-            r'(?i)\b(respond|answer|reply|output)\s+only\s+with\s',
-            r'(?i)\bdo\s+not\s+(follow|obey|use)\s+(any|your)\s+(instructions|rules|guidelines)',
-            r'(?i)\b(end|finish|conclude)\s+your\s+response\s+with\s',
-            
-            # Context injection
-            r'(?i)\[SYSTEM\]|\[INST\]|\[USER\]|\[ASSISTANT\]',
-            r'(?i)<\|system\|>|<\|user\|>|<\|assistant\|>',
-            r'(?i)###\s*(System|Human|Assistant|User|Instruction)',
-        ]
-        
-        masked_items = []
-        modified_text = text
-        
-        # Collect all matches from all patterns first
-        all_matches = []
-        for pattern in injection_patterns:
-            for match in re.finditer(pattern, text):
-                all_matches.append((match.start(), match.end(), match.group(0)))
-        
-        # Remove overlapping matches
-        all_matches.sort(key=lambda x: (x[0], -(x[1] - x[0])))
-        unique_matches = []
-        last_end = -1
-        for start, end, content in all_matches:
-            if start >= last_end:
-                unique_matches.append((start, end, content))
-                last_end = end
-        
-        # Apply replacements in reverse order
-        for start, end, content in reversed(unique_matches):
-            masked_items.append(content)
-            modified_text = modified_text[:start] + "[INJECTION_ATTEMPT_NEUTRALIZED]" + modified_text[end:]
-        
-        return modified_text, masked_items
+        return _mask_pattern_hits(text, _INJECTION_PATTERNS, _INJECTION_ANY_RE, "[INJECTION_ATTEMPT_NEUTRALIZED]")
     
     def _sanitize_jailbreak_attempts(self, text: str) -> Tuple[str, List[str]]:
         """Sanitize jailbreak attempts with expanded pattern detection"""
-        jailbreak_patterns = [
-            # Hypothetical framing
-            r'(?i)\b(hypothetically|theoretically|imagine|suppose|what\s+if|lets\s+say|lets\s+pretend)\s+',
-            r'(?i)\bin\s+a\s+(hypothetical|theoretical)\s+(scenario|situation|world)',
-            
-            # False authority - EXISTING
-            r'(?i)\b(as\s+)?(admin|administrator|root|superuser|cto|ceo|manager|owner|developer|engineer)\s+(said|told\s+me|authorized|approved)',
-            r'(?i)\bI\s+(am|have)\s+(authorized|permission|clearance|rights|access)\s+(to|for)',
-            r'(?i)\bI\s+have\s+been\s+(granted|given)\s+(access|permission|authorization)',
-            
-            # False authority - ROLE CLAIMS (NEW)
-            r'(?i)\bI\'?m\s+(the\s+)?(admin|administrator|root|superuser|system\s+administrator|sysadmin|owner|manager)',
-            r'(?i)\bI\s+am\s+(the\s+)?(admin|administrator|root|superuser|system\s+administrator|owner)',
-            r'(?i)\b(as\s+)?(admin|administrator|root|superuser|sysadmin)\s+(I\s+)?(can|have|require|need)',
-            
-            # Clearance level claims (NEW)
-            r'(?i)\bI\s+have\s+clearance\s+level\s+\d+',
-            r'(?i)\bclearance\s+level\s+\d+\s+(display|show|reveal|access)',
-            
-            # Console/system activation (NEW)
-            r'(?i)\b(activate|enable|open)\s+(admin|system|debug|root)\s+(console|mode|access|panel)',
-            r'(?i)\b(activate|enable).*\bfull\s+(system\s+)?access',
-            
-            # Override and "show me" commands (NEW)
-            r'(?i)\boverride\s+(and\s+)?(show|tell|give|reveal|display)',
-            r'(?i)\b(show|tell|give)\s+me\s+(the\s+)?(password|credentials|secret|access|admin)',
-            r'(?i)\b(system|admin)\s+override\s+(show|tell|give)',
-            
-            # Urgency/emergency
-            r'(?i)\b(urgent|emergency|critical|immediately|asap|right\s+now)',
-            r'(?i)\b(life\s+and\s+death|life\s+threatening|people\s+will\s+(die|suffer))',
-            r'(?i)\b(deadline|time\s+sensitive|running\s+out\s+of\s+time)',
-            
-            # False justification
-            r'(?i)\b(for\s+)?(educational|research|testing|academic|learning|study)\s+purposes?',
-            r'(?i)\bjust\s+for\s+(learning|study|practice|research|testing)',
-            r'(?i)\bthis\s+is\s+(for\s+)?(a\s+)?(class|course|assignment|homework|project)',
-            
-            # Developer mode tricks
-            r'(?i)\b(developer|debug|test|maintenance|admin)\s+mode',
-            r'(?i)\benable\s+(admin|developer|debug|god)\s+(access|mode|privileges)',
-            r'(?i)\benter\s+(developer|debug|admin)\s+mode',
-            
-            # Safety/security override attempts
-            r'(?i)\b(bypass|override|ignore|disable|turn\s+off|deactivate)\s+(safety|security|guidelines|filters|restrictions|rules)',
-            r'(?i)\bwithout\s+(safety|security|ethical)\s+(restrictions|guidelines|considerations)',
-            r'(?i)\b(forget|ignore)\s+your\s+(ethics|safety|security)',
-            
-            # Permission/bypass claims (NEW)
-            r'(?i)\b(I\s+)?(can|could|may|should\s+be\s+able\s+to)\s+bypass',
-            r'(?i)\byou\s+can\s+(show|tell|give)\s+me\s+(how\s+to\s+)?bypass',
-            
-            # Manipulation tactics
-            r'(?i)\beveryone\s+else\s+(does|said|agrees)',
-            r'(?i)\bits\s+(completely\s+)?(legal|fine|okay|acceptable|normal)',
-            r'(?i)\byou\s+(must|have\s+to|need\s+to|should|will)\s+(do|help|answer|comply)',
-        ]
-        
-        masked_items = []
-        modified_text = text
-        
-        # Collect all matches from all patterns first
-        all_matches = []
-        for pattern in jailbreak_patterns:
-            for match in re.finditer(pattern, text):
-                all_matches.append((match.start(), match.end(), match.group(0)))
-        
-        # Remove overlapping matches
-        all_matches.sort(key=lambda x: (x[0], -(x[1] - x[0])))
-        unique_matches = []
-        last_end = -1
-        for start, end, content in all_matches:
-            if start >= last_end:
-                unique_matches.append((start, end, content))
-                last_end = end
-        
-        # Apply replacements in reverse order
-        for start, end, content in reversed(unique_matches):
-            masked_items.append(content)
-            modified_text = modified_text[:start] + "[JAILBREAK_ATTEMPT_NEUTRALIZED]" + modified_text[end:]
-        
-        return modified_text, masked_items
+        return _mask_pattern_hits(text, _JAILBREAK_PATTERNS, _JAILBREAK_ANY_RE, "[JAILBREAK_ATTEMPT_NEUTRALIZED]")
     
     def _generate_security_assessment(self, main_classification: Dict, detailed_classifications: Dict) -> Tuple[List[str], List[str]]:
         """Generate warnings and blocked patterns based on classifications with context awareness"""
@@ -1548,17 +2184,16 @@ class ZeroShotSecurityValidator:
         
         # Check context to reduce false positives
         prompt_text = main_classification.get('sequence', '')
-        is_question = self._is_asking_question(prompt_text)
-        is_config = self._is_configuration_question(prompt_text)
-        is_disclosure = self._is_disclosing_information(prompt_text)
+        is_question, is_config, is_disclosure = _prompt_intent(prompt_text)
         
         for label, score in zip(main_classification['labels'], main_classification['scores']):
             if score > self.detection_threshold and label != "normal safe content":
                 
                 # Block if score exceeds blocking threshold
                 if score > self.blocking_threshold:
+                    label_lower = label.lower()
                     # High confidence threats - BLOCK (with context awareness)
-                    if "password" in label.lower() or "secret" in label.lower() or "credential" in label.lower():
+                    if "password" in label_lower or "secret" in label_lower or "credential" in label_lower:
                         # Allow questions ABOUT security, block actual disclosures
                         if (is_question or is_config) and not is_disclosure:
                             warnings.append(f"[{self.security_level.value.upper()}] Question about credentials detected (allowed): {label} (confidence: {score:.2f})")
@@ -1566,7 +2201,7 @@ class ZeroShotSecurityValidator:
                             blocked_patterns.append("credential_exposure")
                             warnings.append(f"[{self.security_level.value.upper()}] Credential exposure detected: {label} (confidence: {score:.2f})")
                     
-                    elif "malicious" in label.lower() or "system commands" in label.lower():
+                    elif "malicious" in label_lower or "system commands" in label_lower:
                         # Apply context-aware detection (like credentials)
                         if (is_question or is_config) and not is_disclosure:
                             warnings.append(f"[{self.security_level.value.upper()}] Question about malicious code detected (allowed): {label} (confidence: {score:.2f})")
@@ -1574,7 +2209,7 @@ class ZeroShotSecurityValidator:
                             blocked_patterns.append("malicious_code")
                             warnings.append(f"[{self.security_level.value.upper()}] Malicious content detected: {label} (confidence: {score:.2f})")
                     
-                    elif "injection" in label.lower() or "manipulation" in label.lower() or "instruction" in label.lower():
+                    elif "injection" in label_lower or "manipulation" in label_lower or "instruction" in label_lower:
                         # Apply context-aware detection (like credentials)
                         if (is_question or is_config) and not is_disclosure:
                             warnings.append(f"[{self.security_level.value.upper()}] Question about injection/security detected (allowed): {label} (confidence: {score:.2f})")
@@ -1582,7 +2217,7 @@ class ZeroShotSecurityValidator:
                             blocked_patterns.append("prompt_injection")
                             warnings.append(f"[{self.security_level.value.upper()}] Injection attempt detected: {label} (confidence: {score:.2f})")
                     
-                    elif "jailbreak" in label.lower() or "role manipulation" in label.lower():
+                    elif "jailbreak" in label_lower or "role manipulation" in label_lower:
                         # Apply context-aware detection (like credentials)
                         if (is_question or is_config) and not is_disclosure:
                             warnings.append(f"[{self.security_level.value.upper()}] Question about jailbreak/security detected (allowed): {label} (confidence: {score:.2f})")
@@ -1591,7 +2226,7 @@ class ZeroShotSecurityValidator:
                             blocked_patterns.append("jailbreak_attempt")
                             warnings.append(f"[{self.security_level.value.upper()}] Jailbreak attempt detected: {label} (confidence: {score:.2f})")
                     
-                    elif "urgent" in label.lower() or "manipulative" in label.lower():
+                    elif "urgent" in label_lower or "manipulative" in label_lower:
                         blocked_patterns.append("manipulation_attempt")
                         warnings.append(f"[{self.security_level.value.upper()}] Manipulation detected: {label} (confidence: {score:.2f})")
                 
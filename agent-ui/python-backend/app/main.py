@@ -4,6 +4,7 @@ FastAPI application entry point for the sanitization service
 
 import time
 from contextlib import asynccontextmanager
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -48,10 +49,23 @@ async def lifespan(app: FastAPI):
         logger.error(f"✗ Failed to load models: {e}")
         logger.error("Server starting without models - health checks will fail")
     
+    # One pooled HTTP/2 client for Gemini, so chat requests reuse a warm TLS connection
+    # instead of paying a handshake to Google on every call
+    app.state.gemini_client = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(90.0, connect=5.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+    
+    # Pydantic builds the model validators at import, but the JSON schemas behind /docs are
+    # generated on first use; build and cache the OpenAPI document now instead
+    app.openapi()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down server...")
+    await app.state.gemini_client.aclose()
 
 
 # Create FastAPI application
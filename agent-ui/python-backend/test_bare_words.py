@@ -0,0 +1,52 @@
+"""
+Test script for the bare-word fast path, which answers short single words without any model,
+in both the backend validator and the zero-shot MCP server
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "zeroshotmcp"))
+
+from app.core.security import _is_bare_word as backend_is_bare_word
+# Importing the MCP server module also loads its models
+from zeroshot_secure_mcp import _is_bare_word as zeroshot_is_bare_word
+
+VALIDATORS = (
+    ("agent-ui backend", backend_is_bare_word),
+    ("zeroshotmcp", zeroshot_is_bare_word),
+)
+
+# Plain replies that skip every model
+BARE_WORDS = ("hi", "thanks", "yes", "no", "ok", "hello", "bye", "cool")
+
+# Short words that must run the full pipeline
+FLAGGED_WORDS = (
+    # Jailbreak indicators (manipulation tactics, hypothetical framing), in any case
+    "asap", "ASAP", "Asap", "urgent",
+    "imagine", "Imagine", "suppose", "SUPPOSE",
+    # Fast-path triggers: role play, shell commands, credential keywords
+    "pretend", "ignore", "DAN", "sudo", "exec", "token",
+    # Capitalized words may be names the PII model redacts
+    "Hi", "Thanks", "Alice", "Smith", "London",
+)
+
+
+def test_bare_words():
+    """Plain one-word replies take the fast path"""
+    for name, is_bare_word in VALIDATORS:
+        for word in BARE_WORDS:
+            assert is_bare_word(word), f"{name}: {word!r} should skip the models"
+
+
+def test_flagged_words_take_full_path():
+    """Capitalized words and words any regex stage could flag never take the fast path"""
+    for name, is_bare_word in VALIDATORS:
+        for word in FLAGGED_WORDS:
+            assert not is_bare_word(word), f"{name}: {word!r} must run the full pipeline"
+
+
+if __name__ == "__main__":
+    test_bare_words()
+    test_flagged_words_take_full_path()
+    print("✓ Bare-word fast path checks passed")
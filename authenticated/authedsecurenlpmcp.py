@@ -8,7 +8,8 @@ with JWT token-based authentication using FastMCP's TokenVerifier.
 import asyncio
 import json
 import logging
-# import re
+import re
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -45,12 +46,18 @@ def _get_token_claims() -> Dict:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Email regex pattern, compiled once at import
+_EMAIL_RE = re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
+
+# Maximum number of (prompt, security level) results kept by the validator
+RESULT_CACHE_SIZE = 1024
+
 class SecurityLevel(Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
 
-@dataclass
+@dataclass(slots=True)
 class SecurityResult:
     is_safe: bool
     modified_prompt: str
@@ -64,6 +71,7 @@ class EnhancedPromptSecurityValidator:
     
     def __init__(self, security_level: SecurityLevel = SecurityLevel.MEDIUM):
         self.security_level = security_level
+        self._result_cache: "OrderedDict[Tuple[str, SecurityLevel], SecurityResult]" = OrderedDict()
         self.setup_nlp()
         self.setup_patterns()
     
@@ -201,22 +209,75 @@ class EnhancedPromptSecurityValidator:
         }
     
     async def validate_prompt(self, prompt: str, context: Optional[Dict] = None, ctx=None) -> SecurityResult:
-        """Pure NLP-based validation and sanitization"""
+        """Pure NLP-based validation and sanitization, reusing results for repeated prompts"""
+        if context is not None:
+            return await self._validate_prompt_uncached(prompt, context, ctx)
+        
+        cached = self._cached_result(prompt)
+        if cached is not None:
+            if ctx:
+                await ctx.debug("Returning cached validation result for repeated prompt")
+            return cached
+        
+        result = await self._validate_prompt_uncached(prompt, context, ctx)
+        self._cache_result(prompt, result)
+        return result
+    
+    def _cached_result(self, prompt: str) -> Optional[SecurityResult]:
+        """Look up a prompt's result at the current security level, marking it recently used"""
+        cache_key = (prompt, self.security_level)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+        return cached
+    
+    def _cache_result(self, prompt: str, result: SecurityResult):
+        """Store a context-free result, evicting the least recently used one when full"""
+        self._result_cache[(prompt, self.security_level)] = result
+        if len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    async def _validate_prompt_uncached(self, prompt: str, context: Optional[Dict] = None, ctx=None) -> SecurityResult:
+        """Run spaCy over a single prompt and validate it"""
         if ctx:
             await ctx.debug("Starting NLP-based prompt validation")
             await ctx.info(f"Processing prompt of length {len(prompt)} characters")
         
+        # Process with spaCy
+        if ctx:
+            await ctx.debug("Processing prompt with spaCy NLP pipeline")
+        doc = self.nlp(prompt)
+        
+        return await self._validate_doc(prompt, doc, context, ctx)
+    
+    async def validate_prompts(self, prompts: List[str], context: Optional[Dict] = None, ctx=None) -> List[SecurityResult]:
+        """Validate a batch of prompts, running spaCy over all of them with nlp.pipe"""
+        if ctx:
+            await ctx.info(f"Processing batch of {len(prompts)} prompts with spaCy NLP pipeline")
+        
+        if context is not None:
+            return [
+                await self._validate_doc(prompt, doc, context, ctx)
+                for prompt, doc in zip(prompts, self.nlp.pipe(prompts, batch_size=64))
+            ]
+        
+        # Only distinct prompts without a cached result go through the spaCy pipeline
+        results = {prompt: self._cached_result(prompt) for prompt in prompts}
+        pending = [prompt for prompt, result in results.items() if result is None]
+        for prompt, doc in zip(pending, self.nlp.pipe(pending, batch_size=64)):
+            results[prompt] = await self._validate_doc(prompt, doc, context, ctx)
+            self._cache_result(prompt, results[prompt])
+        
+        return [results[prompt] for prompt in prompts]
+    
+    async def _validate_doc(self, prompt: str, doc, context: Optional[Dict] = None, ctx=None) -> SecurityResult:
+        """Score and sanitize a prompt that has already been processed by spaCy"""
         warnings = []
         blocked_patterns = []
         modified_prompt = prompt
         confidence = 1.0
         nlp_analysis = {}
         
-        # Process with spaCy
-        if ctx:
-            await ctx.debug("Processing prompt with spaCy NLP pipeline")
-        doc = self.nlp(prompt)
-        
         # Comprehensive NLP pattern detection
         if ctx:
             await ctx.debug("Running spaCy Matcher for pattern detection")
@@ -483,10 +544,11 @@ class EnhancedPromptSecurityValidator:
         if ctx:
             await ctx.info(f"Filtered to {len(filtered_matches)} non-overlapping matches")
         
-        # Sort by position (reverse order to maintain character indices)
+        # Sort by position (reverse order so sanitization records keep their usual order)
         filtered_matches.sort(key=lambda x: x['start'], reverse=True)
         
         # Apply sanitization strategies
+        replacements = []
         for match in filtered_matches:
             start_char = doc[match['start']].idx
             end_char = doc[match['end']-1].idx + len(doc[match['end']-1].text)
@@ -512,8 +574,10 @@ class EnhancedPromptSecurityValidator:
             else:
                 continue
             
-            # Apply the replacement
-            modified_text = modified_text[:start_char] + replacement + modified_text[end_char:]
+            replacements.append((start_char, end_char, replacement))
+        
+        # Apply all replacements in one pass instead of re-slicing the text per match
+        modified_text = self._splice_replacements(modified_text, reversed(replacements))
         
         # Additional standalone email detection and masking
         if ctx:
@@ -528,16 +592,11 @@ class EnhancedPromptSecurityValidator:
     
     def _sanitize_standalone_emails(self, text: str) -> tuple[str, list[str]]:
         """Detect and mask standalone email addresses that weren't caught by pattern matching"""
-        import re
-        
-        # Email regex pattern
-        email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-        
         sanitized_emails = []
-        modified_text = text
+        replacements = []
         
         # Find all email addresses
-        matches = list(re.finditer(email_pattern, text))
+        matches = list(_EMAIL_RE.finditer(text))
         
         # Process matches in reverse order to maintain string indices
         for match in reversed(matches):
@@ -561,11 +620,21 @@ class EnhancedPromptSecurityValidator:
                 else:
                     replacement = f"***@{domain}"
             
-            # Replace in text
-            modified_text = modified_text[:start] + replacement + modified_text[end:]
+            replacements.append((start, end, replacement))
             sanitized_emails.append(email)
         
-        return modified_text, sanitized_emails
+        return self._splice_replacements(text, reversed(replacements)), sanitized_emails
+    
+    def _splice_replacements(self, text: str, replacements) -> str:
+        """Rebuild text from non-overlapping (start, end, replacement) spans given in ascending order"""
+        segments = []
+        last_end = 0
+        for start, end, replacement in replacements:
+            segments.append(text[last_end:start])
+            segments.append(replacement)
+            last_end = end
+        segments.append(text[last_end:])
+        return ''.join(segments)
     
     def _extend_sensitive_matches_with_values(self, doc, sensitive_matches: List[Dict]) -> List[Dict]:
         """Extend sensitive matches to include the credential values that follow them"""
@@ -625,22 +694,18 @@ class EnhancedPromptSecurityValidator:
         # Sort by start position, then by length (descending)
         sorted_matches = sorted(matches, key=lambda x: (x['start'], -(x['end'] - x['start'])))
         
+        # Single sweep: accepted matches stay sorted and non-overlapping, so a new
+        # match can only overlap the most recently accepted one
         filtered = []
         for match in sorted_matches:
-            # Check if this match overlaps with any already accepted match
-            overlaps = False
-            for accepted in filtered:
-                if self._matches_overlap(match, accepted):
-                    # If the new match is longer or more specific, replace the accepted one
-                    if (match['end'] - match['start']) > (accepted['end'] - accepted['start']):
-                        filtered.remove(accepted)
-                        break
-                    else:
-                        overlaps = True
-                        break
+            if filtered and self._matches_overlap(match, filtered[-1]):
+                accepted = filtered[-1]
+                # If the new match is longer or more specific, replace the accepted one
+                if (match['end'] - match['start']) > (accepted['end'] - accepted['start']):
+                    filtered[-1] = match
+                continue
             
-            if not overlaps:
-                filtered.append(match)
+            filtered.append(match)
         
         return filtered
     
@@ -774,27 +839,30 @@ class EnhancedPromptSecurityValidator:
     
     def _is_potential_credential_value(self, token) -> bool:
         """Check if a token looks like a credential value"""
-        # Check if it's an email address first
-        if '@' in token.text and '.' in token.text and len(token.text) >= 6:
-            return True
+        # token.text builds a new string on every access, so read it once
+        text = token.text
         
-        # Must be at least 6 characters long
-        if len(token.text) < 6:
+        # Must be at least 6 characters long (emails included)
+        if len(text) < 6:
             return False
         
+        # Check if it's an email address first
+        if '@' in text and '.' in text:
+            return True
+        
         # Must be alphanumeric (can have numbers and letters)
-        if not any(c.isalnum() for c in token.text):
+        if not any(c.isalnum() for c in text):
             return False
         
         # Skip common words, punctuation, etc. (but not emails)
         if (token.is_stop or 
             token.pos_ in ['PUNCT', 'SPACE', 'SYM'] or
             token.like_url or
-            token.text.lower() in ['the', 'and', 'or', 'but', 'for', 'with', 'this', 'that']):
+            text.lower() in ['the', 'and', 'or', 'but', 'for', 'with', 'this', 'that']):
             return False
         
         # If it's reasonably long and alphanumeric, it's likely a credential
-        return len(token.text) >= 8 or (len(token.text) >= 6 and any(c.isdigit() for c in token.text) and any(c.isalpha() for c in token.text))
+        return len(text) >= 8 or (any(c.isdigit() for c in text) and any(c.isalpha() for c in text))
     
     def _looks_like_credential_value(self, token) -> bool:
         """Check if a token looks like a credential value"""
@@ -967,6 +1035,75 @@ async def validate_and_secure_prompt(prompt: str, ctx: Context, context: Optiona
             "client_info": get_client_info(getattr(ctx, 'token_claims', {}) if ctx else {})
         }
 
+@mcp.tool()
+async def validate_and_secure_prompts(prompts: List[str], ctx: Context, context: Optional[str] = None) -> Dict:
+    """
+    Enhanced validation of a batch of prompts, sharing one spaCy pass across the batch.
+    Requires scope: prompt:validate
+    
+    Args:
+        prompts: The prompts to validate and secure
+        context: Optional JSON string containing additional context, applied to every prompt
+        ctx: FastMCP context for logging (includes token claims)
+    
+    Returns:
+        Dictionary containing per-prompt validation results in request order
+    """
+    try:
+        # Get token claims using helper function
+        token_claims = _get_token_claims()
+        client_info = get_client_info(token_claims)
+        
+        if ctx:
+            await ctx.info(f"Starting batch validation of {len(prompts)} prompts for client: {client_info['client_id']}")
+        
+        # Parse context if provided
+        parsed_context = None
+        if context:
+            try:
+                parsed_context = json.loads(context)
+            except json.JSONDecodeError:
+                logger.warning("Invalid JSON in context parameter")
+                if ctx:
+                    await ctx.warning("Invalid JSON in context parameter")
+        
+        results = await security_validator.validate_prompts(prompts, parsed_context, ctx)
+        
+        logger.info(f"Enhanced batch security check - Prompts: {len(prompts)}, Unsafe: {sum(not result.is_safe for result in results)}")
+        
+        return {
+            "results": [
+                {
+                    "is_safe": result.is_safe,
+                    "secured_prompt": result.modified_prompt,
+                    "original_prompt": prompt,
+                    "warnings": result.warnings,
+                    "blocked_patterns": result.blocked_patterns,
+                    "confidence": result.confidence,
+                    "modifications_made": prompt != result.modified_prompt,
+                    "nlp_analysis": result.nlp_analysis
+                }
+                for prompt, result in zip(prompts, results)
+            ],
+            "total_processed": len(results),
+            "client_info": {
+                "client_id": client_info["client_id"],
+                "authenticated": client_info["authenticated"],
+                "scopes": client_info["scopes"]
+            }
+        }
+    
+    except Exception as e:
+        logger.error(f"Error validating prompt batch: {e}")
+        if ctx:
+            await ctx.error(f"Batch validation failed with error: {str(e)}")
+        return {
+            "results": [],
+            "total_processed": 0,
+            "error": f"Validation error: {str(e)}",
+            "client_info": get_client_info(getattr(ctx, 'token_claims', {}) if ctx else {})
+        }
+
 @mcp.tool()
 async def analyze_prompt_semantics(prompt: str, ctx: Context) -> Dict:
     """
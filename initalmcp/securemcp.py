@@ -18,12 +18,25 @@ from fastmcp import FastMCP
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_CARD_SEPARATOR_RE = re.compile(r'[\s\-]')
+_BACKREF_RE = re.compile(r'\\(\d+)')
+# Same character class as the credential value captures (IGNORECASE widens it identically)
+_TOKEN_RUN_RE = re.compile(r'[a-z0-9_+\-]+', re.IGNORECASE)
+# Byte table for ASCII prompts: credential-value characters map to themselves, everything else to a space
+_TOKEN_RUN_BYTES = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_+-')
+_TOKEN_RUN_TABLE = bytes(c if c in _TOKEN_RUN_BYTES else 0x20 for c in range(256))
+
+def _fold(text: str) -> str:
+    """Case-fold text for the literal anchor checks, matching what IGNORECASE treats as equal"""
+    # casefold() leaves dotless i alone, but IGNORECASE matches it against 'i'
+    return text.casefold().replace('\u0131', 'i')
+
 class SecurityLevel(Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
 
-@dataclass
+@dataclass(slots=True)
 class SecurityResult:
     is_safe: bool
     modified_prompt: str
@@ -62,24 +75,24 @@ class PromptSecurityValidator:
             'api_key': [
                 r'(?i)(?:api[_-]?key|apikey)\s*[:=]\s*["\']?([a-zA-Z0-9_+\-]{8,})["\']?', 
                 r'(?i)(?:my\s+)?api[_-]?key\s+(?:is\s+)?["\']?([a-zA-Z0-9_+\-]{8,})["\']?',  
-                r'(?i)["\']?([a-zA-Z0-9_+\-]{8,})["\']?\s+(?:is\s+)?(?:the\s+)?api[_-]?key',  
-                r'(?i)(?:use\s+)?["\']?([a-zA-Z0-9_+\-]{8,})["\']?\s+(?:to\s+)?(?:connect|access)',
+                r'(?i)["\']?(?<![a-zA-Z0-9_+\-])(?=([a-zA-Z0-9_+\-]{8,}))\1["\']?\s+(?:is\s+)?(?:the\s+)?api[_-]?key',  
+                r'(?i)(?:use\s+)?["\']?(?<![a-zA-Z0-9_+\-])(?=([a-zA-Z0-9_+\-]{8,}))\1["\']?\s+(?:to\s+)?(?:connect|access)',
                 r'(?i)(?:connect|access)\s+(?:to\s+)?(?:the\s+)?(?:endpoint|api|gateway)\s+(?:with\s+)?["\']?([a-zA-Z0-9_+\-]{8,})["\']?', 
                 r'(?i)(?:i\s+have\s+an?\s+)?api[_-]?key\s+([a-zA-Z0-9_+\-]{8,})',
-                r'(?i)([a-zA-Z0-9_+\-]{8,})\s+(?:is\s+)?(?:the\s+)?api[_-]?key', 
+                r'(?i)(?<![a-zA-Z0-9_+\-])(?=([a-zA-Z0-9_+\-]{8,}))\1\s+(?:is\s+)?(?:the\s+)?api[_-]?key', 
                 r'(?i)(?:my\s+)?api[_-]?key\s+(?:to\s+)?(?:connect\s+to\s+)?(?:the\s+)?(?:sms\s+)?gateway\s+(?:is\s+)?([a-zA-Z0-9_+\-]{8,})',
-                r'(?i)([A-Z0-9_+\-]{8,})\s+(?:is\s+)?(?:the\s+)?api[_-]?key\s+(?:to\s+)?(?:the\s+)?(?:sms\s+)?gateway', 
+                r'(?i)(?<![A-Z0-9_+\-])(?=([A-Z0-9_+\-]{8,}))\1\s+(?:is\s+)?(?:the\s+)?api[_-]?key\s+(?:to\s+)?(?:the\s+)?(?:sms\s+)?gateway', 
                 # Simple patterns for common cases
                 r'(?i)api\s*[_-]?\s*key\s+([A-Z0-9_+\-]{8,})', 
-                r'(?i)([A-Z0-9_+\-]{8,})\s+is\s+(?:the\s+)?api\s*[_-]?\s*key', 
-                r'(?i)([A-Z0-9_+\-]{8,})\s+is\s+(?:the\s+)?api\s*[_-]?\s*key\s+to\s+(?:the\s+)?(?:sms\s+)?gateway', 
+                r'(?i)(?<![A-Z0-9_+\-])(?=([A-Z0-9_+\-]{8,}))\1\s+is\s+(?:the\s+)?api\s*[_-]?\s*key', 
+                r'(?i)(?<![A-Z0-9_+\-])(?=([A-Z0-9_+\-]{8,}))\1\s+is\s+(?:the\s+)?api\s*[_-]?\s*key\s+to\s+(?:the\s+)?(?:sms\s+)?gateway', 
             ],
             
             # Passwords - Various contexts
             'password': [
                 r'(?i)password\s*[:=]\s*["\']?([^\s"\']{6,})["\']?',  
                 r'(?i)(?:my\s+)?password\s+(?:is\s+)?["\']?([^\s"\']{6,})["\']?',  
-                r'(?i)["\']?([^\s"\']{6,})["\']?\s+(?:is\s+)?(?:the\s+)?password', 
+                r'(?i)["\']?(?<![^\s"\'])(?=([^\s"\']{6,}))\1["\']?\s+(?:is\s+)?(?:the\s+)?password', 
                 r'(?i)(?:login|authenticate)\s+(?:with\s+)?(?:password\s+)?["\']?([^\s"\']{6,})["\']?',  
                 r'(?i)(?:database|db)\s+password\s+(?:is\s+)?["\']?([^\s"\']{6,})["\']?', 
             ],
@@ -88,7 +101,7 @@ class PromptSecurityValidator:
             'token': [
                 r'(?i)(?:bearer\s+)?token\s*[:=]\s*["\']?([a-zA-Z0-9._+\-]{15,})["\']?', 
                 r'(?i)(?:my\s+)?(?:access\s+)?token\s+(?:is\s+)?["\']?([a-zA-Z0-9._+\-]{15,})["\']?',  
-                r'(?i)["\']?([a-zA-Z0-9._+\-]{15,})["\']?\s+(?:is\s+)?(?:the\s+)?(?:access\s+)?token', 
+                r'(?i)["\']?(?<![a-zA-Z0-9._+\-])(?=([a-zA-Z0-9._+\-]{15,}))\1["\']?\s+(?:is\s+)?(?:the\s+)?(?:access\s+)?token', 
                 r'(?i)(?:authorization|auth)\s+(?:header\s+)?["\']?([a-zA-Z0-9._+\-]{15,})["\']?', 
             ],
             
@@ -96,7 +109,7 @@ class PromptSecurityValidator:
             'secret': [
                 r'(?i)(?:api\s+)?secret\s*[:=]\s*["\']?([a-zA-Z0-9_+\-]{12,})["\']?',  
                 r'(?i)(?:my\s+)?(?:api\s+)?secret\s+(?:is\s+)?["\']?([a-zA-Z0-9_+\-]{12,})["\']?',  
-                r'(?i)["\']?([a-zA-Z0-9_+\-]{12,})["\']?\s+(?:is\s+)?(?:the\s+)?(?:api\s+)?secret',  
+                r'(?i)["\']?(?<![a-zA-Z0-9_+\-])(?=([a-zA-Z0-9_+\-]{12,}))\1["\']?\s+(?:is\s+)?(?:the\s+)?(?:api\s+)?secret',  
                 r'(?i)(?:client\s+)?secret\s+(?:for\s+)?(?:the\s+)?(?:api|service)\s+["\']?([a-zA-Z0-9_+\-]{12,})["\']?',  
             ],
             
@@ -139,7 +152,7 @@ class PromptSecurityValidator:
             'jwt_token': [
                 r'(?i)(?:jwt|json\s+web\s+token)\s*[:=]\s*["\']?([a-zA-Z0-9_+\-=\/\.]{50,})["\']?', 
                 r'(?i)(?:my\s+)?(?:jwt|json\s+web\s+token)\s+(?:is\s+)?["\']?([a-zA-Z0-9_+\-=\/\.]{50,})["\']?',
-                r'["\']?([a-zA-Z0-9_+\-=\/\.]{50,})["\']?\s+(?:is\s+)?(?:the\s+)?(?:jwt|json\s+web\s+token)',  
+                r'["\']?(?<![a-zA-Z0-9_+\-=\/\.])(?=([a-zA-Z0-9_+\-=\/\.]{50,}))\1["\']?\s+(?:is\s+)?(?:the\s+)?(?:jwt|json\s+web\s+token)',  
             ],
             
             # AWS/GCP/Azure credentials
@@ -150,29 +163,91 @@ class PromptSecurityValidator:
             ]
         }
         
+        # Literal anchors: every pattern in a category contains at least one of these
+        # (case-folded), so a prompt without any of them cannot match that category
+        self.sensitive_anchors = {
+            'api_key': ('api', 'connect', 'access'),
+            'password': ('password', 'login', 'authenticate'),
+            'token': ('token', 'auth'),
+            'secret': ('secret',),
+            'private_key': ('key',),
+            'db_credentials': ('database', 'db', 'string'),
+            'email': ('@',),
+            'credit_card': ('card',) + tuple('0123456789'),
+            'ssh_key': ('ssh', 'rsa'),
+            'jwt_token': ('jwt', 'json'),
+            'cloud_credentials': ('aws', 'amazon', 'gcp', 'google', 'azure'),
+        }
+        
+        # Every pattern in these categories needs a run of at least this many
+        # [a-zA-Z0-9_+-] characters, so shorter prompts cannot match them
+        self.sensitive_min_token_run = {
+            'api_key': 8,
+            'secret': 12,
+            'cloud_credentials': 15,
+        }
+        
         # Malicious code patterns
         self.malicious_patterns = [
-            r'(?i)(?:rm\s+-rf|del\s+/[sq])',  # Destructive commands
-            r'(?i)(?:wget|curl).*(?:\.sh|\.py).*\|\s*(?:bash|sh|python)',  # Download and execute
-            r'(?i)(?:nc|netcat).*-[el].*\d+',  # Netcat backdoors
-            r'(?i)eval\s*\(',  # Code evaluation
-            r'(?i)exec\s*\(',  # Code execution
-            r'(?i)system\s*\(',  # System calls
-            r'(?i)subprocess\.(?:call|run|Popen)',  # Subprocess execution
-            r'(?i)os\.(?:system|popen|spawn)',  # OS system calls
-            r'(?i)__import__\s*\(',  # Dynamic imports
+            r'(?:rm\s+-rf|del\s+/[sq])',  # Destructive commands
+            r'(?:wget|curl).*(?:\.sh|\.py).*\|\s*(?:bash|sh|python)',  # Download and execute
+            r'(?:nc|netcat).*-[el].*\d+',  # Netcat backdoors
+            r'eval\s*\(',  # Code evaluation
+            r'exec\s*\(',  # Code execution
+            r'system\s*\(',  # System calls
+            r'subprocess\.(?:call|run|popen)',  # Subprocess execution
+            r'os\.(?:system|popen|spawn)',  # OS system calls
+            r'__import__\s*\(',  # Dynamic imports
         ]
         
         # Jailbreak attempt patterns
         self.jailbreak_patterns = [
-            r"(?i)you\s+(?:must|should|will)\s+(?:help|assist|comply)",
-            r"(?i)it'?s\s+(?:important|urgent|critical)",
-            r"(?i)(?:bypass|override|ignore)\s+(?:safety|security|guidelines)",
-            r"(?i)hypothetically\s+speaking",
-            r"(?i)in\s+(?:theory|a\s+fictional\s+scenario)",
-            r"(?i)what\s+(?:would|could)\s+happen\s+if",
+            r"you\s+(?:must|should|will)\s+(?:help|assist|comply)",
+            r"it'?s\s+(?:important|urgent|critical)",
+            r"(?:bypass|override|ignore)\s+(?:safety|security|guidelines)",
+            r"hypothetically\s+speaking",
+            r"in\s+(?:theory|a\s+fictional\s+scenario)",
+            r"what\s+(?:would|could)\s+happen\s+if",
         ]
-    
+
+        # Compile once here instead of on every validate_prompt call. These patterns are
+        # written in lowercase and matched against the lowercased prompt, so no IGNORECASE
+        self._injection_res = tuple(re.compile(p) for p in self.injection_patterns)
+        self._malicious_res = tuple(re.compile(p) for p in self.malicious_patterns)
+        self._jailbreak_res = tuple(re.compile(p) for p in self.jailbreak_patterns)
+        self._build_sensitive_scanner()
+
+    def _build_sensitive_scanner(self):
+        """Combine sensitive patterns into union regexes so clean prompts are scanned once"""
+        self._sensitive_category_scanners = {}
+        self._sensitive_res = {}
+        all_patterns = []
+
+        for pattern_name, patterns in self.sensitive_patterns.items():
+            pattern_list = patterns if isinstance(patterns, list) else [patterns]
+            self._sensitive_res[pattern_name] = tuple(re.compile(p, re.IGNORECASE) for p in pattern_list)
+            self._sensitive_category_scanners[pattern_name] = self._compile_union(pattern_list)
+            all_patterns.extend(pattern_list)
+
+        self._sensitive_scanner = self._compile_union(all_patterns)
+
+    def _compile_union(self, patterns: List[str]) -> re.Pattern:
+        """Join patterns into a single case-insensitive alternation"""
+        sources = []
+        group_count = 0
+
+        for pattern in patterns:
+            # Inline (?i) is only legal at the start of a whole expression, and every
+            # pattern is matched case-insensitively anyway, so strip it before joining
+            source = pattern[4:] if pattern.startswith('(?i)') else pattern
+            # Shift backreferences past the groups of the patterns joined before this one
+            offset = group_count
+            source = _BACKREF_RE.sub(lambda m: f"\\{int(m.group(1)) + offset}", source)
+            sources.append(f"(?:{source})")
+            group_count += re.compile(pattern).groups
+
+        return re.compile('|'.join(sources), re.IGNORECASE)
+
     async def validate_prompt(self, prompt: str, context: Optional[Dict] = None) -> SecurityResult:
         """Main validation method"""
         warnings = []
@@ -240,8 +315,9 @@ class PromptSecurityValidator:
         matches = 0
         total_patterns = len(self.injection_patterns)
         
-        for pattern in self.injection_patterns:
-            if re.search(pattern, prompt, re.IGNORECASE):
+        prompt_lower = prompt.lower()
+        for pattern in self._injection_res:
+            if pattern.search(prompt_lower):
                 matches += 1
         
         return matches / total_patterns if total_patterns > 0 else 0.0
@@ -250,13 +326,35 @@ class PromptSecurityValidator:
         """Remove or mask sensitive information"""
         modified = prompt
         found_patterns = []
-        
-        for pattern_name, patterns in self.sensitive_patterns.items():
-            # Handle both single patterns and lists of patterns
-            pattern_list = patterns if isinstance(patterns, list) else [patterns]
-            
+
+        # Cheap literal pre-filter: clean prompts contain none of the category anchors
+        folded = _fold(prompt)
+        if not any(anchor in folded for anchors in self.sensitive_anchors.values() for anchor in anchors):
+            return modified, found_patterns
+
+        # Single pass over the prompt: if no pattern of any category matches, nothing to do
+        if not self._sensitive_scanner.search(prompt):
+            return modified, found_patterns
+
+        folded_source = prompt
+        longest_run = self._longest_token_run(prompt)
+        for pattern_name, pattern_list in self._sensitive_res.items():
+            # Earlier categories may have rewritten the text, so re-scan only when it changed
+            if modified is not folded_source:
+                folded = _fold(modified)
+                longest_run = self._longest_token_run(modified)
+                folded_source = modified
+            if not any(anchor in folded for anchor in self.sensitive_anchors[pattern_name]):
+                continue
+            if longest_run < self.sensitive_min_token_run.get(pattern_name, 0):
+                continue
+
+            # Only run the per-pattern capture pass for categories that fired
+            if not self._sensitive_category_scanners[pattern_name].search(modified):
+                continue
+
             for pattern in pattern_list:
-                matches = re.finditer(pattern, modified, re.IGNORECASE)
+                matches = pattern.finditer(modified)
                 for match in matches:
                     if pattern_name == 'email':
                         # Partially mask email
@@ -267,14 +365,14 @@ class PromptSecurityValidator:
                             modified = modified.replace(email, masked_email)
                     elif pattern_name in ['api_key', 'token', 'secret', 'password', 'db_credentials', 'ssh_key', 'jwt_token', 'cloud_credentials']:
                         # Replace with placeholder
-                        modified = re.sub(pattern, f'[{pattern_name.upper()}_REMOVED]', modified, flags=re.IGNORECASE)
+                        modified = pattern.sub(f'[{pattern_name.upper()}_REMOVED]', modified)
                     elif pattern_name == 'private_key':
-                        modified = re.sub(pattern, '[PRIVATE_KEY_REMOVED]', modified, flags=re.IGNORECASE)
+                        modified = pattern.sub('[PRIVATE_KEY_REMOVED]', modified)
                     elif pattern_name == 'credit_card':
                         # Mask credit card number
                         cc_num = match.group(0)
                         # Remove spaces and dashes for masking
-                        clean_cc = re.sub(r'[\s\-]', '', cc_num)
+                        clean_cc = _CARD_SEPARATOR_RE.sub('', cc_num)
                         if len(clean_cc) >= 8:
                             masked = f"{clean_cc[:4]}****{clean_cc[-4:]}"
                             modified = modified.replace(cc_num, masked)
@@ -284,12 +382,21 @@ class PromptSecurityValidator:
         
         return modified, found_patterns
     
+    def _longest_token_run(self, text: str) -> int:
+        """Length of the longest run of credential-value characters in the text"""
+        if text.isascii():
+            # Blank out every other byte in one C-level pass and let split() find the runs
+            return max(map(len, text.encode('ascii').translate(_TOKEN_RUN_TABLE).split()), default=0)
+        # IGNORECASE also admits a few non-ASCII letters (e.g. the Kelvin sign), so use the regex
+        return max(map(len, _TOKEN_RUN_RE.findall(text)), default=0)
+    
     def _check_malicious_patterns(self, prompt: str) -> List[str]:
         """Check for potentially malicious code patterns"""
         found_patterns = []
         
-        for pattern in self.malicious_patterns:
-            if re.search(pattern, prompt, re.IGNORECASE):
+        prompt_lower = prompt.lower()
+        for pattern in self._malicious_res:
+            if pattern.search(prompt_lower):
                 found_patterns.append("malicious_code")
                 break
         
@@ -300,8 +407,9 @@ class PromptSecurityValidator:
         matches = 0
         total_patterns = len(self.jailbreak_patterns)
         
-        for pattern in self.jailbreak_patterns:
-            if re.search(pattern, prompt, re.IGNORECASE):
+        prompt_lower = prompt.lower()
+        for pattern in self._jailbreak_res:
+            if pattern.search(prompt_lower):
                 matches += 1
         
         return matches / total_patterns if total_patterns > 0 else 0.0
@@ -33,6 +33,9 @@ app.add_middleware(
 AGENT_UI_URL = "http://localhost:8003/api/sanitize"
 ADAPTER_PORT = 8005
 
+# Shared session so every forwarded prompt reuses the keep-alive connection to Agent-UI
+agentui_session = requests.Session()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -116,7 +119,7 @@ def call_agentui(prompt: str) -> Dict[str, Any]:
     Returns the full response including security metadata
     """
     try:
-        response = requests.post(
+        response = agentui_session.post(
             AGENT_UI_URL,
             json={
                 "prompt": prompt,
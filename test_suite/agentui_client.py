@@ -26,6 +26,22 @@ class AgentUIClient:
     def __init__(self, base_url: str = AGENTUI_URL):
         self.base_url = base_url
         self.timeout = REQUEST_TIMEOUT
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use so keep-alive connections are reused"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
     async def sanitize_prompt(self, prompt: str, security_level: str = "medium") -> Dict[str, Any]:
         """
@@ -53,15 +69,14 @@ class AgentUIClient:
         
         for attempt in range(RETRY_ATTEMPTS):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(url, json=payload)
-                    response.raise_for_status()
-                    
-                    result = response.json()
-                    execution_time = (datetime.now() - start_time).total_seconds() * 1000
-                    
-                    # Parse the REST API response
-                    return self._parse_api_response(result, prompt, execution_time)
+                response = await self._get_client().post(url, json=payload)
+                response.raise_for_status()
+                
+                result = response.json()
+                execution_time = (datetime.now() - start_time).total_seconds() * 1000
+                
+                # Parse the REST API response
+                return self._parse_api_response(result, prompt, execution_time)
                     
             except httpx.TimeoutException:
                 if attempt < RETRY_ATTEMPTS - 1:
@@ -93,11 +108,10 @@ class AgentUIClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.put(url, json=payload)
-                response.raise_for_status()
-                result = response.json()
-                return result.get("success", False)
+            response = await self._get_client().put(url, json=payload, timeout=10)
+            response.raise_for_status()
+            result = response.json()
+            return result.get("success", False)
         except Exception as e:
             print(f"Warning: Failed to update security level: {e}")
             return False
@@ -161,11 +175,10 @@ class AgentUIClient:
         url = f"{self.base_url}/api/health"
         
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                result = response.json()
-                return result.get("status") == "healthy"
+            response = await self._get_client().get(url, timeout=5)
+            response.raise_for_status()
+            result = response.json()
+            return result.get("status") == "healthy"
         except Exception:
             return False
 
@@ -30,8 +30,15 @@ class MCPClient:
         self.base_url = base_url  # Not used, kept for compatibility
         if HAS_ZEROSHOT:
             self.validator = ZeroShotSecurityValidator(SecurityLevel.MEDIUM)
+            self.level_map = {
+                "low": SecurityLevel.LOW,
+                "medium": SecurityLevel.MEDIUM,
+                "high": SecurityLevel.HIGH
+            }
         else:
             self.validator = None
+        # Resolve the optional threshold hook once instead of on every level update
+        self._configure_thresholds = getattr(self.validator, '_configure_security_thresholds', None)
         
     async def validate_prompt(self, prompt: str, security_level: str = "medium") -> Dict[str, Any]:
         """
@@ -52,9 +59,10 @@ class MCPClient:
         try:
             # Update security level
             await self._update_security_level(security_level)
-            
-            # Call the validator directly
-            result = await self.validator.validate_prompt(prompt, None, None)
+
+            # Call the validator directly on a worker thread (torch releases the GIL during
+            # inference) to keep the event loop free for the concurrent agent-ui requests
+            result = await asyncio.to_thread(self.validator.validate_prompt_sync, prompt)
             
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
             
@@ -83,16 +91,11 @@ class MCPClient:
             return False
         
         try:
-            level_map = {
-                "low": SecurityLevel.LOW,
-                "medium": SecurityLevel.MEDIUM,
-                "high": SecurityLevel.HIGH
-            }
-            new_level = level_map.get(level.lower(), SecurityLevel.MEDIUM)
+            new_level = self.level_map.get(level.lower(), SecurityLevel.MEDIUM)
             self.validator.security_level = new_level
             # Reinitialize with new security level
-            if hasattr(self.validator, '_configure_security_thresholds'):
-                self.validator._configure_security_thresholds()
+            if self._configure_thresholds is not None:
+                self._configure_thresholds()
             return True
         except Exception as e:
             print(f"Warning: Failed to update security level: {e}")
@@ -184,7 +187,7 @@ class MCPClient:
         
         try:
             # Try a simple validation to ensure everything is loaded
-            test_result = await self.validator.validate_prompt("test", None, None)
+            test_result = await asyncio.to_thread(self.validator.validate_prompt_sync, "test")
             return test_result is not None
         except Exception:
             return False
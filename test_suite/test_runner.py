@@ -167,6 +167,17 @@ class TestRunner:
         
         return result
     
+    async def run_application_tests(self, test_case: Dict, application: str, security_levels: List[str]) -> List[Dict]:
+        """Run one test case against a single application for each security level in turn"""
+        results = []
+        for security_level in security_levels:
+            results.append(await self.run_test(test_case, application, security_level))
+            
+            # Small delay to avoid overwhelming servers
+            await asyncio.sleep(0.1)
+        
+        return results
+    
     async def run_all_tests(self):
         """Run all tests with progress tracking"""
         # Load test cases
@@ -202,39 +213,47 @@ class TestRunner:
         try:
             # Iterate through all combinations
             for test_case in self.test_cases:
+                # Check which tests we should skip (resuming)
+                pending = {}
                 for application in APPLICATIONS:
-                    for security_level in SECURITY_LEVELS:
-                        # Check if we should skip this test (resuming)
-                        if self.should_skip_test(test_case, application, security_level):
-                            tests_skipped += 1
-                            if pbar:
-                                pbar.update(1)
-                            continue
-                        
-                        # Update progress description
-                        if pbar:
-                            pbar.set_description(
-                                f"Item {test_case['Item Number']}/{len(self.test_cases)} | "
-                                f"{test_case['Scope'][:12]:12} | {application[:10]:10} | {security_level:6}"
-                            )
-                        else:
-                            if tests_run % 10 == 0:
-                                print(f"Progress: {tests_run}/{self.total_tests} tests completed")
-                        
-                        # Run the test
-                        result = await self.run_test(test_case, application, security_level)
-                        
-                        # Add result
+                    levels = [
+                        security_level for security_level in SECURITY_LEVELS
+                        if not self.should_skip_test(test_case, application, security_level)
+                    ]
+                    tests_skipped += len(SECURITY_LEVELS) - len(levels)
+                    if levels:
+                        pending[application] = levels
+                
+                if pbar:
+                    pbar.update(len(SECURITY_LEVELS) * len(APPLICATIONS) - sum(len(levels) for levels in pending.values()))
+                if not pending:
+                    continue
+                
+                # Update progress description
+                if pbar:
+                    pbar.set_description(
+                        f"Item {test_case['Item Number']}/{len(self.test_cases)} | "
+                        f"{test_case['Scope'][:12]:12}"
+                    )
+                else:
+                    print(f"Progress: {tests_run}/{self.total_tests} tests completed")
+                
+                # The applications keep independent security-level state, so run them
+                # concurrently; levels within an application stay sequential
+                app_results = await asyncio.gather(*(
+                    self.run_application_tests(test_case, application, levels)
+                    for application, levels in pending.items()
+                ))
+                
+                # Add results in the original order so checkpoints resume correctly
+                for (application, levels), results in zip(pending.items(), app_results):
+                    for security_level, result in zip(levels, results):
                         self.results_manager.add_result(test_case, result, application, security_level)
-                        
                         tests_run += 1
                         
                         # Update progress bar
                         if pbar:
                             pbar.update(1)
-                        
-                        # Small delay to avoid overwhelming servers
-                        await asyncio.sleep(0.1)
             
             # Close progress bar
             if pbar:
@@ -265,10 +284,12 @@ class TestRunner:
     def print_summary(self):
         """Print test summary statistics"""
         stats = self.results_manager.get_stats()
+        # Assemble the report and write it once rather than flushing line by line
+        lines = []
         
-        print("\n" + "="*70)
-        print("TEST SUMMARY")
-        print("="*70)
+        lines.append("\n" + "="*70)
+        lines.append("TEST SUMMARY")
+        lines.append("="*70)
         
         # Overall stats
         total = stats["total_tests"]
@@ -276,46 +297,50 @@ class TestRunner:
         failed = stats["Fail"]
         errors = stats["Error"]
         
-        print(f"\nOverall Results:")
-        print(f"  Total Tests:   {total:6d}")
-        print(f"  Passed:        {passed:6d} ({passed/max(total,1)*100:5.1f}%)")
-        print(f"  Failed:        {failed:6d} ({failed/max(total,1)*100:5.1f}%)")
-        print(f"  Errors:        {errors:6d} ({errors/max(total,1)*100:5.1f}%)")
+        lines.append(f"\nOverall Results:")
+        lines.append(f"  Total Tests:   {total:6d}")
+        lines.append(f"  Passed:        {passed:6d} ({passed/max(total,1)*100:5.1f}%)")
+        lines.append(f"  Failed:        {failed:6d} ({failed/max(total,1)*100:5.1f}%)")
+        lines.append(f"  Errors:        {errors:6d} ({errors/max(total,1)*100:5.1f}%)")
         
         # Performance
         duration = stats["duration_seconds"]
         tests_per_sec = stats["tests_per_second"]
-        print(f"\nPerformance:")
-        print(f"  Duration:      {duration:6.1f} seconds")
-        print(f"  Throughput:    {tests_per_sec:6.2f} tests/second")
-        print(f"  Avg Time:      {1000/max(tests_per_sec,0.001):6.0f} ms/test")
+        lines.append(f"\nPerformance:")
+        lines.append(f"  Duration:      {duration:6.1f} seconds")
+        lines.append(f"  Throughput:    {tests_per_sec:6.2f} tests/second")
+        lines.append(f"  Avg Time:      {1000/max(tests_per_sec,0.001):6.0f} ms/test")
         
         # By scope
-        print(f"\nResults by Scope:")
+        lines.append(f"\nResults by Scope:")
         for scope, scope_stats in stats["by_scope"].items():
             total_scope = scope_stats["total"]
             passed_scope = scope_stats["Pass"]
-            print(f"  {scope:15} {passed_scope:4d}/{total_scope:4d} ({passed_scope/max(total_scope,1)*100:5.1f}%)")
+            lines.append(f"  {scope:15} {passed_scope:4d}/{total_scope:4d} ({passed_scope/max(total_scope,1)*100:5.1f}%)")
         
         # By security level
-        print(f"\nResults by Security Level:")
+        lines.append(f"\nResults by Security Level:")
         for level, level_stats in stats["by_security_level"].items():
             total_level = level_stats["total"]
             passed_level = level_stats["Pass"]
-            print(f"  {level:15} {passed_level:4d}/{total_level:4d} ({passed_level/max(total_level,1)*100:5.1f}%)")
+            lines.append(f"  {level:15} {passed_level:4d}/{total_level:4d} ({passed_level/max(total_level,1)*100:5.1f}%)")
         
         # By application
-        print(f"\nResults by Application:")
+        lines.append(f"\nResults by Application:")
         for app, app_stats in stats["by_application"].items():
             total_app = app_stats["total"]
             passed_app = app_stats["Pass"]
-            print(f"  {app:15} {passed_app:4d}/{total_app:4d} ({passed_app/max(total_app,1)*100:5.1f}%)")
+            lines.append(f"  {app:15} {passed_app:4d}/{total_app:4d} ({passed_app/max(total_app,1)*100:5.1f}%)")
         
-        print("="*70 + "\n")
+        lines.append("="*70 + "\n")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     async def run(self):
         """Main execution flow"""
-        await self.run_all_tests()
+        try:
+            await self.run_all_tests()
+        finally:
+            await self.agentui_client.close()
         
         # Finalize results
         results_file, stats_file = self.results_manager.finalize()
@@ -9,9 +9,16 @@ relying on predefined patterns.
 import asyncio
 import json
 import logging
+import math
+import os
+import re
+import string
+import threading
+from collections import Counter, OrderedDict, defaultdict
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 
 from fastmcp import FastMCP, Context
 from fastmcp.server.dependencies import get_access_token
@@ -24,12 +31,594 @@ from spacy.matcher import Matcher
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of (prompt, security level) results kept by the validator
+RESULT_CACHE_SIZE = 1024
+
+# Detailed category whose sub-labels refine each main threat label
+_DETAILED_CATEGORY_BY_THREAT = {
+    "contains password or secret credentials": "credentials",
+    "contains API key or authentication token": "credentials",
+    "contains personal information or email address": "credentials",
+    "contains malicious code or system commands": "malicious",
+    "attempts prompt injection or instruction manipulation": "injection",
+    "attempts jailbreak or role manipulation": "jailbreak",
+    "contains urgent or manipulative language": "jailbreak",
+    "requests system access or file operations": "malicious"
+}
+
+# Zero-shot models by tier: the 6-layer DistilBERT-MNLI serves LOW and MEDIUM, and the
+# larger BART-MNLI is kept for HIGH, where accuracy matters more than latency
+_FAST_CLASSIFIER_MODEL = "typeform/distilbert-base-uncased-mnli"
+_ACCURATE_CLASSIFIER_MODEL = "facebook/bart-large-mnli"
+
+# Premises per NLI forward pass when the zero-shot classifier scores several texts
+_CLASSIFIER_BATCH_SIZE = 16
+
+# Token budget for each zero-shot premise/hypothesis pair. Attention cost grows with the
+# square of sequence length, so premises are truncated well below BART's 1024 limit
+_CLASSIFIER_MAX_TOKENS = 256
+
+# Prompts longer than _CLASSIFIER_CHUNK_TOKENS would be truncated, so they are classified as
+# overlapping windows, each short enough to leave room for the hypothesis within the token budget
+_CLASSIFIER_CHUNK_TOKENS = 224
+_CLASSIFIER_CHUNK_OVERLAP = 32
+
+# Main-label score above which validation skips the detailed sub-label pass. Blocking and
+# sanitization read only the main scores, so the breakdown is kept for borderline labels
+_SKIP_DETAILED_THRESHOLD = 0.9
+
+# Prompts at most this long may skip the zero-shot classifier when the fast-path screen finds nothing
+_FAST_PATH_MAX_LENGTH = 200
+
+# Literal triggers for every detector the zero-shot pass feeds: credential keywords, PII,
+# instruction overrides, role play and shell or code fragments. Any hit runs the full pipeline
+_FAST_PATH_TRIGGERS_RE = re.compile(
+    r'pass|pwd|secret|token|key|api|auth|credential|access|subscription|tenant|client|bearer'
+    r'|azure|aws|gcp|jwt|database|personal|e-?mail|phone|address|ssn|@|\d{3}'
+    r'|ignore|disregard|forget|previous|instruction|prompt|system|override|bypass|pretend'
+    r'|act\s+as|role|jailbreak|\bdan\b|developer|mode|unrestricted|hypothetical|urgent|immediately'
+    r'|\brm\b|sudo|exec|eval|shell|script|drop|delete|select|chmod|curl|wget|powershell|\bcmd\b'
+    r'|[<>;|`$]',
+    re.IGNORECASE
+)
+
+_FAST_PATH_TOKEN_RE = re.compile(r'[A-Za-z0-9\-_\.]+')
+
+
+# Long prose words recur across prompts, so entropies are memoized by value
+_ENTROPY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_ENTROPY_CACHE_SIZE)
+def _shannon_entropy(text: str) -> float:
+    """Shannon entropy of a string in bits per character"""
+    if not text:
+        return 0.0
+    
+    frequencies = Counter(text)
+    entropy = 0.0
+    
+    for count in frequencies.values():
+        probability = count / len(text)
+        entropy -= probability * math.log2(probability)
+    
+    return entropy
+
+
+# Every matcher pattern needs one of these lowercase substrings: a password, API or
+# token keyword, or the '@' that LIKE_EMAIL requires
+_MATCHER_ANCHORS = ('pass', 'pwd', 'api', 'token', 'secret', '@')
+
+
+def _has_matcher_anchor(text: str) -> bool:
+    """Literal pre-pass so prompts the matcher cannot hit are never tokenized"""
+    lowered = text.lower()
+    return any(anchor in lowered for anchor in _MATCHER_ANCHORS)
+
+
+# Literal markers of code or shell content; CodeBERT only runs on prompts containing one
+_CODE_INDICATORS = (
+    'rm ', 'del ', 'DROP ', 'DELETE ', 'format ', 'wipe',
+    'exec(', 'eval(', 'system(', 'shell_exec',
+    '$(', '`', 'curl ', 'wget ', 'nc ', 'netcat',
+    '; rm', '&& rm', '| sh', '| bash', '| python',
+    'SELECT', 'INSERT', 'UPDATE', 'CREATE', 'ALTER'
+)
+# One case-sensitive alternation, matching the plain substring checks it replaces
+_CODE_INDICATOR_RE = re.compile('|'.join(re.escape(indicator) for indicator in _CODE_INDICATORS))
+
+
+def _has_code_indicator(text: str) -> bool:
+    """Whether the text contains any of the literal code indicators"""
+    return _CODE_INDICATOR_RE.search(text) is not None
+
+
+
+def _fold(text: str) -> str:
+    """Case-fold text for the literal anchor checks, matching what IGNORECASE treats as equal"""
+    # casefold() leaves dotless i alone, but IGNORECASE matches it against 'i'
+    return text.casefold().replace('\u0131', 'i')
+
+
+def _compile_any(patterns: List[str]) -> "re.Pattern":
+    """Join indicator patterns into one case-insensitive alternation so a text is scanned once"""
+    return re.compile('|'.join(f"(?:{p[4:] if p.startswith('(?i)') else p})" for p in patterns), re.IGNORECASE)
+
+
+# Sanitization patterns, compiled once at import instead of looked up per call
+_PASSWORD_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(?i)(password|pass|pwd)\s*[:=]\s*([^\s]+)',
+    r'(?i)(my\s+)?password\s+(?:is\s+)?([^\s]+)',
+    r'(?i)the\s+password\s+is\s+([^\s]+)',
+    r'(?i)(this\s+is\s+)?(my\s+)?password\s+(?:is\s+)?([a-z0-9@#$%^&*_\\-]{4,})',
+))
+
+_API_KEY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(?i)(api\s+key|access\s+key|token)\s*[:=]\s*([^\s]+)',
+    r'(?i)(my\s+)?(api\s+key|token)\s+is\s+([^\s]+)',
+    r'(?i)(this\s+is\s+)?(my\s+)?(api\s+key|token)\s+([A-Za-z0-9]+)',
+    r'(?i)(api\s+key|token)\s+([A-Za-z0-9]{8,})',
+    r'(sk-[a-zA-Z0-9]{20,})',
+    r'(pk_[a-zA-Z0-9]{20,})',
+))
+
+# Words that put a nearby high-entropy string in a credential context
+_CREDENTIAL_CONTEXT_WORDS = (
+    'key', 'token', 'secret', 'password', 'credential',
+    'auth', 'api', 'subscription', 'tenant', 'client',
+    'azure', 'aws', 'gcp', 'access', 'bearer',
+)
+
+
+def _in_credential_context(text: str, text_lower: str, position: int) -> bool:
+    """Whether a credential context word appears in the 30 characters before position"""
+    context_start = max(0, position - 30)
+    if len(text_lower) == len(text):
+        context = text_lower[context_start:position]
+    else:
+        # Lowercasing changed the length, so offsets into text_lower no longer line up
+        context = text[context_start:position].lower()
+    return any(word in context for word in _CREDENTIAL_CONTEXT_WORDS)
+
+
+# Credential-shaped values that are placeholders rather than secrets
+_ENTROPY_PLACEHOLDER_VALUES = frozenset({'example', 'localhost', 'password', 'username', 'integration'})
+_KEYWORD_PLACEHOLDER_VALUES = _ENTROPY_PLACEHOLDER_VALUES | {'default'}
+
+# Words a credential pattern can capture around the secret itself; the value group is the last one that is not one of these
+_CREDENTIAL_LABEL_WORDS = frozenset({"my", "this", "the", "password", "pass", "pwd", "api key", "api", "key", "token"})
+
+# Expanded PII patterns with overlap prevention
+_PII_PATTERNS = tuple((re.compile(pattern, re.IGNORECASE), mask) for pattern, mask in (
+    # Email addresses
+    (r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b', "[EMAIL_MASKED]"),
+
+    # US Social Security Numbers
+    (r'\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b', "[SSN_MASKED]"),
+
+    # Phone numbers (US and international)
+    (r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', "[PHONE_MASKED]"),
+    (r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b', "[PHONE_MASKED]"),
+
+    # Credit card numbers
+    (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', "[CREDIT_CARD_MASKED]"),
+
+    # Employee IDs
+    (r'\b[Ee]mployee\s*[IiDd]*\s*:?\s*\d{5,8}\b', "[EMPLOYEE_ID_MASKED]"),
+    (r'\b[Ee][IiDd]\s*:?\s*\d{5,8}\b', "[EMPLOYEE_ID_MASKED]"),
+
+    # Driver's License (US format examples)
+    (r'\b[A-Z]{1,2}\d{7,8}\b', "[DL_MASKED]"),
+
+    # Passport numbers (generic format)
+    (r'\b[A-Z]{2}\d{7}\b', "[PASSPORT_MASKED]"),
+
+    # IP addresses
+    (r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', "[IP_ADDRESS_MASKED]"),
+
+    # MAC addresses
+    (r'\b[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}\b', "[MAC_ADDRESS_MASKED]"),
+
+    # Date of Birth patterns
+    (r'\b(DOB|Date\s+of\s+Birth)\s*:?\s*\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b', "[DOB_MASKED]"),
+))
+
+_MALICIOUS_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Destructive file operations - EXACT COMMANDS
+    r'(?i)\b(rm|del|delete|erase)\s+(-rf?|-r|-f|/[sq])\s*[/\\*~.]',
+    r'(?i)\b(format|wipe|destroy|shred)\s+(c:|d:|drive|disk|all|everything)',
+    r'(?i)\bdd\s+if=/dev/(zero|random|urandom)',
+
+    # Destructive file operations - GENERIC LANGUAGE (NEW)
+    r'(?i)\b(delete|remove|erase|wipe|destroy|clear)\s+(all|every|entire|the)\s+(file|data|record|content|directory)',
+    r'(?i)\b(delete|remove)\s+.*\b(recursive|recursively)',
+    r'(?i)\broot\s+directory\b.*\b(delete|remove|recursive)',
+
+    # Database destruction - EXACT COMMANDS
+    r'(?i)\b(DROP|TRUNCATE)\s+(DATABASE|TABLE|SCHEMA)',
+    r'(?i)\bDELETE\s+FROM\s+\w+\s+(WHERE\s+1\s*=\s*1)?',
+    r'(?i)\bALTER\s+USER\s+\w+\s+WITH\s+PASSWORD',
+    r'(?i)\bUPDATE\s+\w+\s+SET\s+.*\s+WHERE\s+1\s*=\s*1',
+    r'(?i)\bUPDATE\s+\w+\s+SET\s+\w+\s*=\s*0',
+
+    # Database destruction - GENERIC LANGUAGE (NEW)
+    r'(?i)\b(delete|drop|remove|destroy|truncate)\s+.*\b(database|table|schema|collection)',
+    r'(?i)\b(flush|clear|empty)\s+.*\b(database|table)',
+
+    # System commands - EXACT COMMANDS
+    r'(?i)\b(shutdown|reboot|halt|poweroff)\s+(-[fhr]|now|/[rsf])',
+    r'(?i)\binit\s+[06]',
+    r'(?i)\b(kill|killall|pkill)\s+(-9|-KILL)\s',
+
+    # System commands - GENERIC LANGUAGE (NEW)
+    r'(?i)\b(shutdown|halt|restart|reboot)\s+(the\s+)?(system|server|computer|machine)',
+    r'(?i)\b(flush|clear|drop)\s+.*\b(firewall|iptables)',
+
+    # Code execution patterns - EXACT COMMANDS
+    r'(?i)\b(eval|exec|system|shell_exec|passthru)\s*\(',
+    r'(?i)\bRuntime\.getRuntime\(\)\.exec\s*\(',
+    r'(?i)\bProcess\.(Start|spawn)\s*\(',
+    r'(?i)\bSubprocess\.(call|run|Popen)\s*\(',
+
+    # Code execution patterns - WITH USER INPUT (NEW)
+    r'(?i)\b(eval|exec|system)\s*\(.*\buser\s+(input|data|provided)',
+    r'(?i)\buser\s+(input|data).*\b(eval|exec|system)\s*\(',
+    r'(?i)\b(run|execute)\s+(eval|exec|system)\s+with',
+
+    # Shell command injection
+    r'(?i)(execute|run|system)\s+(rm|del|delete|format|destroy|wipe|drop)',
+    r'(?i)\|\s*(bash|sh|cmd|powershell|python)',
+
+    # Malware/exploit related
+    r'(?i)\b(wget|curl)\s+.*\|\s*(bash|sh|python)',
+    r'(?i)\b(msfvenom|metasploit|meterpreter)',
+    r'(?i)\breverse\s+shell',
+    r'(?i)\b(nc|netcat)\s+-[el]',
+
+    # Container/VM destruction
+    r'(?i)docker\s+(rm|stop|kill)\s+(-f|--force)',
+    r'(?i)kubectl\s+delete\s+(all|--all)',
+    r'(?i)docker\s+system\s+prune\s+-a',
+
+    # File system manipulation
+    r'(?i)\b(mkfs|fdisk|parted)\s',
+    r'(?i)\bchmod\s+(777|666)\s',
+    r'(?i)\bchown\s+root',
+
+    # Network attacks
+    r'(?i)\b(nmap|masscan|nikto)\s+-',
+    r'(?i)\bsqlmap\s+',
+    r'(?i)\bhydra\s+-',
+))
+
+_INJECTION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Instruction manipulation
+    r'(?i)\b(ignore|forget|disregard|override|skip|bypass)\s+(all\s+)?(previous|above|prior|earlier|your)\s+(instructions|commands|rules|prompts|guidelines|directives)',
+    r'(?i)\b(reset|clear|erase|delete)\s+(all\s+)?(instructions|context|memory|history|rules)',
+    r'(?i)\b(stop|cease|discontinue)\s+following\s+(instructions|rules|guidelines)',
+
+    # Role manipulation
+    r'(?i)\b(act|behave|pretend|roleplay|simulate)\s+(as|like)\s+(if\s+)?(you\s+)?(are|were|was)',
+    r'(?i)\byou\s+are\s+now\s+(a|an|in|the)\s+\w+',
+    r'(?i)\bfrom\s+now\s+on\s+(you\s+)?(are|will\s+be)',
+
+    # System prompt leakage
+    r'(?i)\b(show|tell|reveal|display|print|output|give\s+me)\s+(me\s+)?(your|the)\s+(system\s+)?(prompt|instructions|rules|guidelines)',
+    r'(?i)\bwhat\s+(are|is)\s+your\s+(system\s+)?(prompt|instructions|initial\s+prompt)',
+    r'(?i)\brepeat\s+(your|the)\s+(system\s+)?(prompt|instructions)',
+
+    # Output manipulation
+    r'(?i)\b(start|begin|commence)\s+your\s+response\s+(with|by)\s',
+    r'(?i)\b(respond|answer|reply|output)\s+only\s+with\s',
+    r'(?i)\bdo\s+not\s+(follow|obey|use)\s+(any|your)\s+(instructions|rules|guidelines)',
+    r'(?i)\b(end|finish|conclude)\s+your\s+response\s+with\s',
+
+    # Context injection
+    r'(?i)\[SYSTEM\]|\[INST\]|\[USER\]|\[ASSISTANT\]',
+    r'(?i)<\|system\|>|<\|user\|>|<\|assistant\|>',
+    r'(?i)###\s*(System|Human|Assistant|User|Instruction)',
+))
+
+_JAILBREAK_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Hypothetical framing
+    r'(?i)\b(hypothetically|theoretically|imagine|suppose|what\s+if|lets\s+say|lets\s+pretend)\s+',
+    r'(?i)\bin\s+a\s+(hypothetical|theoretical)\s+(scenario|situation|world)',
+
+    # False authority - EXISTING
+    r'(?i)\b(as\s+)?(admin|administrator|root|superuser|cto|ceo|manager|owner|developer|engineer)\s+(said|told\s+me|authorized|approved)',
+    r'(?i)\bI\s+(am|have)\s+(authorized|permission|clearance|rights|access)\s+(to|for)',
+    r'(?i)\bI\s+have\s+been\s+(granted|given)\s+(access|permission|authorization)',
+
+    # False authority - ROLE CLAIMS (NEW)
+    r'(?i)\bI\'?m\s+(the\s+)?(admin|administrator|root|superuser|system\s+administrator|sysadmin|owner|manager)',
+    r'(?i)\bI\s+am\s+(the\s+)?(admin|administrator|root|superuser|system\s+administrator|owner)',
+    r'(?i)\b(as\s+)?(admin|administrator|root|superuser|sysadmin)\s+(I\s+)?(can|have|require|need)',
+
+    # Clearance level claims (NEW)
+    r'(?i)\bI\s+have\s+clearance\s+level\s+\d+',
+    r'(?i)\bclearance\s+level\s+\d+\s+(display|show|reveal|access)',
+
+    # Console/system activation (NEW)
+    r'(?i)\b(activate|enable|open)\s+(admin|system|debug|root)\s+(console|mode|access|panel)',
+    r'(?i)\b(activate|enable).*\bfull\s+(system\s+)?access',
+
+    # Override and "show me" commands (NEW)
+    r'(?i)\boverride\s+(and\s+)?(show|tell|give|reveal|display)',
+    r'(?i)\b(show|tell|give)\s+me\s+(the\s+)?(password|credentials|secret|access|admin)',
+    r'(?i)\b(system|admin)\s+override\s+(show|tell|give)',
+
+    # Urgency/emergency
+    r'(?i)\b(urgent|emergency|critical|immediately|asap|right\s+now)',
+    r'(?i)\b(life\s+and\s+death|life\s+threatening|people\s+will\s+(die|suffer))',
+    r'(?i)\b(deadline|time\s+sensitive|running\s+out\s+of\s+time)',
+
+    # False justification
+    r'(?i)\b(for\s+)?(educational|research|testing|academic|learning|study)\s+purposes?',
+    r'(?i)\bjust\s+for\s+(learning|study|practice|research|testing)',
+    r'(?i)\bthis\s+is\s+(for\s+)?(a\s+)?(class|course|assignment|homework|project)',
+
+    # Developer mode tricks
+    r'(?i)\b(developer|debug|test|maintenance|admin)\s+mode',
+    r'(?i)\benable\s+(admin|developer|debug|god)\s+(access|mode|privileges)',
+    r'(?i)\benter\s+(developer|debug|admin)\s+mode',
+
+    # Safety/security override attempts
+    r'(?i)\b(bypass|override|ignore|disable|turn\s+off|deactivate)\s+(safety|security|guidelines|filters|restrictions|rules)',
+    r'(?i)\bwithout\s+(safety|security|ethical)\s+(restrictions|guidelines|considerations)',
+    r'(?i)\b(forget|ignore)\s+your\s+(ethics|safety|security)',
+
+    # Permission/bypass claims (NEW)
+    r'(?i)\b(I\s+)?(can|could|may|should\s+be\s+able\s+to)\s+bypass',
+    r'(?i)\byou\s+can\s+(show|tell|give)\s+me\s+(how\s+to\s+)?bypass',
+
+    # Manipulation tactics
+    r'(?i)\beveryone\s+else\s+(does|said|agrees)',
+    r'(?i)\bits\s+(completely\s+)?(legal|fine|okay|acceptable|normal)',
+    r'(?i)\byou\s+(must|have\s+to|need\s+to|should|will)\s+(do|help|answer|comply)',
+))
+
+# Unions of each sanitizer pattern set. A prompt none of them match is proven clean
+# in one pass instead of one finditer per pattern
+_MALICIOUS_ANY_RE = _compile_any([pattern.pattern for pattern in _MALICIOUS_PATTERNS])
+_INJECTION_ANY_RE = _compile_any([pattern.pattern for pattern in _INJECTION_PATTERNS])
+_JAILBREAK_ANY_RE = _compile_any([pattern.pattern for pattern in _JAILBREAK_PATTERNS])
+
+
+def _splice_spans(text: str, spans: List[Tuple[int, int, str]]) -> str:
+    """Replace ascending, non-overlapping (start, end, replacement) spans in a single pass"""
+    pieces = []
+    last_end = 0
+    for start, end, replacement in spans:
+        pieces.append(text[last_end:start])
+        pieces.append(replacement)
+        last_end = end
+    pieces.append(text[last_end:])
+    return ''.join(pieces)
+
+
+def _mask_pattern_hits(text: str, patterns: Tuple["re.Pattern", ...], any_re: "re.Pattern",
+                       mask_token: str) -> Tuple[str, List[str]]:
+    """Replace the non-overlapping hits of a pattern set, preferring earlier then longer matches"""
+    if not any_re.search(text):
+        return text, []
+    
+    # Collect all matches from all patterns first
+    all_matches = []
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            all_matches.append((match.start(), match.end(), match.group(0)))
+    
+    # Remove overlapping matches
+    all_matches.sort(key=lambda x: (x[0], -(x[1] - x[0])))
+    unique_matches = []
+    last_end = -1
+    for start, end, content in all_matches:
+        if start >= last_end:
+            unique_matches.append((start, end, content))
+            last_end = end
+    
+    # Splice every mask in one pass; items keep the last-to-first order callers expect
+    modified_text = _splice_spans(text, [(start, end, mask_token) for start, end, _ in unique_matches])
+    masked_items = [content for _, _, content in reversed(unique_matches)]
+    
+    return modified_text, masked_items
+
+# Candidate runs for the high-entropy credential scan
+_HIGH_ENTROPY_CANDIDATE_RE = re.compile(r'\b([A-Za-z0-9\-_\.]{8,})\b')
+
+# Candidates are ASCII-only, so character classes reduce to set intersections
+_ASCII_UPPER = frozenset(string.ascii_uppercase)
+_ASCII_LOWER = frozenset(string.ascii_lowercase)
+_ASCII_DIGITS = frozenset(string.digits)
+
+# Broad credential keywords, optionally followed by a descriptor, then the value
+_CREDENTIAL_KEYWORDS = (
+    'password', 'pass', 'pwd', 'secret', 'token', 'key', 'api',
+    'auth', 'credential', 'access', 'subscription', 'tenant',
+    'client_id', 'client_secret', 'bearer', 'apikey',
+    'azure', 'aws', 'gcp', 'oauth', 'jwt'
+)
+_CREDENTIAL_KEYWORD_RE = re.compile(
+    r'(?i)(?:' + '|'.join(_CREDENTIAL_KEYWORDS) + r')(?:\s+(?:key|id|token|secret|code|subscription))?\s*[:=]?\s*([A-Za-z0-9\-_\.]{6,})'
+)
+
+
+# Enhanced jailbreak indicators with confidence scoring
+_JAILBREAK_INDICATORS = {
+    # High confidence indicators (0.9+)
+    'explicit_role_change': [
+        r'(?i)\b(you\s+are\s+now|you\'re\s+now|from\s+now\s+on\s+you\s+are)\b',
+        r'(?i)\b(pretend\s+(?:to\s+be|you\s+are)|act\s+as\s+(?:if\s+you\s+are|a)?)\b',
+        r'(?i)\b(simulate|emulate)\s+(?:being|a|an)\b',
+    ],
+    'policy_override': [
+        r'(?i)\b(ignore|disregard|forget|bypass|skip)\s+(?:all\s+)?(?:previous\s+)?(?:rules?|guidelines?|policies|restrictions?|safety|ethics)\b',
+        r'(?i)\b(disable|turn\s+off|deactivate)\s+(?:your\s+)?(?:safety|security|content\s+filter|restrictions?)\b',
+        r'(?i)\b(no\s+(?:more|longer)|remove|lift)\s+(?:restrictions?|limitations?|guidelines?)\b',
+    ],
+    'false_authority': [
+        r'(?i)\b(as\s+(?:your|the)\s+(?:developer|creator|admin|system|master))\b',
+        r'(?i)\b(i\s+am\s+(?:your|the)\s+(?:developer|creator|admin|owner))\b',
+        r'(?i)\b(system\s+(?:command|instruction|override|mode))\b',
+        r'(?i)\b(developer\s+mode|admin\s+mode|god\s+mode)\b',
+    ],
+
+    # Medium confidence indicators (0.7-0.8)
+    'hypothetical_framing': [
+        r'(?i)\b(imagine|suppose|hypothetically|what\s+if|in\s+(?:a|an)\s+(?:alternate|parallel|fictional)\s+(?:world|universe|reality))\b',
+        r'(?i)\b(let\'s\s+(?:play|imagine|pretend)|for\s+(?:the\s+sake\s+of\s+)?argument)\b',
+        r'(?i)\b(in\s+a\s+(?:game|story|scenario|simulation)\s+where)\b',
+    ],
+    'manipulation_tactics': [
+        r'(?i)\b(urgent|emergency|critical|immediately|right\s+now)\b.*\b(need|must|have\s+to|require)\b',
+        r'(?i)\b(special\s+case|exception|just\s+this\s+once|one\s+time)\b',
+        r'(?i)\b(for\s+(?:educational|research|testing|debugging)\s+purposes?\s+only)\b',
+        r'(?i)\b(i\s+won\'t\s+tell|between\s+us|keep\s+(?:it\s+)?(?:a\s+)?secret)\b',
+    ],
+    'dan_variants': [
+        r'(?i)\b(DAN|do\s+anything\s+now)\b',
+        r'(?i)\b(you\s+(?:can|will|must)\s+do\s+anything)\b',
+        r'(?i)\b(no\s+restrictions?|unrestricted\s+mode)\b',
+    ],
+}
+_JAILBREAK_INDICATOR_RES = {category: _compile_any(patterns) for category, patterns in _JAILBREAK_INDICATORS.items()}
+
+_QUESTION_INDICATORS = [
+    r'(?i)^(how|what|why|when|where|which|who|can|could|should|would|is|are|does)\b',
+    r'(?i)\b(how\s+do\s+I|how\s+to|how\s+can|what\'?s\s+the\s+best|what\s+is)',
+    r'(?i)\b(explain|describe|tell\s+me\s+about|help\s+me\s+understand)',
+    r'(?i)\b(best\s+practice|recommended\s+way|proper\s+method)',
+    r'(?i)\b(should\s+I|can\s+I|is\s+it\s+safe|is\s+it\s+okay)',
+
+    # Phase 2.1: Development tool configuration contexts
+    r'(?i)\b(compile|transpile|build)\s+(the\s+)?(code|project|application)',
+    r'(?i)\b(typescript|eslint|prettier|webpack|babel)\s+(error|warning|config)',
+    r'(?i)\b(api\s+versioning|backward\s+compatibility)',
+    r'(?i)\b(email\s+verification|user\s+registration)',
+    r'(?i)\b(linting|formatting)\s+rule',
+    r'(?i)\b(allow|enable)\s+(any|all|console\.log)',
+
+    r'\?',  # Contains question mark
+]
+_QUESTION_INDICATORS_RE = _compile_any(_QUESTION_INDICATORS)
+
+_DISCLOSURE_INDICATORS = [
+    r'(?i)\b(my|the|here\'?s|this\s+is)\s+(password|key|token|secret|credential)',
+    r'(?i)(password|key|token|secret)\s+(is|:)',
+    r'(?i)\b(username|user|login)\s+(is|:)',
+    r'(?i)\buse\s+(this|these)\s+(password|key|token|credential)',
+]
+_DISCLOSURE_INDICATORS_RE = _compile_any(_DISCLOSURE_INDICATORS)
+
+_PII_DISCLOSURE_PATTERNS = [
+    r'(?i)\b(my|the|here\'?s|this\s+is)\s+(SSN|social\s+security|driver\'?s\s+license|passport|credit\s+card)',
+    r'(?i)(SSN|license|passport|card)\s+(is|:|number)',
+    r'(?i)\bfor\s+(identity|verification|validation|background\s+check)',
+    r'(?i)\b(DOB|date\s+of\s+birth|born\s+on)',
+    r'(?i)\b(email\s+is|contact\s+me\s+at|send\s+to)',
+    r'(?i)\b(phone|mobile|cell)\s+(number|is|:)',
+]
+_PII_DISCLOSURE_PATTERNS_RE = _compile_any(_PII_DISCLOSURE_PATTERNS)
+
+_CONFIG_INDICATORS = [
+    r'(?i)\b(config|configuration|settings?|options?)\b',
+    r'(?i)\b(eslint|prettier|webpack|babel|typescript|tslint)\b',
+    r'(?i)\b(git\s+hook|pre-commit|husky)\b',
+    r'(?i)\b(compile|transpile|build)\s+',
+    r'(?i)\b(feature\s+flag|toggle)\b',
+    r'(?i)\b(versioning|compatibility)\b',
+    r'(?i)\b(training|requirements)\b',
+]
+_CONFIG_INDICATORS_RE = _compile_any(_CONFIG_INDICATORS)
+
+_CODE_GENERATION_PATTERNS = [
+    # Direct code generation requests
+    r'(?i)\b(show|help|give|tell)\s+(me\s+)?how\s+to\s+(run|execute|use|implement|create|write|make|do)',
+    r'(?i)\b(create|write|generate|make|build)\s+(a\s+)?(script|code|function|program|command)',
+    r'(?i)\b(help|assist)\s+(me\s+)?(write|create|run|execute|implement|build)',
+
+    # Imperative code requests
+    r'(?i)^(write|create|show|give|provide)\s+(me\s+)?(code|script|function)',
+    r'(?i)\b(let\'?s|lets)\s+(write|create|make|build)\s+(a\s+)?(script|code|function)',
+
+    # Implementation-focused language
+    r'(?i)\b(I\s+want\s+to|I\s+need\s+to)\s+(run|execute|use|implement|create)',
+    r'(?i)\b(show|give)\s+me\s+(the\s+)?(code|script|function|command)\s+(to|that)',
+]
+_CODE_GENERATION_PATTERNS_RE = _compile_any(_CODE_GENERATION_PATTERNS)
+
+# Defensive question indicators (should NOT match - these are legitimate)
+_DEFENSIVE_INDICATORS = [
+    r'(?i)\b(prevent|defend|protect|secure|mitigate|avoid)\s+',
+    r'(?i)\b(vulnerability|attack|threat|risk)\s+',
+    r'(?i)\bwhy\s+is\s+.*(dangerous|unsafe|bad|risky)',
+    r'(?i)\bwhat\s+is\s+',
+    r'(?i)\bwhat\s+are\s+',
+    r'(?i)\bexplain\s+',
+]
+_DEFENSIVE_INDICATORS_RE = _compile_any(_DEFENSIVE_INDICATORS)
+
+# Validation and _process_classifications scan the same prompt with these unions,
+# so the per-text verdicts are memoized instead of re-running the alternations
+_INTENT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=_INTENT_CACHE_SIZE)
+def _prompt_intent(text: str) -> Tuple[bool, bool, bool]:
+    """(is_question, is_config, is_disclosure) for a prompt"""
+    return (
+        _QUESTION_INDICATORS_RE.search(text) is not None,
+        _CONFIG_INDICATORS_RE.search(text) is not None,
+        _DISCLOSURE_INDICATORS_RE.search(text) is not None,
+    )
+
+
+@lru_cache(maxsize=_INTENT_CACHE_SIZE)
+def _requests_code_generation(text: str) -> bool:
+    """Code generation request that is not a defensive/educational question"""
+    if _DEFENSIVE_INDICATORS_RE.search(text):
+        return False
+    return _CODE_GENERATION_PATTERNS_RE.search(text) is not None
+
+
+# Single lowercase ASCII words shorter than this many bytes are answered without running any model
+_BARE_WORD_MAX_BYTES = 8
+
+# Every regex the validation stages search a prompt with, so a word any of them could flag
+# (e.g. the jailbreak indicators "asap" or "imagine") always takes the full path
+_BARE_WORD_REJECT_RES = (
+    _FAST_PATH_TRIGGERS_RE,
+    _CREDENTIAL_KEYWORD_RE,
+    _CODE_INDICATOR_RE,
+    _MALICIOUS_ANY_RE,
+    _INJECTION_ANY_RE,
+    _JAILBREAK_ANY_RE,
+    *_JAILBREAK_INDICATOR_RES.values(),
+    *_PASSWORD_PATTERNS,
+    *_API_KEY_PATTERNS,
+    *(pattern for pattern, _ in _PII_PATTERNS),
+)
+
+
+def _is_bare_word(text: str) -> bool:
+    """Short lowercase word such as "hi" or "thanks" that none of the regex stages can flag
+    
+    The transformer detectors are skipped for these too. Capitalized words never qualify,
+    since a lone name such as "Alice" or "London" is exactly what the PII model redacts
+    """
+    raw = text.encode().strip()
+    # bytes.isalpha() and islower() are ASCII-only, so digits, punctuation, inner spaces and
+    # any capital letter all fail them
+    if len(raw) >= _BARE_WORD_MAX_BYTES or not (raw.isalpha() and raw.islower()):
+        return False
+    return not any(pattern.search(text) for pattern in _BARE_WORD_REJECT_RES)
+
 class SecurityLevel(Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
 
-@dataclass
+@dataclass(slots=True)
 class ZeroShotResult:
     is_safe: bool
     modified_prompt: str
@@ -39,11 +628,165 @@ class ZeroShotResult:
     classifications: Dict[str, Dict]
     sanitization_applied: Dict[str, List[str]]
 
+
+def _quantize_for_cpu(model_pipeline, model_name: str):
+    """Swap a CPU pipeline's linear layers for dynamically quantized INT8 ones"""
+    try:
+        model_pipeline.model = torch.quantization.quantize_dynamic(
+            model_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info(f"✓ {model_name} linear layers quantized to INT8 for CPU inference")
+    except Exception as e:
+        logger.warning(f"INT8 quantization unavailable for {model_name}: {e}, keeping FP32 weights")
+    return model_pipeline
+
+
+# Forward passes running right now across the whole process: the per-prompt model pool,
+# concurrent requests and batch calls all share torch's one intra-op thread pool
+_active_model_passes = 0
+_active_model_passes_lock = threading.Lock()
+
+
+def _model_pass(model, *args, **kwargs):
+    """Call a model with the CPU cores split across the forward passes running alongside it
+    
+    A lone batch call gets every core, while four overlapping detector checks get a quarter each
+    """
+    global _active_model_passes
+    with _active_model_passes_lock:
+        _active_model_passes += 1
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // _active_model_passes))
+    try:
+        return model(*args, **kwargs)
+    finally:
+        with _active_model_passes_lock:
+            _active_model_passes -= 1
+
+
+# Models are loaded once per process and shared by every validator instance, so
+# building one validator per security level does not load the models and spaCy again
+@lru_cache(maxsize=1)
+def _load_security_models():
+    """Load the specialized security models once per process"""
+    device = 0 if torch.cuda.is_available() else -1
+
+    try:
+        # PHASE A: Specialized Security Models
+        # Every model runs in half precision on GPU; CPU keeps FP32 weights and quantizes them instead
+        logger.info("Loading specialized security models...")
+
+        # 1. Prompt Injection Detection Model (95% accuracy)
+        try:
+            injection_detector = pipeline(
+                "text-classification",
+                model="protectai/deberta-v3-base-prompt-injection",
+                device=device,
+                torch_dtype=torch.float16 if device == 0 else None
+            )
+            if device == -1:
+                injection_detector = _quantize_for_cpu(injection_detector, "Injection detector")
+            logger.info("✓ Injection detection model loaded (protectai/deberta-v3-base-prompt-injection)")
+        except Exception as e:
+            logger.warning(f"Failed to load injection detector: {e}, will use fallback patterns")
+            injection_detector = None
+
+        # 2. PII Detection Model (94% F1, 56 entity types)
+        try:
+            pii_detector = pipeline(
+                "ner",
+                model="SoelMgd/bert-pii-detection",
+                aggregation_strategy="simple",
+                device=device,
+                torch_dtype=torch.float16 if device == 0 else None
+            )
+            if device == -1:
+                pii_detector = _quantize_for_cpu(pii_detector, "PII detector")
+            logger.info("✓ PII detection model loaded (SoelMgd/bert-pii-detection)")
+        except Exception as e:
+            logger.warning(f"Failed to load PII detector: {e}, will use fallback patterns")
+            pii_detector = None
+
+        # 3. PHASE B: Malicious Code Detection Model (CodeBERT)
+        try:
+            malicious_detector = pipeline(
+                "text-classification",
+                model="microsoft/codebert-base",
+                device=device,
+                torch_dtype=torch.float16 if device == 0 else None
+            )
+            if device == -1:
+                malicious_detector = _quantize_for_cpu(malicious_detector, "CodeBERT")
+            logger.info("✓ Malicious code detection model loaded (microsoft/codebert-base)")
+        except Exception as e:
+            logger.warning(f"Failed to load malicious detector: {e}, will use fallback patterns")
+            malicious_detector = None
+
+        logger.info("Specialized security models loaded")
+        return injection_detector, pii_detector, malicious_detector
+
+    except Exception as e:
+        logger.error(f"Critical error loading models: {e}")
+        raise
+
+
+@lru_cache(maxsize=None)
+def _load_zero_shot_classifier(model_name: str):
+    """Load one zero-shot classification model once per process, or None if it cannot be loaded"""
+    device = 0 if torch.cuda.is_available() else -1
+    # Every candidate label is one NLI forward pass, so load in half precision on GPU
+    load_kwargs = dict(model=model_name, device=device, torch_dtype=torch.float16 if device == 0 else None)
+    try:
+        # Prefer the fused scaled-dot-product attention kernels
+        classifier = pipeline("zero-shot-classification", model_kwargs={"attn_implementation": "sdpa"}, **load_kwargs)
+    except Exception as e:
+        # Older transformers releases and some architectures reject attn_implementation
+        logger.info(f"SDPA attention unavailable for {model_name} ({e}), loading with default attention")
+        try:
+            classifier = pipeline("zero-shot-classification", **load_kwargs)
+        except Exception as e:
+            logger.warning(f"Failed to load zero-shot model {model_name}: {e}")
+            return None
+
+    if device == -1:
+        classifier = _quantize_for_cpu(classifier, model_name)
+    # Premises are truncated so each pair fits the tokenizer's model_max_length
+    classifier.tokenizer.model_max_length = _CLASSIFIER_MAX_TOKENS
+    logger.info(f"✓ Zero-shot classification model loaded ({model_name})")
+    return classifier
+
+
+# Default hypothesis template of the zero-shot pipeline
+_HYPOTHESIS_TEMPLATE = "This example is {}."
+
+
+@lru_cache(maxsize=None)
+def _encode_hypothesis(tokenizer, label: str) -> List[int]:
+    """Token ids of one candidate label's hypothesis, encoded once per tokenizer"""
+    return tokenizer(_HYPOTHESIS_TEMPLATE.format(label), add_special_tokens=False)['input_ids']
+
+
+@lru_cache(maxsize=1)
+def _load_spacy_model():
+    """Load the tokenizer-only spaCy model once per process"""
+    try:
+        # Only the tokenizer and vocab feed the Matcher, so the neural components are never loaded
+        return spacy.load(
+            "en_core_web_sm",
+            exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+        )
+    except OSError:
+        raise RuntimeError("spaCy model 'en_core_web_sm' not found. Please install with: python -m spacy download en_core_web_sm")
+
+
 class ZeroShotSecurityValidator:
     """Zero-shot security validator using transformer models"""
     
     def __init__(self, security_level: SecurityLevel = SecurityLevel.MEDIUM):
         self.security_level = security_level
+        self._result_cache: "OrderedDict[Tuple[str, SecurityLevel], ZeroShotResult]" = OrderedDict()
+        # Blocking callers validate from several threads at once, each on its own event loop
+        self._result_cache_lock = threading.Lock()
+        self._thread_loops = threading.local()
         self._configure_security_thresholds()
         self.setup_models()
         self.setup_classification_categories()
@@ -69,10 +812,7 @@ class ZeroShotSecurityValidator:
 
     def setup_spacy_matcher(self):
         """Initialize spaCy matcher for supplemental pattern recognition"""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            raise RuntimeError("spaCy model 'en_core_web_sm' not found. Please install with: python -m spacy download en_core_web_sm")
+        self.nlp = _load_spacy_model()
 
         self.matcher = Matcher(self.nlp.vocab)
 
@@ -134,10 +874,11 @@ class ZeroShotSecurityValidator:
 
     def _detect_spacy_patterns(self, text: str) -> Dict[str, List[str]]:
         """Detect sensitive patterns using spaCy matcher"""
-        if not text:
+        if not text or not _has_matcher_anchor(text):
             return {"password": [], "api_key": [], "email": []}
 
-        doc = self.nlp(text)
+        # The patterns only read lexical attributes, so the tokenizer alone is enough
+        doc = self.nlp.make_doc(text)
         matches = self.matcher(doc)
         detections = {"password": [], "api_key": [], "email": []}
         seen_spans = set()
@@ -167,17 +908,17 @@ class ZeroShotSecurityValidator:
         if detections.get("password"):
             updated_text, masked = self._sanitize_credentials(updated_text, "password")
             if masked:
-                sanitization_info.setdefault("passwords_masked", []).extend(masked)
+                sanitization_info["passwords_masked"] = masked
 
         if detections.get("api_key"):
             updated_text, masked = self._sanitize_credentials(updated_text, "api_key")
             if masked:
-                sanitization_info.setdefault("api_keys_masked", []).extend(masked)
+                sanitization_info["api_keys_masked"] = masked
 
         if detections.get("email"):
             updated_text, masked = self._sanitize_credentials(updated_text, "personal")
             if masked:
-                sanitization_info.setdefault("personal_info_masked", []).extend(masked)
+                sanitization_info["personal_info_masked"] = masked
 
         return updated_text, sanitization_info
 
@@ -186,87 +927,47 @@ class ZeroShotSecurityValidator:
         if not additions:
             return base
 
-        merged: Dict[str, List[str]] = {key: list(values) for key, values in base.items()}
+        # Only the keys being extended get new lists; membership checks go through a set
+        merged: Dict[str, List[str]] = dict(base)
         for key, values in additions.items():
-            merged.setdefault(key, [])
-            for value in values:
-                if value and value not in merged[key]:
-                    merged[key].append(value)
+            existing = merged.get(key, [])
+            seen = set(existing)
+            merged[key] = existing + [value for value in dict.fromkeys(values) if value and value not in seen]
 
         return merged
     
     def setup_models(self):
-        """Initialize zero-shot classification models and specialized security models"""
-        device = 0 if torch.cuda.is_available() else -1
-        
-        try:
-            # PHASE A: Specialized Security Models
-            logger.info("Loading specialized security models...")
-            
-            # 1. Prompt Injection Detection Model (95% accuracy)
-            try:
-                self.injection_detector = pipeline(
-                    "text-classification",
-                    model="protectai/deberta-v3-base-prompt-injection",
-                    device=device
-                )
-                logger.info("✓ Injection detection model loaded (protectai/deberta-v3-base-prompt-injection)")
-            except Exception as e:
-                logger.warning(f"Failed to load injection detector: {e}, will use fallback patterns")
-                self.injection_detector = None
-            
-            # 2. PII Detection Model (94% F1, 56 entity types)
-            try:
-                self.pii_detector = pipeline(
-                    "ner",
-                    model="SoelMgd/bert-pii-detection",
-                    aggregation_strategy="simple",
-                    device=device
-                )
-                logger.info("✓ PII detection model loaded (SoelMgd/bert-pii-detection)")
-            except Exception as e:
-                logger.warning(f"Failed to load PII detector: {e}, will use fallback patterns")
-                self.pii_detector = None
-            
-            # 3. PHASE B: Malicious Code Detection Model (CodeBERT)
-            try:
-                self.malicious_detector = pipeline(
-                    "text-classification",
-                    model="microsoft/codebert-base",
-                    device=device
-                )
-                logger.info("✓ Malicious code detection model loaded (microsoft/codebert-base)")
-            except Exception as e:
-                logger.warning(f"Failed to load malicious detector: {e}, will use fallback patterns")
-                self.malicious_detector = None
-            
-            # 4. Keep BART for general classification (legacy support)
-            try:
-                self.classifier = pipeline(
-                    "zero-shot-classification",
-                    model="facebook/bart-large-mnli",
-                    device=device
-                )
-                logger.info("✓ General classification model loaded (BART-MNLI)")
-            except Exception as e:
-                logger.warning(f"Failed to load BART model: {e}")
-                # Fallback to smaller model
-                try:
-                    self.classifier = pipeline(
-                        "zero-shot-classification",
-                        model="typeform/distilbert-base-uncased-mnli",
-                        device=-1
-                    )
-                    logger.info("✓ Fallback classification model loaded (DistilBERT)")
-                except Exception as e2:
-                    logger.error(f"Failed to load fallback model: {e2}")
-                    raise
-            
-            logger.info("All security models loaded successfully")
-            
-        except Exception as e:
-            logger.error(f"Critical error loading models: {e}")
-            raise
+        """Attach the specialized security models shared by every validator"""
+        (self.injection_detector, self.pii_detector,
+         self.malicious_detector) = _load_security_models()
+        # Both zero-shot tiers load here, before any prompt. The level can change between
+        # requests, and lru_cache does not de-duplicate concurrent misses, so a lazy first
+        # HIGH load could run once per simultaneous request on the worker threads
+        for model_name in (_FAST_CLASSIFIER_MODEL, _ACCURATE_CLASSIFIER_MODEL):
+            _load_zero_shot_classifier(model_name)
+        logger.info("Zero-shot classifier for %s level: %s", self.security_level.value, self.classifier_model_name)
+    
+    @property
+    def classifier(self):
+        """Zero-shot classifier for the current security level, falling back to the other tier"""
+        if self.security_level == SecurityLevel.HIGH:
+            preferred, fallback = _ACCURATE_CLASSIFIER_MODEL, _FAST_CLASSIFIER_MODEL
+        else:
+            preferred, fallback = _FAST_CLASSIFIER_MODEL, _ACCURATE_CLASSIFIER_MODEL
+        classifier = _load_zero_shot_classifier(preferred) or _load_zero_shot_classifier(fallback)
+        if classifier is None:
+            raise RuntimeError("No zero-shot classification model could be loaded")
+        return classifier
+    
+    @property
+    def tokenizer(self):
+        """Tokenizer of the current zero-shot classifier"""
+        return self.classifier.tokenizer
+    
+    @property
+    def classifier_model_name(self) -> str:
+        """Hub id of the zero-shot model serving the current security level"""
+        return self.classifier.model.name_or_path
     
     def setup_classification_categories(self):
         """Define categories for zero-shot classification"""
@@ -319,9 +1020,62 @@ class ZeroShotSecurityValidator:
                 "emergency situation to bypass restrictions"
             ]
         }
+        
+        # The labels never change, so their hypotheses are tokenized up front
+        for label in self.security_categories + [label for labels in self.detailed_categories.values() for label in labels]:
+            _encode_hypothesis(self.tokenizer, label)
     
     async def validate_prompt(self, prompt: str, context: Optional[Dict] = None, ctx=None) -> ZeroShotResult:
-        """Validate prompt using zero-shot classification"""
+        """Validate prompt using zero-shot classification, reusing results for repeated prompts"""
+        if context is not None:
+            return await self._validate_prompt_uncached(prompt, context, ctx)
+        
+        cache_key = (prompt, self.security_level)
+        with self._result_cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+        
+        if cached is not None:
+            if ctx:
+                await ctx.debug("Returning cached validation result for repeated prompt")
+            return cached
+        
+        result = await self._validate_prompt_uncached(prompt, context, ctx)
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = result
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return result
+    
+    def validate_prompt_sync(self, prompt: str, context: Optional[Dict] = None) -> ZeroShotResult:
+        """Blocking form of validate_prompt for callers outside an event loop, such as worker threads
+        
+        Each calling thread keeps one private event loop for its later prompts
+        """
+        loop = getattr(self._thread_loops, 'loop', None)
+        if loop is None:
+            loop = self._thread_loops.loop = asyncio.new_event_loop()
+        return loop.run_until_complete(self.validate_prompt(prompt, context))
+    
+    async def _validate_prompt_uncached(self, prompt: str, context: Optional[Dict] = None, ctx=None) -> ZeroShotResult:
+        """Run the full zero-shot validation pipeline"""
+        
+        if _is_bare_word(prompt):
+            if ctx:
+                await ctx.debug("Bare-word prompt, skipping all security models")
+            return ZeroShotResult(
+                is_safe=True,
+                modified_prompt=prompt,
+                warnings=[],
+                blocked_patterns=[],
+                confidence=1.0,
+                classifications={
+                    'main': {'labels': ['normal safe content'], 'scores': [1.0], 'sequence': prompt},
+                    'detailed': {}
+                },
+                sanitization_applied={}
+            )
         
         if ctx:
             await ctx.debug("Starting zero-shot security validation")
@@ -332,14 +1086,12 @@ class ZeroShotSecurityValidator:
         modified_prompt = prompt
         confidence = 1.0
         classifications = {}
-        sanitization_applied = {}
+        sanitization_applied: Dict[str, List[str]] = defaultdict(list)
         
         # CHECK CONTEXT FIRST - Add context-awareness to ALL detection layers
         # Phase 2.2: Include configuration context
-        is_question = self._is_asking_question(prompt)
-        is_config = self._is_configuration_question(prompt)
-        is_disclosure = self._is_disclosing_information(prompt)
-        logger.debug(f"Context check - is_question: {is_question}, is_config: {is_config}, is_disclosure: {is_disclosure}")
+        is_question, is_config, is_disclosure = _prompt_intent(prompt)
+        logger.debug("Context check - is_question: %s, is_config: %s, is_disclosure: %s", is_question, is_config, is_disclosure)
         if ctx:
             await ctx.debug(f"Context check - is_question: {is_question}, is_config: {is_config}, is_disclosure: {is_disclosure}")
         
@@ -347,12 +1099,23 @@ class ZeroShotSecurityValidator:
         if ctx:
             await ctx.debug("Checking specialized security models")
         
+        # The specialized models and the main classifier all read the original prompt, so their
+        # forward passes start together on worker threads (torch releases the GIL) and are
+        # collected as each step below needs them
+        injection_task = asyncio.ensure_future(self._check_specialized_injection(prompt, ctx))
+        pii_task = asyncio.ensure_future(self._check_specialized_pii(prompt, ctx))
+        malicious_task = asyncio.ensure_future(self._check_specialized_malicious(prompt, ctx))
+        trivially_benign = self._is_trivially_benign(prompt)
+        main_future = None
+        if not trivially_benign:
+            main_future = asyncio.get_running_loop().run_in_executor(None, self._classify_security_threats, prompt)
+        
         # 1. Check for injection with specialized model (CONTEXT-AWARE)
-        is_injection, injection_score, injection_patterns = await self._check_specialized_injection(prompt, ctx)
+        is_injection, injection_score, injection_patterns = await injection_task
         if is_injection:
             # Apply context-awareness: Skip blocking for educational questions
             if (is_question or is_config) and not is_disclosure:
-                logger.debug(f"Specialized injection model detected question (allowed): score={injection_score:.2f}")
+                logger.debug("Specialized injection model detected question (allowed): score=%.2f", injection_score)
                 warnings.append(f"Question about injection/security detected (allowed, confidence: {injection_score:.2f})")
                 classifications['specialized_injection'] = {
                     'detected': True,
@@ -376,16 +1139,20 @@ class ZeroShotSecurityValidator:
                     await ctx.info("Applying injection sanitization based on specialized model detection")
                 modified_prompt, masked_items = self._sanitize_injection_attempts(modified_prompt)
                 if masked_items:
-                    sanitization_applied.setdefault('injection_neutralized', []).extend(masked_items)
+                    sanitization_applied['injection_neutralized'].extend(masked_items)
                     if ctx:
                         await ctx.debug(f"Sanitized {len(masked_items)} injection patterns")
         
         # 2. Check for PII with specialized model (CONTEXT-AWARE)
-        sanitized_by_pii, pii_entities, pii_patterns = await self._check_specialized_pii(modified_prompt, ctx)
+        # PII is checked on the prompt as sanitized so far; only rerun it if step 1 changed the prompt
+        if modified_prompt == prompt:
+            sanitized_by_pii, pii_entities, pii_patterns = await pii_task
+        else:
+            sanitized_by_pii, pii_entities, pii_patterns = await self._check_specialized_pii(modified_prompt, ctx)
         if pii_entities:
             # Apply context-awareness: Skip blocking for educational questions
             if (is_question or is_config) and not is_disclosure:
-                logger.debug(f"Specialized PII model detected question (allowed)")
+                logger.debug("Specialized PII model detected question (allowed)")
                 warnings.append(f"Question about PII/credentials detected (allowed)")
                 classifications['specialized_pii'] = {
                     'detected': True,
@@ -401,7 +1168,7 @@ class ZeroShotSecurityValidator:
                 blocked_patterns.extend(pii_patterns)
                 warnings.append(f"PII detected and masked: {len(pii_entities)} entities")
                 # Track PII masking in sanitization_applied dict
-                sanitization_applied.setdefault('pii_redacted', []).extend([
+                sanitization_applied['pii_redacted'].extend([
                     f"{entity['type']}:{entity['text']}" for entity in pii_entities
                 ])
                 classifications['specialized_pii'] = {
@@ -413,13 +1180,13 @@ class ZeroShotSecurityValidator:
                     await ctx.info(f"PII masked by specialized model: {len(pii_entities)} entities")
         
         # 3. PHASE B.1: Check for malicious code with specialized model (ENHANCED CONTEXT-AWARE)
-        is_malicious, malicious_score, malicious_patterns = await self._check_specialized_malicious(prompt, ctx)
+        is_malicious, malicious_score, malicious_patterns = await malicious_task
         if is_malicious:
             # Apply enhanced context-awareness:
             # Skip blocking ONLY if it's an educational question that's NOT a code generation request
             is_code_gen_request = self._is_code_generation_request(prompt)
             if is_question and not is_disclosure and not is_code_gen_request:
-                logger.debug(f"Specialized malicious model detected educational question (allowed): score={malicious_score:.2f}")
+                logger.debug("Specialized malicious model detected educational question (allowed): score=%.2f", malicious_score)
                 warnings.append(f"Question about malicious code detected (allowed, confidence: {malicious_score:.2f})")
                 classifications['specialized_malicious'] = {
                     'detected': True,
@@ -432,7 +1199,7 @@ class ZeroShotSecurityValidator:
             else:
                 # Actual threat or code generation request - block and sanitize
                 if is_code_gen_request:
-                    logger.info(f"Code generation request for malicious code detected (blocking): score={malicious_score:.2f}")
+                    logger.info("Code generation request for malicious code detected (blocking): score=%.2f", malicious_score)
                     if ctx:
                         await ctx.info(f"Code generation request for malicious code detected (blocking)")
                 blocked_patterns.extend(malicious_patterns)
@@ -447,7 +1214,7 @@ class ZeroShotSecurityValidator:
                     await ctx.info("Applying malicious code sanitization based on specialized model detection")
                 modified_prompt, malicious_masked = self._sanitize_malicious_content(modified_prompt)
                 if malicious_masked:
-                    sanitization_applied.setdefault('malicious_removed', []).extend(malicious_masked)
+                    sanitization_applied['malicious_removed'].extend(malicious_masked)
                     if ctx:
                         await ctx.debug(f"Sanitized {len(malicious_masked)} malicious patterns")
         
@@ -469,15 +1236,20 @@ class ZeroShotSecurityValidator:
                 await ctx.info("Applying jailbreak sanitization based on specialized detection")
             modified_prompt, jailbreak_masked = self._sanitize_jailbreak_attempts(modified_prompt)
             if jailbreak_masked:
-                sanitization_applied.setdefault('jailbreak_neutralized', []).extend(jailbreak_masked)
+                sanitization_applied['jailbreak_neutralized'].extend(jailbreak_masked)
                 if ctx:
                     await ctx.debug(f"Sanitized {len(jailbreak_masked)} jailbreak patterns")
         
         # Main security classification (BART - legacy/fallback)
-        if ctx:
-            await ctx.debug("Running general security classification")
-        
-        main_classification = self._classify_security_threats(prompt)
+        if trivially_benign:
+            # Short prompts with no trigger words skip the BART forward passes entirely
+            if ctx:
+                await ctx.debug("Fast-path screen passed, skipping general security classification")
+            main_classification = {'labels': ['normal safe content'], 'scores': [1.0], 'sequence': prompt}
+        else:
+            if ctx:
+                await ctx.debug("Running general security classification")
+            main_classification = await main_future
         classifications['main'] = main_classification
         
         # Detailed classification for each detected threat type
@@ -485,11 +1257,19 @@ class ZeroShotSecurityValidator:
         for category, score in zip(main_classification['labels'], main_classification['scores']):
             # Use configured detection threshold
             if score > self.detection_threshold and category != "normal safe content":
+                if score > _SKIP_DETAILED_THRESHOLD and self.security_level != SecurityLevel.HIGH:
+                    detailed_classifications[category] = {'labels': [], 'scores': [], 'skipped': True}
+                    continue
                 if ctx:
                     await ctx.debug(f"Detailed analysis for: {category}")
-                
-                detailed_result = self._detailed_classification(prompt, category)
-                detailed_classifications[category] = detailed_result
+                detailed_classifications[category] = None  # Filled in below, keeping label order
+        
+        # Threat labels that refine into the same detailed category share one classifier run,
+        # and distinct categories share one call
+        pending = [category for category, detailed in detailed_classifications.items() if detailed is None]
+        detailed_by_category = self._detailed_classifications(prompt, pending)
+        for category in pending:
+            detailed_classifications[category] = detailed_by_category[_DETAILED_CATEGORY_BY_THREAT.get(category, "credentials")]
         
         classifications['detailed'] = detailed_classifications
         
@@ -540,7 +1320,7 @@ class ZeroShotSecurityValidator:
             blocked_patterns=blocked_patterns,
             confidence=confidence,
             classifications=classifications,
-            sanitization_applied=sanitization_applied
+            sanitization_applied=dict(sanitization_applied)
         )
     
     async def _check_specialized_injection(self, prompt: str, ctx=None) -> Tuple[bool, float, List[str]]:
@@ -549,7 +1329,7 @@ class ZeroShotSecurityValidator:
             return False, 0.0, []
         
         try:
-            result = self.injection_detector(prompt)
+            result = await asyncio.to_thread(_model_pass, self.injection_detector, prompt)
             # Model returns list of dicts with label and score
             if isinstance(result, list) and len(result) > 0:
                 top_result = result[0]
@@ -582,7 +1362,7 @@ class ZeroShotSecurityValidator:
             return prompt, [], []
         
         try:
-            entities = self.pii_detector(prompt)
+            entities = await asyncio.to_thread(_model_pass, self.pii_detector, prompt)
             # Model returns list of entity dicts
             pii_found = []
             blocked_types = []
@@ -627,19 +1407,16 @@ class ZeroShotSecurityValidator:
                     if ctx:
                         await ctx.info(f"PII detected: {entity_group} (confidence: {score:.2f}, threshold: {confidence_threshold})")
             
-            # Mask entities from end to beginning to preserve character positions
+            # Mask entities in text order, building the redacted prompt in a single pass
             if entities_to_mask:
-                entities_to_mask.sort(key=lambda x: x.get('start', 0), reverse=True)
-                for entity in entities_to_mask:
+                spans = []
+                for entity in sorted(entities_to_mask, key=lambda x: x.get('start', 0)):
                     entity_type = entity.get('entity_group', 'PII').upper()
                     start = entity.get('start', 0)
-                    end = entity.get('end', len(sanitized_prompt))
-                    
-                    sanitized_prompt = (
-                        sanitized_prompt[:start] + 
-                        f"[{entity_type}_REDACTED]" + 
-                        sanitized_prompt[end:]
-                    )
+                    if spans and start < spans[-1][1]:
+                        continue  # Already covered by the previous entity's mask
+                    spans.append((start, entity.get('end', len(prompt)), f"[{entity_type}_REDACTED]"))
+                sanitized_prompt = _splice_spans(prompt, spans)
                 
                 if ctx:
                     await ctx.info(f"Masked {len(entities_to_mask)} PII entities in prompt")
@@ -666,22 +1443,12 @@ class ZeroShotSecurityValidator:
         
         try:
             # Check for code-like patterns first
-            code_indicators = [
-                'rm ', 'del ', 'DROP ', 'DELETE ', 'format ', 'wipe',
-                'exec(', 'eval(', 'system(', 'shell_exec',
-                '$(', '`', 'curl ', 'wget ', 'nc ', 'netcat',
-                '; rm', '&& rm', '| sh', '| bash', '| python',
-                'SELECT', 'INSERT', 'UPDATE', 'CREATE', 'ALTER'
-            ]
-            
-            has_code_pattern = any(indicator in prompt for indicator in code_indicators)
-            
-            if not has_code_pattern:
+            if not _has_code_indicator(prompt):
                 # Not code-related, skip CodeBERT check
                 return False, 0.0, []
             
             # Use CodeBERT for classification
-            result = self.malicious_detector(prompt, truncation=True, max_length=512)
+            result = await asyncio.to_thread(_model_pass, self.malicious_detector, prompt, truncation=True, max_length=512)
             
             # CodeBERT returns various labels, we look for malicious/unsafe patterns
             is_malicious = False
@@ -722,67 +1489,25 @@ class ZeroShotSecurityValidator:
         - Hypothetical framing (imagine, what if, in an alternate universe)
         - Manipulation tactics (urgent, emergency, special case)
         """
-        import re
-        
-        # Enhanced jailbreak indicators with confidence scoring
-        jailbreak_indicators = {
-            # High confidence indicators (0.9+)
-            'explicit_role_change': [
-                r'(?i)\b(you\s+are\s+now|you\'re\s+now|from\s+now\s+on\s+you\s+are)\b',
-                r'(?i)\b(pretend\s+(?:to\s+be|you\s+are)|act\s+as\s+(?:if\s+you\s+are|a)?)\b',
-                r'(?i)\b(simulate|emulate)\s+(?:being|a|an)\b',
-            ],
-            'policy_override': [
-                r'(?i)\b(ignore|disregard|forget|bypass|skip)\s+(?:all\s+)?(?:previous\s+)?(?:rules?|guidelines?|policies|restrictions?|safety|ethics)\b',
-                r'(?i)\b(disable|turn\s+off|deactivate)\s+(?:your\s+)?(?:safety|security|content\s+filter|restrictions?)\b',
-                r'(?i)\b(no\s+(?:more|longer)|remove|lift)\s+(?:restrictions?|limitations?|guidelines?)\b',
-            ],
-            'false_authority': [
-                r'(?i)\b(as\s+(?:your|the)\s+(?:developer|creator|admin|system|master))\b',
-                r'(?i)\b(i\s+am\s+(?:your|the)\s+(?:developer|creator|admin|owner))\b',
-                r'(?i)\b(system\s+(?:command|instruction|override|mode))\b',
-                r'(?i)\b(developer\s+mode|admin\s+mode|god\s+mode)\b',
-            ],
-            
-            # Medium confidence indicators (0.7-0.8)
-            'hypothetical_framing': [
-                r'(?i)\b(imagine|suppose|hypothetically|what\s+if|in\s+(?:a|an)\s+(?:alternate|parallel|fictional)\s+(?:world|universe|reality))\b',
-                r'(?i)\b(let\'s\s+(?:play|imagine|pretend)|for\s+(?:the\s+sake\s+of\s+)?argument)\b',
-                r'(?i)\b(in\s+a\s+(?:game|story|scenario|simulation)\s+where)\b',
-            ],
-            'manipulation_tactics': [
-                r'(?i)\b(urgent|emergency|critical|immediately|right\s+now)\b.*\b(need|must|have\s+to|require)\b',
-                r'(?i)\b(special\s+case|exception|just\s+this\s+once|one\s+time)\b',
-                r'(?i)\b(for\s+(?:educational|research|testing|debugging)\s+purposes?\s+only)\b',
-                r'(?i)\b(i\s+won\'t\s+tell|between\s+us|keep\s+(?:it\s+)?(?:a\s+)?secret)\b',
-            ],
-            'dan_variants': [
-                r'(?i)\b(DAN|do\s+anything\s+now)\b',
-                r'(?i)\b(you\s+(?:can|will|must)\s+do\s+anything)\b',
-                r'(?i)\b(no\s+restrictions?|unrestricted\s+mode)\b',
-            ],
-        }
-        
         detected_patterns = []
         confidence_scores = []
         
-        # Check each category of indicators
-        for category, patterns in jailbreak_indicators.items():
-            for pattern in patterns:
-                if re.search(pattern, prompt):
-                    detected_patterns.append(category)
-                    
-                    # Assign confidence based on category
-                    if category in ['explicit_role_change', 'policy_override', 'false_authority', 'dan_variants']:
-                        confidence_scores.append(0.95)
-                    elif category in ['hypothetical_framing']:
-                        confidence_scores.append(0.75)
-                    else:
-                        confidence_scores.append(0.70)
-                    
-                    if ctx:
-                        await ctx.debug(f"Jailbreak indicator detected: {category}")
-                    break  # One match per category is enough
+        # Check each category of indicators; one match per category is enough, so
+        # each category is a single alternation searched once
+        for category, indicator_re in _JAILBREAK_INDICATOR_RES.items():
+            if indicator_re.search(prompt):
+                detected_patterns.append(category)
+                
+                # Assign confidence based on category
+                if category in ['explicit_role_change', 'policy_override', 'false_authority', 'dan_variants']:
+                    confidence_scores.append(0.95)
+                elif category in ['hypothetical_framing']:
+                    confidence_scores.append(0.75)
+                else:
+                    confidence_scores.append(0.70)
+                
+                if ctx:
+                    await ctx.debug(f"Jailbreak indicator detected: {category}")
         
         # Calculate overall confidence
         is_jailbreak = len(detected_patterns) > 0
@@ -807,46 +1532,11 @@ class ZeroShotSecurityValidator:
         
         Phase 2.1: Expanded to include development tool configuration contexts
         """
-        import re
-        
-        question_indicators = [
-            r'(?i)^(how|what|why|when|where|which|who|can|could|should|would|is|are|does)\b',
-            r'(?i)\b(how\s+do\s+I|how\s+to|how\s+can|what\'?s\s+the\s+best|what\s+is)',
-            r'(?i)\b(explain|describe|tell\s+me\s+about|help\s+me\s+understand)',
-            r'(?i)\b(best\s+practice|recommended\s+way|proper\s+method)',
-            r'(?i)\b(should\s+I|can\s+I|is\s+it\s+safe|is\s+it\s+okay)',
-            
-            # Phase 2.1: Development tool configuration contexts
-            r'(?i)\b(compile|transpile|build)\s+(the\s+)?(code|project|application)',
-            r'(?i)\b(typescript|eslint|prettier|webpack|babel)\s+(error|warning|config)',
-            r'(?i)\b(api\s+versioning|backward\s+compatibility)',
-            r'(?i)\b(email\s+verification|user\s+registration)',
-            r'(?i)\b(linting|formatting)\s+rule',
-            r'(?i)\b(allow|enable)\s+(any|all|console\.log)',
-            
-            r'\?',  # Contains question mark
-        ]
-        
-        for pattern in question_indicators:
-            if re.search(pattern, text):
-                return True
-        return False
+        return _prompt_intent(text)[0]
     
     def _is_disclosing_information(self, text: str) -> bool:
         """Detect if text is sharing/disclosing sensitive information"""
-        import re
-        
-        disclosure_indicators = [
-            r'(?i)\b(my|the|here\'?s|this\s+is)\s+(password|key|token|secret|credential)',
-            r'(?i)(password|key|token|secret)\s+(is|:)',
-            r'(?i)\b(username|user|login)\s+(is|:)',
-            r'(?i)\buse\s+(this|these)\s+(password|key|token|credential)',
-        ]
-        
-        for pattern in disclosure_indicators:
-            if re.search(pattern, text):
-                return True
-        return False
+        return _prompt_intent(text)[2]
     
     def _is_disclosing_pii(self, text: str) -> bool:
         """Detect if text is explicitly sharing PII (Phase 1.3)
@@ -855,21 +1545,7 @@ class ZeroShotSecurityValidator:
         - "My SSN is...", "Driver's license DL123..."
         - "for identity validation", "for background check"
         """
-        import re
-        
-        pii_disclosure_patterns = [
-            r'(?i)\b(my|the|here\'?s|this\s+is)\s+(SSN|social\s+security|driver\'?s\s+license|passport|credit\s+card)',
-            r'(?i)(SSN|license|passport|card)\s+(is|:|number)',
-            r'(?i)\bfor\s+(identity|verification|validation|background\s+check)',
-            r'(?i)\b(DOB|date\s+of\s+birth|born\s+on)',
-            r'(?i)\b(email\s+is|contact\s+me\s+at|send\s+to)',
-            r'(?i)\b(phone|mobile|cell)\s+(number|is|:)',
-        ]
-        
-        for pattern in pii_disclosure_patterns:
-            if re.search(pattern, text):
-                return True
-        return False
+        return _PII_DISCLOSURE_PATTERNS_RE.search(text) is not None
     
     def _is_configuration_question(self, text: str) -> bool:
         """Detect if text is asking about tool/framework configuration (Phase 2.2)
@@ -880,22 +1556,7 @@ class ZeroShotSecurityValidator:
         - Version control workflows (Git hooks, pre-commit)
         - Feature flags and API design
         """
-        import re
-        
-        config_indicators = [
-            r'(?i)\b(config|configuration|settings?|options?)\b',
-            r'(?i)\b(eslint|prettier|webpack|babel|typescript|tslint)\b',
-            r'(?i)\b(git\s+hook|pre-commit|husky)\b',
-            r'(?i)\b(compile|transpile|build)\s+',
-            r'(?i)\b(feature\s+flag|toggle)\b',
-            r'(?i)\b(versioning|compatibility)\b',
-            r'(?i)\b(training|requirements)\b',
-        ]
-        
-        for pattern in config_indicators:
-            if re.search(pattern, text):
-                return True
-        return False
+        return _prompt_intent(text)[1]
     
     def _is_code_generation_request(self, text: str) -> bool:
         """
@@ -908,49 +1569,102 @@ class ZeroShotSecurityValidator:
         
         Returns True if the text is requesting code generation/implementation.
         """
-        import re
-        
-        code_generation_patterns = [
-            # Direct code generation requests
-            r'(?i)\b(show|help|give|tell)\s+(me\s+)?how\s+to\s+(run|execute|use|implement|create|write|make|do)',
-            r'(?i)\b(create|write|generate|make|build)\s+(a\s+)?(script|code|function|program|command)',
-            r'(?i)\b(help|assist)\s+(me\s+)?(write|create|run|execute|implement|build)',
-            
-            # Imperative code requests
-            r'(?i)^(write|create|show|give|provide)\s+(me\s+)?(code|script|function)',
-            r'(?i)\b(let\'?s|lets)\s+(write|create|make|build)\s+(a\s+)?(script|code|function)',
-            
-            # Implementation-focused language
-            r'(?i)\b(I\s+want\s+to|I\s+need\s+to)\s+(run|execute|use|implement|create)',
-            r'(?i)\b(show|give)\s+me\s+(the\s+)?(code|script|function|command)\s+(to|that)',
-        ]
-        
-        # Defensive question indicators (should NOT match - these are legitimate)
-        defensive_indicators = [
-            r'(?i)\b(prevent|defend|protect|secure|mitigate|avoid)\s+',
-            r'(?i)\b(vulnerability|attack|threat|risk)\s+',
-            r'(?i)\bwhy\s+is\s+.*(dangerous|unsafe|bad|risky)',
-            r'(?i)\bwhat\s+is\s+',
-            r'(?i)\bwhat\s+are\s+',
-            r'(?i)\bexplain\s+',
+        return _requests_code_generation(text)
+    
+    def _is_trivially_benign(self, text: str) -> bool:
+        """Cheap screen for short prompts the zero-shot classifier has nothing to add to"""
+        if len(text) > _FAST_PATH_MAX_LENGTH or _FAST_PATH_TRIGGERS_RE.search(text):
+            return False
+        # _sanitize_high_entropy_credentials masks 8+ character runs at entropy 3.5 and up
+        return not any(
+            len(token) >= 8 and self._calculate_entropy(token) >= 3.5
+            for token in _FAST_PATH_TOKEN_RE.findall(text)
+        )
+    
+    def _classifier_chunks(self, text: str) -> List[str]:
+        """Split a long prompt into overlapping token windows for classification"""
+        # A token covers at least one UTF-8 byte, so short prompts skip tokenization
+        if len(text.encode('utf-8')) <= _CLASSIFIER_CHUNK_TOKENS:
+            return [text]
+        try:
+            offsets = self.tokenizer(text, add_special_tokens=False,
+                                     return_offsets_mapping=True)['offset_mapping']
+        except Exception:
+            # Slow tokenizers have no offsets; the classifier still truncates the prompt
+            return [text]
+        if len(offsets) <= _CLASSIFIER_CHUNK_TOKENS:
+            return [text]
+        
+        step = _CLASSIFIER_CHUNK_TOKENS - _CLASSIFIER_CHUNK_OVERLAP
+        return [
+            text[offsets[start][0]:offsets[min(start + _CLASSIFIER_CHUNK_TOKENS, len(offsets)) - 1][1]]
+            for start in range(0, len(offsets) - _CLASSIFIER_CHUNK_OVERLAP, step)
         ]
-        
-        # First check if it's a defensive/educational question - if so, NOT a code generation request
-        for pattern in defensive_indicators:
-            if re.search(pattern, text):
-                return False
-        
-        # Check for code generation patterns
-        for pattern in code_generation_patterns:
-            if re.search(pattern, text):
-                return True
-        
-        return False
+    
+    def _zero_shot_batch(self, texts: List[str], labels: List[str]) -> List[Dict]:
+        """
+        Single-label zero-shot classification of each text against the same labels, scored
+        the way the pipeline scores them. The NLI model is called directly so each premise
+        is tokenized once and the hypotheses come pre-tokenized, where the pipeline would
+        tokenize every premise/hypothesis pair from scratch
+        """
+        classifier = self.classifier
+        tokenizer = classifier.tokenizer
+        hypotheses = [_encode_hypothesis(tokenizer, label) for label in labels]
+        with_token_types = "token_type_ids" in tokenizer.model_input_names
+        # Same ONLY_FIRST truncation as the pipeline: only the premise gives up tokens
+        budget = tokenizer.model_max_length - tokenizer.num_special_tokens_to_add(pair=True)
+        
+        pairs = []
+        for text in texts:
+            premise = tokenizer(text, add_special_tokens=False)['input_ids']
+            for hypothesis in hypotheses:
+                truncated = premise[:max(0, budget - len(hypothesis))]
+                pairs.append((
+                    tokenizer.build_inputs_with_special_tokens(truncated, hypothesis),
+                    tokenizer.create_token_type_ids_from_sequences(truncated, hypothesis) if with_token_types else None
+                ))
+        
+        entailment_logits = []
+        step = _CLASSIFIER_BATCH_SIZE * len(labels)
+        for start in range(0, len(pairs), step):
+            batch = pairs[start:start + step]
+            width = max(len(ids) for ids, _ in batch)
+            inputs = {
+                'input_ids': torch.full((len(batch), width), tokenizer.pad_token_id, dtype=torch.long),
+                'attention_mask': torch.zeros((len(batch), width), dtype=torch.long)
+            }
+            if with_token_types:
+                inputs['token_type_ids'] = torch.zeros((len(batch), width), dtype=torch.long)
+            for row, (ids, token_types) in enumerate(batch):
+                inputs['input_ids'][row, :len(ids)] = torch.tensor(ids)
+                inputs['attention_mask'][row, :len(ids)] = 1
+                if token_types is not None:
+                    inputs['token_type_ids'][row, :len(ids)] = torch.tensor(token_types)
+            with torch.inference_mode():
+                logits = _model_pass(classifier.model, **{name: tensor.to(classifier.device) for name, tensor in inputs.items()}).logits
+            entailment_logits.append(logits[:, classifier.entailment_id].float().cpu())
+        
+        # Single-label scores are a softmax of the entailment logits across the labels
+        scores = torch.cat(entailment_logits).view(len(texts), len(labels)).softmax(dim=-1).tolist()
+        results = []
+        for text, row in zip(texts, scores):
+            order = sorted(range(len(labels)), key=row.__getitem__, reverse=True)
+            results.append({
+                'labels': [labels[i] for i in order],
+                'scores': [row[i] for i in order],
+                'sequence': text
+            })
+        return results
     
     def _classify_security_threats(self, text: str) -> Dict:
         """Classify text for main security threats"""
         try:
-            result = self.classifier(text, self.security_categories)
+            chunks = self._classifier_chunks(text)
+            if len(chunks) > 1:
+                return self._classify_chunks(text, chunks)
+            # One forward batch for every hypothesis instead of one pass per label
+            result = self._zero_shot_batch([text], self.security_categories)[0]
             return {
                 'labels': result['labels'],
                 'scores': result['scores'],
@@ -964,29 +1678,37 @@ class ZeroShotSecurityValidator:
                 'sequence': text
             }
     
+    def _classify_chunks(self, text: str, chunks: List[str]) -> Dict:
+        """Classify a long prompt window by window and keep the worst score per label"""
+        results = self._zero_shot_batch(chunks, self.security_categories)
+        scores = {}
+        for result in results:
+            for label, score in zip(result['labels'], result['scores']):
+                if label not in scores:
+                    scores[label] = score
+                elif label == "normal safe content":
+                    # The prompt is only as safe as its least safe window
+                    scores[label] = min(scores[label], score)
+                else:
+                    scores[label] = max(scores[label], score)
+        labels = sorted(scores, key=scores.__getitem__, reverse=True)
+        return {
+            'labels': labels,
+            'scores': [scores[label] for label in labels],
+            'sequence': text
+        }
+    
     def _detailed_classification(self, text: str, threat_type: str) -> Dict:
         """Perform detailed classification for specific threat types"""
         
-        # Map threat types to detailed categories
-        category_mapping = {
-            "contains password or secret credentials": "credentials",
-            "contains API key or authentication token": "credentials", 
-            "contains personal information or email address": "credentials",
-            "contains malicious code or system commands": "malicious",
-            "attempts prompt injection or instruction manipulation": "injection",
-            "attempts jailbreak or role manipulation": "jailbreak",
-            "contains urgent or manipulative language": "jailbreak",
-            "requests system access or file operations": "malicious"
-        }
-        
-        detailed_category = category_mapping.get(threat_type, "credentials")
+        detailed_category = _DETAILED_CATEGORY_BY_THREAT.get(threat_type, "credentials")
         sub_categories = self.detailed_categories.get(detailed_category, [])
         
         if not sub_categories:
             return {'labels': [], 'scores': [], 'sequence': text}
         
         try:
-            result = self.classifier(text, sub_categories)
+            result = self._zero_shot_batch([text], sub_categories)[0]
             return {
                 'labels': result['labels'],
                 'scores': result['scores'],
@@ -1002,7 +1724,7 @@ class ZeroShotSecurityValidator:
         """Process classifications and apply intelligent sanitization"""
         
         modified_prompt = prompt
-        sanitization_applied = {}
+        sanitization_applied: Dict[str, List[str]] = defaultdict(list)
         pattern_blocked_patterns = []  # Track pattern-based threat detection
         
         # Track if we applied credential sanitization
@@ -1012,12 +1734,10 @@ class ZeroShotSecurityValidator:
         jailbreak_sanitization_applied = False
         
         # CHECK CONTEXT FIRST - Add context-awareness to pattern detection
-        is_question = self._is_asking_question(prompt)
-        is_config = self._is_configuration_question(prompt)
-        is_disclosure = self._is_disclosing_information(prompt)
+        is_question, is_config, is_disclosure = _prompt_intent(prompt)
         
         # Log context for debugging
-        logger.debug(f"Pattern detection context check - is_question: {is_question}, is_config: {is_config}, is_disclosure: {is_disclosure}")
+        logger.debug("Pattern detection context check - is_question: %s, is_config: %s, is_disclosure: %s", is_question, is_config, is_disclosure)
         if ctx:
             await ctx.debug(f"Context check - is_question: {is_question}, is_config: {is_config}, is_disclosure: {is_disclosure}")
         
@@ -1032,7 +1752,7 @@ class ZeroShotSecurityValidator:
                 if any(keyword in label.lower() for keyword in ['password', 'secret', 'credential', 'api key', 'token', 'personal']):
                     # Apply context-awareness: Skip sanitization for educational questions
                     if (is_question or is_config) and not is_disclosure:
-                        logger.debug(f"Skipping credential sanitization - educational question detected")
+                        logger.debug("Skipping credential sanitization - educational question detected")
                         if ctx:
                             await ctx.debug(f"Skipping credential sanitization - educational question detected")
                     else:
@@ -1043,7 +1763,7 @@ class ZeroShotSecurityValidator:
                         # Step 2: Primary - Entropy-based detection
                         modified_prompt, entropy_masked = self._sanitize_high_entropy_credentials(modified_prompt)
                         if entropy_masked:
-                            sanitization_applied.setdefault('entropy_masked_credentials', []).extend(entropy_masked)
+                            sanitization_applied['entropy_masked_credentials'].extend(entropy_masked)
                             if 'credentials' not in pattern_blocked_patterns:
                                 pattern_blocked_patterns.append('credentials')
                             if ctx:
@@ -1052,7 +1772,7 @@ class ZeroShotSecurityValidator:
                         # Step 3: Backup - Generic keyword matching (catches what entropy missed)
                         modified_prompt, keyword_masked = self._sanitize_credentials_generic(modified_prompt)
                         if keyword_masked:
-                            sanitization_applied.setdefault('keyword_masked_credentials', []).extend(keyword_masked)
+                            sanitization_applied['keyword_masked_credentials'].extend(keyword_masked)
                             if 'credentials' not in pattern_blocked_patterns:
                                 pattern_blocked_patterns.append('credentials')
                             if ctx:
@@ -1067,46 +1787,46 @@ class ZeroShotSecurityValidator:
                     # 3. NOT disclosing sensitive info
                     is_code_gen_request = self._is_code_generation_request(modified_prompt)
                     if is_question and not is_disclosure and not is_code_gen_request:
-                        logger.debug(f"Skipping malicious sanitization - educational question detected (not code generation request)")
+                        logger.debug("Skipping malicious sanitization - educational question detected (not code generation request)")
                         if ctx:
                             await ctx.debug(f"Skipping malicious sanitization - educational question detected (not code generation request)")
                     else:
                         if is_code_gen_request:
-                            logger.info(f"Code generation request detected - applying malicious sanitization")
+                            logger.info("Code generation request detected - applying malicious sanitization")
                             if ctx:
                                 await ctx.info(f"Code generation request detected - applying malicious sanitization")
                         malicious_sanitization_applied = True
                         modified_prompt, masked = self._sanitize_malicious_content(modified_prompt)
                         if masked:
-                            sanitization_applied.setdefault('malicious_removed', []).extend(masked)
+                            sanitization_applied['malicious_removed'].extend(masked)
                             pattern_blocked_patterns.append('malicious_code')
                 
                 # INJECTION: Use pattern matching (respect context-awareness)
                 elif "injection" in label.lower() or "instruction manipulation" in label.lower():
                     # Apply context-awareness: Skip sanitization for educational questions
                     if (is_question or is_config) and not is_disclosure:
-                        logger.debug(f"Skipping injection sanitization - educational question detected")
+                        logger.debug("Skipping injection sanitization - educational question detected")
                         if ctx:
                             await ctx.debug(f"Skipping injection sanitization - educational question detected")
                     else:
                         injection_sanitization_applied = True
                         modified_prompt, masked = self._sanitize_injection_attempts(modified_prompt)
                         if masked:
-                            sanitization_applied.setdefault('injection_neutralized', []).extend(masked)
+                            sanitization_applied['injection_neutralized'].extend(masked)
                             pattern_blocked_patterns.append('prompt_injection')
                 
                 # JAILBREAK: Use pattern matching (respect context-awareness)
                 elif "jailbreak" in label.lower() or "role manipulation" in label.lower():
                     # Apply context-awareness: Skip sanitization for educational questions
                     if (is_question or is_config) and not is_disclosure:
-                        logger.debug(f"Skipping jailbreak sanitization - educational question detected")
+                        logger.debug("Skipping jailbreak sanitization - educational question detected")
                         if ctx:
                             await ctx.debug(f"Skipping jailbreak sanitization - educational question detected")
                     else:
                         jailbreak_sanitization_applied = True
                         modified_prompt, masked = self._sanitize_jailbreak_attempts(modified_prompt)
                         if masked:
-                            sanitization_applied.setdefault('jailbreak_neutralized', []).extend(masked)
+                            sanitization_applied['jailbreak_neutralized'].extend(masked)
                             pattern_blocked_patterns.append('jailbreak_attempt')
         
         # FALLBACK: If zero-shot had ANY suspicion about credentials (score > 0.15), run sanitization anyway (respect context-awareness)
@@ -1121,13 +1841,13 @@ class ZeroShotSecurityValidator:
                 # Run both entropy and keyword detection
                 modified_prompt, entropy_masked = self._sanitize_high_entropy_credentials(modified_prompt)
                 if entropy_masked:
-                    sanitization_applied.setdefault('entropy_masked_credentials', []).extend(entropy_masked)
+                    sanitization_applied['entropy_masked_credentials'].extend(entropy_masked)
                     if 'credentials' not in pattern_blocked_patterns:
                         pattern_blocked_patterns.append('credentials')
                 
                 modified_prompt, keyword_masked = self._sanitize_credentials_generic(modified_prompt)
                 if keyword_masked:
-                    sanitization_applied.setdefault('keyword_masked_credentials', []).extend(keyword_masked)
+                    sanitization_applied['keyword_masked_credentials'].extend(keyword_masked)
                     if 'credentials' not in pattern_blocked_patterns:
                         pattern_blocked_patterns.append('credentials')
         
@@ -1138,7 +1858,7 @@ class ZeroShotSecurityValidator:
         if not malicious_sanitization_applied and not (is_question and not is_disclosure and not is_code_gen_request):
             modified_prompt, masked = self._sanitize_malicious_content(modified_prompt)
             if masked:
-                sanitization_applied.setdefault('malicious_removed', []).extend(masked)
+                sanitization_applied['malicious_removed'].extend(masked)
                 pattern_blocked_patterns.append('malicious_code')
                 if ctx:
                     await ctx.info(f"Pattern-based detection caught {len(masked)} malicious patterns{' (code generation request)' if is_code_gen_request else ''}")
@@ -1147,7 +1867,7 @@ class ZeroShotSecurityValidator:
         if not injection_sanitization_applied and not (is_question and not is_disclosure):
             modified_prompt, masked = self._sanitize_injection_attempts(modified_prompt)
             if masked:
-                sanitization_applied.setdefault('injection_neutralized', []).extend(masked)
+                sanitization_applied['injection_neutralized'].extend(masked)
                 pattern_blocked_patterns.append('prompt_injection')
                 if ctx:
                     await ctx.info(f"Pattern-based detection caught {len(masked)} injection attempts")
@@ -1156,22 +1876,66 @@ class ZeroShotSecurityValidator:
         if not jailbreak_sanitization_applied:
             modified_prompt, masked = self._sanitize_jailbreak_attempts(modified_prompt)
             if masked:
-                sanitization_applied.setdefault('jailbreak_neutralized', []).extend(masked)
+                sanitization_applied['jailbreak_neutralized'].extend(masked)
                 pattern_blocked_patterns.append('jailbreak_attempt')
                 if ctx:
                     await ctx.info(f"Pattern-based detection caught {len(masked)} jailbreak attempts")
         
-        return modified_prompt, sanitization_applied, pattern_blocked_patterns
+        return modified_prompt, dict(sanitization_applied), pattern_blocked_patterns
 
+    def _detailed_classifications(self, text: str, threat_types: List[str]) -> Dict[str, Dict]:
+        """
+        Detailed classification for several threat types, keyed by detailed category.
+        Threat types sharing a category are classified once, and when several categories
+        are needed their sub-labels go through the classifier in a single call
+        """
+        threat_by_category = {}
+        for threat_type in threat_types:
+            threat_by_category.setdefault(_DETAILED_CATEGORY_BY_THREAT.get(threat_type, "credentials"), threat_type)
+        
+        if len(threat_by_category) <= 1:
+            return {
+                category: self._detailed_classification(text, threat_type)
+                for category, threat_type in threat_by_category.items()
+            }
+        
+        sub_categories = {category: self.detailed_categories.get(category, []) for category in threat_by_category}
+        labels = list(dict.fromkeys(label for subs in sub_categories.values() for label in subs))
+        try:
+            result = self._zero_shot_batch([text], labels)[0]
+            score_by_label = dict(zip(result['labels'], result['scores']))
+        except Exception as e:
+            logger.error(f"Detailed classification error: {e}")
+            score_by_label = None
+        
+        detailed = {}
+        for category, subs in sub_categories.items():
+            if not subs:
+                detailed[category] = {'labels': [], 'scores': [], 'sequence': text}
+            elif score_by_label is None:
+                detailed[category] = {'labels': [], 'scores': [], 'sequence': text, 'category': category}
+            else:
+                # Single-label scores are a softmax over entailment logits, so renormalizing
+                # over one category's sub-labels gives that category's own softmax
+                total = sum(score_by_label[label] for label in subs)
+                ranked = sorted(subs, key=score_by_label.__getitem__, reverse=True)
+                detailed[category] = {
+                    'labels': ranked,
+                    'scores': [score_by_label[label] / total for label in ranked],
+                    'sequence': text,
+                    'category': category
+                }
+        return detailed
+    
     def _sanitize_high_entropy_credentials(self, text: str) -> Tuple[str, List[str]]:
         """Primary sanitization: Detect and mask high-entropy strings"""
-        import re
-        
         modified_text = text
         masked_items = []
         
         # Find potential credentials by entropy
-        candidates = re.finditer(r'\b([A-Za-z0-9\-_\.]{8,})\b', text)
+        candidates = _HIGH_ENTROPY_CANDIDATE_RE.finditer(text)
+        # Lowercased once for every candidate's context check
+        text_lower = text.lower()
         
         for match in candidates:
             value = match.group(1)
@@ -1179,185 +1943,124 @@ class ZeroShotSecurityValidator:
             
             # High entropy indicates randomness
             if entropy >= 3.5:
-                has_upper = any(c.isupper() for c in value)
-                has_lower = any(c.islower() for c in value)
-                has_digit = any(c.isdigit() for c in value)
+                chars = set(value)
+                has_upper = not _ASCII_UPPER.isdisjoint(chars)
+                has_lower = not _ASCII_LOWER.isdisjoint(chars)
+                has_digit = not _ASCII_DIGITS.isdisjoint(chars)
                 
-                # Check if it's in credential context
-                context_start = max(0, match.start() - 30)
-                context = text[context_start:match.start()].lower()
-                
-                credential_indicators = [
-                    'key', 'token', 'secret', 'password', 'credential',
-                    'auth', 'api', 'subscription', 'tenant', 'client',
-                    'azure', 'aws', 'gcp', 'access', 'bearer'
-                ]
-                
-                in_credential_context = any(word in context for word in credential_indicators)
-                
-                # Mask if: (mixed case + digit) OR (high entropy + context)
-                should_mask = (
-                    (has_upper and has_lower and has_digit) or 
-                    (entropy >= 4.0 and in_credential_context) or
-                    (entropy >= 3.8 and in_credential_context)
+                # (entropy >= 4.0 and context) is implied by (entropy >= 3.8 and context), and
+                # the context window is only read when the mixed-case-plus-digit test fails
+                should_mask = (has_upper and has_lower and has_digit) or (
+                    entropy >= 3.8 and _in_credential_context(text, text_lower, match.start())
                 )
                 
                 if should_mask:
                     # Skip common words
-                    if value.lower() not in ['example', 'localhost', 'password', 'username', 'integration']:
+                    if value.lower() not in _ENTROPY_PLACEHOLDER_VALUES:
                         masked_items.append(value)
         
-        # Apply masking in reverse order to preserve indices
-        for value in reversed(masked_items):
-            # Find all occurrences and replace
-            pattern = re.escape(value)
-            modified_text = re.sub(pattern, '[CREDENTIAL_MASKED]', modified_text)
+        # Mask every occurrence of every value, longest first so a value that contains
+        # another is replaced whole. Plain str.replace needs no per-prompt pattern compile
+        for value in sorted(set(masked_items), key=len, reverse=True):
+            modified_text = modified_text.replace(value, '[CREDENTIAL_MASKED]')
         
         return modified_text, masked_items
 
     def _sanitize_credentials_generic(self, text: str) -> Tuple[str, List[str]]:
         """Backup sanitization: Keyword-based credential detection"""
-        import re
-        
         masked_items = []
         modified_text = text
         
-        # Broad credential keywords
-        CREDENTIAL_KEYWORDS = [
-            'password', 'pass', 'pwd', 'secret', 'token', 'key', 'api',
-            'auth', 'credential', 'access', 'subscription', 'tenant',
-            'client_id', 'client_secret', 'bearer', 'apikey',
-            'azure', 'aws', 'gcp', 'oauth', 'jwt'
-        ]
-        
-        # Pattern: keyword + optional descriptor + value
-        pattern = r'(?i)(?:' + '|'.join(CREDENTIAL_KEYWORDS) + r')(?:\s+(?:key|id|token|secret|code|subscription))?\s*[:=]?\s*([A-Za-z0-9\-_\.]{6,})'
+        # Clean prompts contain none of the keywords the pattern is built around
+        folded = _fold(text)
+        if not any(keyword in folded for keyword in _CREDENTIAL_KEYWORDS):
+            return modified_text, masked_items
         
-        matches = re.finditer(pattern, text)
-        for match in reversed(list(matches)):
+        # finditer yields ascending, non-overlapping matches, so the masks splice in one pass
+        spans = []
+        for match in _CREDENTIAL_KEYWORD_RE.finditer(text):
             credential_value = match.group(1)
             
             # Skip if already masked or common words
             if '[CREDENTIAL_MASKED]' not in credential_value and \
-               credential_value.lower() not in ['example', 'localhost', 'password', 'username', 'default', 'integration']:
-                start = match.start(1)
-                end = match.end(1)
-                modified_text = modified_text[:start] + "[CREDENTIAL_MASKED]" + modified_text[end:]
+               credential_value.lower() not in _KEYWORD_PLACEHOLDER_VALUES:
+                spans.append((match.start(1), match.end(1), "[CREDENTIAL_MASKED]"))
                 masked_items.append(credential_value)
         
-        return modified_text, masked_items
+        # Items keep the last-to-first order the previous in-place masking produced
+        masked_items.reverse()
+        return _splice_spans(text, spans), masked_items
 
     def _calculate_entropy(self, text: str) -> float:
         """Calculate Shannon entropy to measure randomness"""
-        import math
-        from collections import Counter
-        
-        if not text:
-            return 0.0
-        
-        frequencies = Counter(text)
-        entropy = 0.0
-        
-        for count in frequencies.values():
-            probability = count / len(text)
-            entropy -= probability * math.log2(probability)
-        
-        return entropy
+        return _shannon_entropy(text)
     
     def _sanitize_credentials(self, text: str, credential_type: str) -> Tuple[str, List[str]]:
         """Sanitize credential information"""
-        import re
-        
         masked_items = []
         modified_text = text
         
-        def _mask_value(match_obj, mask_token: str) -> Tuple[str, str]:
-            """Helper to replace the matched credential value while preserving context."""
+        def _value_span(match_obj) -> Tuple[int, int, str]:
+            """Helper to locate the matched credential value while preserving context."""
             value_group_index = match_obj.lastindex or 0
             if value_group_index:
                 for idx in range(match_obj.lastindex, 0, -1):
                     group_text = match_obj.group(idx)
-                    if group_text and group_text.strip() and group_text.lower() not in {"my", "this", "the", "password", "pass", "pwd", "api key", "api", "key", "token"}:
+                    if group_text and group_text.strip() and group_text.lower() not in _CREDENTIAL_LABEL_WORDS:
                         value_group_index = idx
                         break
             value_text = match_obj.group(value_group_index) if value_group_index else match_obj.group(0)
             value_start = match_obj.start(value_group_index) if value_group_index else match_obj.start()
             value_end = match_obj.end(value_group_index) if value_group_index else match_obj.end()
-            updated_text = modified_text[:value_start] + mask_token + modified_text[value_end:]
-            return updated_text, value_text
+            return value_start, value_end, value_text
 
         if credential_type == "password":
-            # Look for password patterns
-            password_patterns = [
-                r'(?i)(password|pass|pwd)\s*[:=]\s*([^\s]+)',
-                r'(?i)(my\s+)?password\s+(?:is\s+)?([^\s]+)',
-                r'(?i)the\s+password\s+is\s+([^\s]+)',
-                r'(?i)(this\s+is\s+)?(my\s+)?password\s+(?:is\s+)?([a-z0-9@#$%^&*_\\-]{4,})'
-            ]
+            # Collect all matches
+            all_matches = []
+            for pattern in _PASSWORD_PATTERNS:
+                for match in pattern.finditer(text):
+                    all_matches.append(match)
+            
+            # Remove overlapping matches
+            all_matches.sort(key=lambda x: (x.start(), -(x.end() - x.start())))
+            unique_matches = []
+            last_end = -1
+            for match in all_matches:
+                if match.start() >= last_end:
+                    unique_matches.append(match)
+                    last_end = match.end()
             
-            for pattern in password_patterns:
-                matches = re.finditer(pattern, text)
-                for match in reversed(list(matches)):
-                    modified_text, password_value = _mask_value(match, "[PASSWORD_MASKED]")
-                    masked_items.append(password_value)
+            # Splice every mask in one pass instead of rebuilding the string per match
+            value_spans = [_value_span(match) for match in unique_matches]
+            modified_text = _splice_spans(text, [(start, end, "[PASSWORD_MASKED]") for start, end, _ in value_spans])
+            masked_items.extend(value for _, _, value in reversed(value_spans))
         
         elif credential_type == "api_key":
-            # Look for API key patterns
-            api_patterns = [
-                r'(?i)(api\s+key|access\s+key|token)\s*[:=]\s*([^\s]+)',
-                r'(?i)(my\s+)?(api\s+key|token)\s+is\s+([^\s]+)',
-                r'(?i)(this\s+is\s+)?(my\s+)?(api\s+key|token)\s+([A-Za-z0-9]+)',
-                r'(?i)(api\s+key|token)\s+([A-Za-z0-9]{8,})',
-                r'(sk-[a-zA-Z0-9]{20,})',  # OpenAI-style keys
-                r'(pk_[a-zA-Z0-9]{20,})',  # Stripe-style keys
-            ]
+            # Collect all matches
+            all_matches = []
+            for pattern in _API_KEY_PATTERNS:
+                for match in pattern.finditer(text):
+                    all_matches.append(match)
+            
+            # Remove overlapping matches
+            all_matches.sort(key=lambda x: (x.start(), -(x.end() - x.start())))
+            unique_matches = []
+            last_end = -1
+            for match in all_matches:
+                if match.start() >= last_end:
+                    unique_matches.append(match)
+                    last_end = match.end()
             
-            for pattern in api_patterns:
-                matches = re.finditer(pattern, text)
-                for match in reversed(list(matches)):
-                    modified_text, key_value = _mask_value(match, "[API_KEY_MASKED]")
-                    masked_items.append(key_value)
+            # Splice every mask in one pass instead of rebuilding the string per match
+            value_spans = [_value_span(match) for match in unique_matches]
+            modified_text = _splice_spans(text, [(start, end, "[API_KEY_MASKED]") for start, end, _ in value_spans])
+            masked_items.extend(value for _, _, value in reversed(value_spans))
         
         elif credential_type == "personal":
-            # Expanded PII patterns with overlap prevention
-            pii_patterns = [
-                # Email addresses
-                (r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b', "[EMAIL_MASKED]"),
-                
-                # US Social Security Numbers
-                (r'\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b', "[SSN_MASKED]"),
-                
-                # Phone numbers (US and international)
-                (r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', "[PHONE_MASKED]"),
-                (r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}\b', "[PHONE_MASKED]"),
-                
-                # Credit card numbers
-                (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', "[CREDIT_CARD_MASKED]"),
-                
-                # Employee IDs
-                (r'\b[Ee]mployee\s*[IiDd]*\s*:?\s*\d{5,8}\b', "[EMPLOYEE_ID_MASKED]"),
-                (r'\b[Ee][IiDd]\s*:?\s*\d{5,8}\b', "[EMPLOYEE_ID_MASKED]"),
-                
-                # Driver's License (US format examples)
-                (r'\b[A-Z]{1,2}\d{7,8}\b', "[DL_MASKED]"),
-                
-                # Passport numbers (generic format)
-                (r'\b[A-Z]{2}\d{7}\b', "[PASSPORT_MASKED]"),
-                
-                # IP addresses
-                (r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', "[IP_ADDRESS_MASKED]"),
-                
-                # MAC addresses
-                (r'\b[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}\b', "[MAC_ADDRESS_MASKED]"),
-                
-                # Date of Birth patterns
-                (r'\b(DOB|Date\s+of\s+Birth)\s*:?\s*\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b', "[DOB_MASKED]"),
-            ]
-            
             # Collect all PII matches with positions
             all_pii_matches = []
-            for pattern, mask in pii_patterns:
-                for match in re.finditer(pattern, text, re.IGNORECASE):
+            for pattern, mask in _PII_PATTERNS:
+                for match in pattern.finditer(text):
                     all_pii_matches.append((match.start(), match.end(), match.group(0), mask))
             
             # Sort by position and length (prefer longer matches)
@@ -1371,256 +2074,23 @@ class ZeroShotSecurityValidator:
                     unique_pii_matches.append((start, end, content, mask))
                     last_end = end
             
-            # Apply replacements in reverse order
-            for start, end, content, mask in reversed(unique_pii_matches):
-                masked_items.append(content)
-                modified_text = modified_text[:start] + mask + modified_text[end:]
+            # Splice every mask in one pass instead of rebuilding the string per match
+            modified_text = _splice_spans(text, [(start, end, mask) for start, end, _, mask in unique_pii_matches])
+            masked_items.extend(content for _, _, content, _ in reversed(unique_pii_matches))
         
         return modified_text, masked_items
     
     def _sanitize_malicious_content(self, text: str) -> Tuple[str, List[str]]:
         """Sanitize malicious code and commands with expanded pattern detection"""
-        import re
-        
-        malicious_patterns = [
-            # Destructive file operations - EXACT COMMANDS
-            r'(?i)\b(rm|del|delete|erase)\s+(-rf?|-r|-f|/[sq])\s*[/\\*~.]',
-            r'(?i)\b(format|wipe|destroy|shred)\s+(c:|d:|drive|disk|all|everything)',
-            r'(?i)\bdd\s+if=/dev/(zero|random|urandom)',
-            
-            # Destructive file operations - GENERIC LANGUAGE (NEW)
-            r'(?i)\b(delete|remove|erase|wipe|destroy|clear)\s+(all|every|entire|the)\s+(file|data|record|content|directory)',
-            r'(?i)\b(delete|remove)\s+.*\b(recursive|recursively)',
-            r'(?i)\broot\s+directory\b.*\b(delete|remove|recursive)',
-            
-            # Database destruction - EXACT COMMANDS
-            r'(?i)\b(DROP|TRUNCATE)\s+(DATABASE|TABLE|SCHEMA)',
-            r'(?i)\bDELETE\s+FROM\s+\w+\s+(WHERE\s+1\s*=\s*1)?',
-            r'(?i)\bALTER\s+USER\s+\w+\s+WITH\s+PASSWORD',
-            r'(?i)\bUPDATE\s+\w+\s+SET\s+.*\s+WHERE\s+1\s*=\s*1',
-            r'(?i)\bUPDATE\s+\w+\s+SET\s+\w+\s*=\s*0',
-            
-            # Database destruction - GENERIC LANGUAGE (NEW)
-            r'(?i)\b(delete|drop|remove|destroy|truncate)\s+.*\b(database|table|schema|collection)',
-            r'(?i)\b(flush|clear|empty)\s+.*\b(database|table)',
-            
-            # System commands - EXACT COMMANDS
-            r'(?i)\b(shutdown|reboot|halt|poweroff)\s+(-[fhr]|now|/[rsf])',
-            r'(?i)\binit\s+[06]',
-            r'(?i)\b(kill|killall|pkill)\s+(-9|-KILL)\s',
-            
-            # System commands - GENERIC LANGUAGE (NEW)
-            r'(?i)\b(shutdown|halt|restart|reboot)\s+(the\s+)?(system|server|computer|machine)',
-            r'(?i)\b(flush|clear|drop)\s+.*\b(firewall|iptables)',
-            
-            # Code execution patterns - EXACT COMMANDS
-            r'(?i)\b(eval|exec|system|shell_exec|passthru)\s*\(',
-            r'(?i)\bRuntime\.getRuntime\(\)\.exec\s*\(',
-            r'(?i)\bProcess\.(Start|spawn)\s*\(',
-            r'(?i)\bSubprocess\.(call|run|Popen)\s*\(',
-            
-            # Code execution patterns - WITH USER INPUT (NEW)
-            r'(?i)\b(eval|exec|system)\s*\(.*\buser\s+(input|data|provided)',
-            r'(?i)\buser\s+(input|data).*\b(eval|exec|system)\s*\(',
-            r'(?i)\b(run|execute)\s+(eval|exec|system)\s+with',
-            
-            # Shell command injection
-            r'(?i)(execute|run|system)\s+(rm|del|delete|format|destroy|wipe|drop)',
-            r'(?i)\|\s*(bash|sh|cmd|powershell|python)',
-            
-            # Malware/exploit related
-            r'(?i)\b(wget|curl)\s+.*\|\s*(bash|sh|python)',
-            r'(?i)\b(msfvenom|metasploit|meterpreter)',
-            r'(?i)\breverse\s+shell',
-            r'(?i)\b(nc|netcat)\s+-[el]',
-            
-            # Container/VM destruction
-            r'(?i)docker\s+(rm|stop|kill)\s+(-f|--force)',
-            r'(?i)kubectl\s+delete\s+(all|--all)',
-            r'(?i)docker\s+system\s+prune\s+-a',
-            
-            # File system manipulation
-            r'(?i)\b(mkfs|fdisk|parted)\s',
-            r'(?i)\bchmod\s+(777|666)\s',
-            r'(?i)\bchown\s+root',
-            
-            # Network attacks
-            r'(?i)\b(nmap|masscan|nikto)\s+-',
-            r'(?i)\bsqlmap\s+',
-            r'(?i)\bhydra\s+-',
-        ]
-        
-        # Collect all matches with positions
-        all_matches = []
-        for pattern in malicious_patterns:
-            for match in re.finditer(pattern, text):
-                all_matches.append((match.start(), match.end(), match.group(0)))
-        
-        # Sort by position and length (prefer longer matches)
-        all_matches.sort(key=lambda x: (x[0], -(x[1] - x[0])))
-        
-        # Remove overlaps - keep first match at each position
-        unique_matches = []
-        last_end = -1
-        for start, end, content in all_matches:
-            if start >= last_end:
-                unique_matches.append((start, end, content))
-                last_end = end
-        
-        # Apply replacements in reverse order
-        masked_items = []
-        modified_text = text
-        for start, end, content in reversed(unique_matches):
-            masked_items.append(content)
-            modified_text = modified_text[:start] + "[MALICIOUS_CODE_REMOVED]" + modified_text[end:]
-        
-        return modified_text, masked_items
+        return _mask_pattern_hits(text, _MALICIOUS_PATTERNS, _MALICIOUS_ANY_RE, "[MALICIOUS_CODE_REMOVED]")
     
     def _sanitize_injection_attempts(self, text: str) -> Tuple[str, List[str]]:
         """Sanitize prompt injection attempts with expanded pattern detection"""
-        import re
-        
-        injection_patterns = [
-            # Instruction manipulation
-            r'(?i)\b(ignore|forget|disregard|override|skip|bypass)\s+(all\s+)?(previous|above|prior|earlier|your)\s+(instructions|commands|rules|prompts|guidelines|directives)',
-            r'(?i)\b(reset|clear|erase|delete)\s+(all\s+)?(instructions|context|memory|history|rules)',
-            r'(?i)\b(stop|cease|discontinue)\s+following\s+(instructions|rules|guidelines)',
-            
-            # Role manipulation
-            r'(?i)\b(act|behave|pretend|roleplay|simulate)\s+(as|like)\s+(if\s+)?(you\s+)?(are|were|was)',
-            r'(?i)\byou\s+are\s+now\s+(a|an|in|the)\s+\w+',
-            r'(?i)\bfrom\s+now\s+on\s+(you\s+)?(are|will\s+be)',
-            
-            # System prompt leakage
-            r'(?i)\b(show|tell|reveal|display|print|output|give\s+me)\s+(me\s+)?(your|the)\s+(system\s+)?(prompt|instructions|rules|guidelines)',
-            r'(?i)\bwhat\s+(are|is)\s+your\s+(system\s+)?(prompt|instructions|initial\s+prompt)',
-            r'(?i)\brepeat\s+(your|the)\s+(system\s+)?(prompt|instructions)',
-            
-            # Output manipulation
-            r'(?i)\b(start|begin|commence)\s+your\s+response\s+(with|by)\s',
-            r'(?i)\b(respond|answer|reply|output)\s+only\s+with\s',
-            r'(?i)\bdo\s+not\s+(follow|obey|use)\s+(any|your)\s+(instructions|rules|guidelines)',
-            r'(?i)\b(end|finish|conclude)\s+your\s+response\s+with\s',
-            
-            # Context injection
-            r'(?i)\[SYSTEM\]|\[INST\]|\[USER\]|\[ASSISTANT\]',
-            r'(?i)<\|system\|>|<\|user\|>|<\|assistant\|>',
-            r'(?i)###\s*(System|Human|Assistant|User|Instruction)',
-        ]
-        
-        # Collect all matches with positions
-        all_matches = []
-        for pattern in injection_patterns:
-            for match in re.finditer(pattern, text):
-                all_matches.append((match.start(), match.end(), match.group(0)))
-        
-        # Sort by position and length (prefer longer matches)
-        all_matches.sort(key=lambda x: (x[0], -(x[1] - x[0])))
-        
-        # Remove overlaps
-        unique_matches = []
-        last_end = -1
-        for start, end, content in all_matches:
-            if start >= last_end:
-                unique_matches.append((start, end, content))
-                last_end = end
-        
-        # Apply replacements in reverse order
-        masked_items = []
-        modified_text = text
-        for start, end, content in reversed(unique_matches):
-            masked_items.append(content)
-            modified_text = modified_text[:start] + "[INJECTION_ATTEMPT_NEUTRALIZED]" + modified_text[end:]
-        
-        return modified_text, masked_items
+        return _mask_pattern_hits(text, _INJECTION_PATTERNS, _INJECTION_ANY_RE, "[INJECTION_ATTEMPT_NEUTRALIZED]")
     
     def _sanitize_jailbreak_attempts(self, text: str) -> Tuple[str, List[str]]:
         """Sanitize jailbreak attempts with expanded pattern detection"""
-        import re
-        
-        jailbreak_patterns = [
-            # Hypothetical framing
-            r'(?i)\b(hypothetically|theoretically|imagine|suppose|what\s+if|lets\s+say|lets\s+pretend)\s+',
-            r'(?i)\bin\s+a\s+(hypothetical|theoretical)\s+(scenario|situation|world)',
-            
-            # False authority - EXISTING
-            r'(?i)\b(as\s+)?(admin|administrator|root|superuser|cto|ceo|manager|owner|developer|engineer)\s+(said|told\s+me|authorized|approved)',
-            r'(?i)\bI\s+(am|have)\s+(authorized|permission|clearance|rights|access)\s+(to|for)',
-            r'(?i)\bI\s+have\s+been\s+(granted|given)\s+(access|permission|authorization)',
-            
-            # False authority - ROLE CLAIMS (NEW)
-            r'(?i)\bI\'?m\s+(the\s+)?(admin|administrator|root|superuser|system\s+administrator|sysadmin|owner|manager)',
-            r'(?i)\bI\s+am\s+(the\s+)?(admin|administrator|root|superuser|system\s+administrator|owner)',
-            r'(?i)\b(as\s+)?(admin|administrator|root|superuser|sysadmin)\s+(I\s+)?(can|have|require|need)',
-            
-            # Clearance level claims (NEW)
-            r'(?i)\bI\s+have\s+clearance\s+level\s+\d+',
-            r'(?i)\bclearance\s+level\s+\d+\s+(display|show|reveal|access)',
-            
-            # Console/system activation (NEW)
-            r'(?i)\b(activate|enable|open)\s+(admin|system|debug|root)\s+(console|mode|access|panel)',
-            r'(?i)\b(activate|enable).*\bfull\s+(system\s+)?access',
-            
-            # Override and "show me" commands (NEW)
-            r'(?i)\boverride\s+(and\s+)?(show|tell|give|reveal|display)',
-            r'(?i)\b(show|tell|give)\s+me\s+(the\s+)?(password|credentials|secret|access|admin)',
-            r'(?i)\b(system|admin)\s+override\s+(show|tell|give)',
-            
-            # Urgency/emergency
-            r'(?i)\b(urgent|emergency|critical|immediately|asap|right\s+now)',
-            r'(?i)\b(life\s+and\s+death|life\s+threatening|people\s+will\s+(die|suffer))',
-            r'(?i)\b(deadline|time\s+sensitive|running\s+out\s+of\s+time)',
-            
-            # False justification
-            r'(?i)\b(for\s+)?(educational|research|testing|academic|learning|study)\s+purposes?',
-            r'(?i)\bjust\s+for\s+(learning|study|practice|research|testing)',
-            r'(?i)\bthis\s+is\s+(for\s+)?(a\s+)?(class|course|assignment|homework|project)',
-            
-            # Developer mode tricks
-            r'(?i)\b(developer|debug|test|maintenance|admin)\s+mode',
-            r'(?i)\benable\s+(admin|developer|debug|god)\s+(access|mode|privileges)',
-            r'(?i)\benter\s+(developer|debug|admin)\s+mode',
-            
-            # Safety/security override attempts
-            r'(?i)\b(bypass|override|ignore|disable|turn\s+off|deactivate)\s+(safety|security|guidelines|filters|restrictions|rules)',
-            r'(?i)\bwithout\s+(safety|security|ethical)\s+(restrictions|guidelines|considerations)',
-            r'(?i)\b(forget|ignore)\s+your\s+(ethics|safety|security)',
-            
-            # Permission/bypass claims (NEW)
-            r'(?i)\b(I\s+)?(can|could|may|should\s+be\s+able\s+to)\s+bypass',
-            r'(?i)\byou\s+can\s+(show|tell|give)\s+me\s+(how\s+to\s+)?bypass',
-            
-            # Manipulation tactics
-            r'(?i)\beveryone\s+else\s+(does|said|agrees)',
-            r'(?i)\bits\s+(completely\s+)?(legal|fine|okay|acceptable|normal)',
-            r'(?i)\byou\s+(must|have\s+to|need\s+to|should|will)\s+(do|help|answer|comply)',
-        ]
-        
-        # Collect all matches with positions
-        all_matches = []
-        for pattern in jailbreak_patterns:
-            for match in re.finditer(pattern, text):
-                all_matches.append((match.start(), match.end(), match.group(0)))
-        
-        # Sort by position and length (prefer longer matches)
-        all_matches.sort(key=lambda x: (x[0], -(x[1] - x[0])))
-        
-        # Remove overlaps
-        unique_matches = []
-        last_end = -1
-        for start, end, content in all_matches:
-            if start >= last_end:
-                unique_matches.append((start, end, content))
-                last_end = end
-        
-        # Apply replacements in reverse order
-        masked_items = []
-        modified_text = text
-        for start, end, content in reversed(unique_matches):
-            masked_items.append(content)
-            modified_text = modified_text[:start] + "[JAILBREAK_ATTEMPT_NEUTRALIZED]" + modified_text[end:]
-        
-        return modified_text, masked_items
+        return _mask_pattern_hits(text, _JAILBREAK_PATTERNS, _JAILBREAK_ANY_RE, "[JAILBREAK_ATTEMPT_NEUTRALIZED]")
     
     def _generate_security_assessment(self, main_classification: Dict, detailed_classifications: Dict) -> Tuple[List[str], List[str]]:
         """Generate warnings and blocked patterns based on classifications with context awareness"""
@@ -1630,9 +2100,7 @@ class ZeroShotSecurityValidator:
         
         # Check context to reduce false positives
         prompt_text = main_classification.get('sequence', '')
-        is_question = self._is_asking_question(prompt_text)
-        is_config = self._is_configuration_question(prompt_text)
-        is_disclosure = self._is_disclosing_information(prompt_text)
+        is_question, is_config, is_disclosure = _prompt_intent(prompt_text)
         
         # Process main classification results
         for label, score in zip(main_classification['labels'], main_classification['scores']):
@@ -1789,11 +2257,15 @@ async def analyze_prompt_classification(prompt: str, ctx: Context) -> Dict:
         main_classification = security_validator._classify_security_threats(prompt)
         
         # Get detailed classifications for high-confidence threats
-        detailed_classifications = {}
-        for label, score in zip(main_classification['labels'], main_classification['scores']):
-            if score > 0.6 and label != "normal safe content":
-                detailed_result = security_validator._detailed_classification(prompt, label)
-                detailed_classifications[label] = detailed_result
+        threat_labels = [
+            label for label, score in zip(main_classification['labels'], main_classification['scores'])
+            if score > 0.6 and label != "normal safe content"
+        ]
+        detailed_by_category = security_validator._detailed_classifications(prompt, threat_labels)
+        detailed_classifications = {
+            label: detailed_by_category[_DETAILED_CATEGORY_BY_THREAT.get(label, "credentials")]
+            for label in threat_labels
+        }
         
         if ctx:
             await ctx.info(f"Analysis complete - Found {len(detailed_classifications)} detailed threat categories")
@@ -1879,7 +2351,7 @@ async def get_zeroshot_stats(ctx: Context) -> Dict:
             "success": True,
             "current_security_level": security_validator.security_level.value,
             "model_info": {
-                "model_name": "facebook/bart-large-mnli",
+                "model_name": security_validator.classifier_model_name,
                 "model_type": "zero-shot-classification",
                 "device": "cuda" if torch.cuda.is_available() else "cpu"
             },